@@ -0,0 +1,5 @@
+"""Benchmarks of the application.
+
+Run them as modules from the repository root, e.g.
+``python -m benchmarks.suite --output before.json``.
+"""
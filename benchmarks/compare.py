@@ -0,0 +1,68 @@
+"""Compare two benchmark suite results.
+
+Prints p50, p99 and throughput of every benchmark present in both files, with
+the change relative to the baseline, and exits with status 1 if any p99
+latency grew, or throughput dropped, by more than ``--threshold``.
+
+Example
+-------
+    python -m benchmarks.compare before.json after.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+
+def load_results(path: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Load a suite result keyed by (kind, name)."""
+    with open(path) as f:
+        report = json.load(f)
+    return {(r["kind"], r["name"]): r for r in report["results"]}
+
+
+def change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    """Get the relative change from ``before`` to ``after``."""
+    if not before or after is None:
+        return None
+    return after / before - 1
+
+
+def main() -> None:
+    """Parse arguments, print the comparison and exit with its verdict."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Tolerated relative change"
+    )
+    args = parser.parse_args()
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    regressions = 0
+    print(f"{'benchmark':<40} {'p50 ms':>18} {'p99 ms':>18} {'throughput/s':>20}")
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        cells = []
+        for field in ("p50_ms", "p99_ms", "throughput_per_s"):
+            delta = change(before[field], after[field])
+            cells.append(
+                f"{after[field]!s:>10} "
+                + (f"{delta:+7.1%}" if delta is not None else f"{'':>7}")
+            )
+        p99 = change(before["p99_ms"], after["p99_ms"])
+        throughput = change(before["throughput_per_s"], after["throughput_per_s"])
+        regressed = (p99 is not None and p99 > args.threshold) or (
+            throughput is not None and throughput < -args.threshold
+        )
+        regressions += regressed
+        name = "/".join(key)
+        print(f"{name:<40} {cells[0]:>18} {cells[1]:>18} {cells[2]:>20}", end="")
+        print("  REGRESSION" if regressed else "")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Load test of the recording status endpoint.
+
+Starts the production server in the requested worker mode (or targets a
+running one with ``--url``), holds a number of event streams open to simulate
+long-lived connections, and has many concurrent clients poll
+``/api/recording/status`` every ``--interval`` seconds, like browsers polling
+it. Prints latency percentiles as JSON.
+
+Example
+-------
+    python -m benchmarks.load_status --worker-class gthread --clients 100
+    python -m benchmarks.load_status --worker-class gevent --clients 100
+"""
+
+import argparse
+import atexit
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Get the q-th percentile (0-100) of sorted values."""
+    if not values:
+        return float("nan")
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(
+    worker_class: str,
+    threads: Optional[int],
+    port: int,
+    settings: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> subprocess.Popen:
+    """Start ``gst-rec`` with the fake recorder backend in a scratch directory.
+
+    ``settings`` are added to the scratch settings file and ``env`` to the
+    server's environment. With more than one worker, the recordings are owned
+    by a recorder daemon, started first and stopped along with the server.
+    """
+    workdir = tempfile.mkdtemp(prefix="gst-rec-load-")
+    settings = {
+        "recorder_backend": "fake",
+        "default_path": os.path.join(workdir, "rec"),
+        **(settings or {}),
+    }
+    daemon = None
+    if workers and workers > 1:
+        settings["daemon_socket"] = os.path.join(workdir, "daemon.sock")
+    with open(os.path.join(workdir, "settings.json"), "w") as f:
+        json.dump(settings, f)
+    if "daemon_socket" in settings:
+        code = "from gst_rec_app.cli import run_daemon; run_daemon()"
+        daemon = _run_python(code, [], workdir, env)
+        _wait_until(lambda: os.path.exists(settings["daemon_socket"]), daemon)
+
+    argv = ["--port", str(port), "--host", "127.0.0.1", "--log-level", "warning"]
+    argv += ["--worker-class", worker_class]
+    if threads:
+        argv += ["--threads", str(threads)]
+    if workers:
+        argv += ["--workers", str(workers)]
+    process = _run_python(
+        "from gst_rec_app.cli import run_prod; run_prod()", argv, workdir, env
+    )
+    if daemon is not None:
+        atexit.register(_stop, daemon)
+    url = f"http://127.0.0.1:{port}/api/recording/status"
+    _wait_until(lambda: _responds(url), process)
+    return process
+
+
+def _run_python(
+    code: str, argv: List[str], workdir: str, env: Optional[Dict[str, str]]
+) -> subprocess.Popen:
+    """Run Python code with arguments in a directory, importing this checkout."""
+    env = {**os.environ, **(env or {})}
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+        + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    )
+    return subprocess.Popen(
+        [sys.executable, "-c", f"import sys; sys.argv[1:] = {argv!r}; {code}"],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _responds(url: str) -> bool:
+    """Check whether a URL can be fetched."""
+    try:
+        urllib.request.urlopen(url, timeout=1).read()
+    except OSError:
+        return False
+    return True
+
+
+def _wait_until(ready: Callable[[], bool], process: subprocess.Popen) -> None:
+    """Wait up to 30 seconds for a started process to become ready."""
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and process.poll() is None:
+        if ready():
+            return
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Server did not start")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    """Terminate a process and wait for it."""
+    process.terminate()
+    process.wait()
+
+
+def hold_stream(url: str, stop: threading.Event, rejected: List[int]) -> None:
+    """Keep an event stream open, reading events until stopped.
+
+    Streams the server turns away (503) are counted in ``rejected``.
+    """
+    try:
+        with urllib.request.urlopen(url + "/api/events", timeout=60) as response:
+            while not stop.is_set() and response.readline():
+                pass
+    except urllib.error.HTTPError as e:
+        if e.code == 503:
+            rejected.append(e.code)
+    except OSError:
+        pass
+
+
+def poll_status(
+    url: str,
+    interval: float,
+    stop: threading.Event,
+    latencies: List[float],
+    errors: List[str],
+) -> None:
+    """Request the status endpoint every interval, recording each latency."""
+    # Spread the clients over the interval instead of firing all at once
+    stop.wait(random.uniform(0, interval))
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            urllib.request.urlopen(url + "/api/recording/status", timeout=30).read()
+        except OSError as e:
+            errors.append(str(e))
+        else:
+            latencies.append(time.perf_counter() - start)
+        stop.wait(max(0.0, interval - (time.perf_counter() - start)))
+
+
+def run(
+    url: str, clients: int, streams: int, duration: float, interval: float
+) -> Dict[str, float]:
+    """Run the load test against a server and summarize latencies in ms."""
+    stop = threading.Event()
+    rejected: List[int] = []
+    for _ in range(streams):
+        threading.Thread(
+            target=hold_stream, args=(url, stop, rejected), daemon=True
+        ).start()
+    time.sleep(0.5)
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    threads = [
+        threading.Thread(
+            target=poll_status, args=(url, interval, stop, latencies, errors)
+        )
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "interval": interval,
+        "streams": streams,
+        "streams_rejected": len(rejected),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else float("nan"),
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the load test and print the result as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target a running server instead")
+    parser.add_argument(
+        "--worker-class", choices=("gthread", "gevent"), default="gthread"
+    )
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--streams", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between polls"
+    )
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        process = start_server(args.worker_class, args.threads, port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        result = run(url, args.clients, args.streams, args.duration, args.interval)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    result["worker_class"] = args.worker_class if args.url is None else None
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Startup time benchmark.
+
+Measures, in fresh interpreters, the import time of the application's entry
+points (from ``python -X importtime``) and the time from launching ``gst-rec``
+until it answers its first request. The heaviest imports of each entry point
+are listed so that a regression can be traced to the module that caused it.
+Prints JSON in the format of ``suite.py``, for comparison with ``compare.py``.
+
+Example
+-------
+    python -m benchmarks.startup --runs 10 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.load_status import free_port, percentile, start_server
+from benchmarks.suite import REPO, git_revision, summarize
+
+ENTRY_POINTS = (
+    "gst_rec_app.wsgi",  # web workers
+    "gst_rec_app.services.daemon",  # recorder daemon
+    "gst_rec_app.cli",  # command-line parsing
+)
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(module: str, workdir: str) -> Tuple[float, Dict[str, float]]:
+    """Import a module in a fresh interpreter.
+
+    Returns
+    -------
+    Tuple[float, Dict[str, float]]
+        Total import time of the module in seconds, and the cumulative time of
+        each of its direct imports
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [REPO] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    )
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    lines = [m for m in map(_IMPORTTIME_RE.match, stderr.splitlines()) if m]
+    total, packages = 0.0, {}
+    # Children are listed before their parent, one nesting level (two spaces)
+    # deeper, so the entry point's direct imports precede its own line
+    for index, match in enumerate(lines):
+        if match[4] == module and len(match[3]) == 1:
+            total = int(match[2]) / 1e6
+            for child in reversed(lines[:index]):
+                if len(child[3]) == 1:
+                    break
+                if len(child[3]) == 3:
+                    packages[child[4]] = int(child[2]) / 1e6
+    return total, packages
+
+
+def first_response() -> float:
+    """Launch ``gst-rec`` and time it until its first successful response."""
+    start = time.perf_counter()
+    process = start_server("gthread", None, free_port())
+    elapsed = time.perf_counter() - start
+    process.terminate()
+    process.wait()
+    return elapsed
+
+
+def main() -> None:
+    """Parse arguments, run the measurements and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes each")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports shown")
+    parser.add_argument("--label", help="Name of this run, e.g. a version")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gst-rec-startup-")
+    results: List[Dict[str, Any]] = []
+    heaviest: Dict[str, Dict[str, float]] = {}
+    for module in ENTRY_POINTS:
+        totals, packages = [], {}
+        for _ in range(args.runs):
+            total, run_packages = import_times(module, workdir)
+            totals.append(total)
+            for name, seconds in run_packages.items():
+                packages.setdefault(name, []).append(seconds)
+        results.append(summarize(module, "import", totals, 0, 0))
+        medians = {name: percentile(sorted(s), 50) for name, s in packages.items()}
+        ranked = sorted(medians.items(), key=lambda item: item[1], reverse=True)
+        heaviest[module] = {
+            name: round(seconds * 1000, 2) for name, seconds in ranked[: args.top]
+        }
+
+    startups = [first_response() for _ in range(args.runs)]
+    results.append(summarize("gunicorn_first_response", "startup", startups, 0, 0))
+
+    report = {
+        "meta": {
+            "label": args.label,
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "runs": args.runs,
+            "heaviest_imports_ms": heaviest,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""Benchmark suite of the services and HTTP endpoints.
+
+Generates (or reuses) a synthetic recordings tree, then measures:
+
+- services, in-process: ``list_directory`` (cold and cached) and
+  ``list_directory_page`` on a large directory, building and reconciling the
+  recordings index and its files table, ``search``, ``get_recordings`` (first
+  page, by size, by sensor), a ``get_storage_info`` sample, and
+  ``Settings.set``/``Settings.flush``
+- every read-only HTTP endpoint with ``--concurrency`` concurrent clients,
+  through the Flask test client and through a real Gunicorn server
+
+Recording start/stop and the event stream are not measured, since they change
+state or never complete. Results are printed (or written to ``--output``) as
+JSON with throughput and p50/p99 latencies per benchmark, along with the git
+revision and tree parameters, for comparison with ``compare.py``.
+
+Example
+-------
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --sessions 2000 --segments 120 --output big.json
+"""
+
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.load_status import free_port, percentile, start_server
+from benchmarks.synthetic_tree import TreeSpec, generate_tree
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, path, headers) of the HTTP benchmarks; {id} is a recording id
+ENDPOINTS: List[Tuple[str, str, Dict[str, str]]] = [
+    ("index", "/", {}),
+    ("status", "/api/recording/status", {}),
+    ("storage", "/api/storage", {}),
+    ("sensors", "/api/sensors", {}),
+    ("settings_path", "/api/settings/path", {}),
+    ("recordings", "/api/recordings", {}),
+    ("recordings_by_size", "/api/recordings?sort=size&limit=200", {}),
+    ("recordings_gzip", "/api/recordings", {"Accept-Encoding": "gzip"}),
+    ("browse_flat", "/api/browse?path={flat}", {}),
+    ("browse_flat_page", "/api/browse?path={flat}&limit=200", {}),
+    ("browse_root", "/api/browse?path={root}", {}),
+    ("search_extension", "/api/search?name=*.imu", {}),
+    ("search_sensor_by_size", "/api/search?sensor=camera1&sort=size&limit=200", {}),
+    ("search_subtree", "/api/search?path={flat}&name=file_00001*", {}),
+    ("download_range", "/api/recordings/{id}/download", {"Range": "bytes=0-65535"}),
+    ("metrics", "/metrics", {}),
+]
+
+
+def summarize(
+    name: str, kind: str, latencies: List[float], errors: int, wall: float
+) -> Dict[str, Any]:
+    """Summarize the latencies (seconds) of a benchmark."""
+    latencies = sorted(latencies)
+    return {
+        "name": name,
+        "kind": kind,
+        "n": len(latencies),
+        "errors": errors,
+        "throughput_per_s": round(len(latencies) / wall, 1) if wall > 0 else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else None,
+    }
+
+
+def bench(
+    name: str,
+    call: Callable[[], Any],
+    iterations: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """Time ``call`` sequentially; ``setup`` runs untimed before each call."""
+    latencies = []
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return summarize(name, "service", latencies, 0, sum(latencies))
+
+
+def load(
+    name: str,
+    kind: str,
+    client_factory: Callable[[], Callable[[], bool]],
+    concurrency: int,
+    requests: int,
+) -> Dict[str, Any]:
+    """Issue ``requests`` requests from ``concurrency`` threads.
+
+    ``client_factory`` is called once per thread and returns a function that
+    sends one request and tells whether it succeeded.
+    """
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    per_thread = max(1, requests // concurrency)
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker() -> None:
+        send = client_factory()
+        own: List[float] = []
+        failed = 0
+        barrier.wait()
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            ok = send()
+            own.append(time.perf_counter() - start)
+            failed += not ok
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return summarize(name, kind, latencies, errors[0], time.perf_counter() - start)
+
+
+def run_services(root: str, workdir: str, iterations: int) -> List[Dict[str, Any]]:
+    """Benchmark the service functions in this process."""
+    from gst_rec_app.models import Settings, settings
+    from gst_rec_app.services.filesystem import (
+        directory_cache,
+        list_directory,
+        list_directory_page,
+    )
+    from gst_rec_app.services.index import get_index
+    from gst_rec_app.services.recordings import RecordingsQuery, get_recordings
+    from gst_rec_app.services.storage import get_storage_sampler
+
+    flat = os.path.join(root, "flat")
+    index = get_index(root)
+    results = [bench("index_build", lambda: index.reconcile(force=True), 1)]
+    results += [
+        bench(
+            "list_directory_cold",
+            lambda: list_directory(flat),
+            iterations,
+            setup=lambda: directory_cache.invalidate(flat),
+        ),
+        bench("list_directory_cached", lambda: list_directory(flat), iterations),
+        bench(
+            "list_directory_page_cold",
+            lambda: list_directory_page(flat, 200),
+            iterations,
+            setup=lambda: directory_cache.invalidate(flat),
+        ),
+        bench("index_reconcile", lambda: index.reconcile(force=True), iterations),
+        bench("files_build", lambda: index.reconcile_files(force=True), 1),
+        bench("files_reconcile", lambda: index.reconcile_files(force=True), iterations),
+        bench("search_extension", lambda: index.search(name="*.mkv"), iterations),
+        bench("get_recordings", lambda: get_recordings(settings), iterations),
+        bench(
+            "get_recordings_by_size",
+            lambda: get_recordings(settings, RecordingsQuery(limit=200, sort="size")),
+            iterations,
+        ),
+        bench(
+            "get_recordings_by_sensor",
+            lambda: get_recordings(settings, RecordingsQuery(sensors=["camera1"])),
+            iterations,
+        ),
+        bench("get_storage_info", get_storage_sampler(settings).sample, iterations),
+    ]
+
+    scratch = Settings(os.path.join(workdir, "bench-settings.json"), flush_delay=3600)
+    counter = iter(range(10**9))
+    results.append(
+        bench("settings_set", lambda: scratch.set("key", next(counter)), iterations)
+    )
+    results.append(
+        bench(
+            "settings_flush",
+            scratch.flush,
+            iterations,
+            setup=lambda: scratch.set("key", next(counter)),
+        )
+    )
+    return results
+
+
+def endpoint_paths(root: str) -> List[Tuple[str, str, Dict[str, str]]]:
+    """Fill in the placeholders of :data:`ENDPOINTS`."""
+    from gst_rec_app.services.index import get_index
+
+    recordings = get_index(root).list()
+    single = [r for r in recordings if not r.segments or r.segments == 1]
+    recording_id = single[0].id if single else 1
+    values = {"flat": os.path.join(root, "flat"), "root": root, "id": recording_id}
+    return [(name, path.format(**values), h) for name, path, h in ENDPOINTS]
+
+
+def run_test_client(
+    endpoints: List[Tuple[str, str, Dict[str, str]]], concurrency: int, requests: int
+) -> List[Dict[str, Any]]:
+    """Benchmark the endpoints through the Flask test client."""
+    from gst_rec_app import create_app
+
+    app = create_app()
+
+    def client_factory(path: str, headers: Dict[str, str]) -> Callable[[], bool]:
+        client = app.test_client()
+
+        def send() -> bool:
+            response = client.get(path, headers=headers)
+            response.get_data()
+            response.close()
+            return response.status_code < 400
+
+        return send
+
+    return [
+        load(
+            name,
+            "test_client",
+            lambda p=path, h=headers: client_factory(p, h),
+            concurrency,
+            requests,
+        )
+        for name, path, headers in endpoints
+    ]
+
+
+def run_gunicorn(
+    endpoints: List[Tuple[str, str, Dict[str, str]]],
+    root: str,
+    home: str,
+    concurrency: int,
+    requests: int,
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """Benchmark the endpoints on a Gunicorn server, over keep-alive connections."""
+    port = free_port()
+    process = start_server(
+        "gthread",
+        None,
+        port,
+        settings={"default_path": root},
+        workers=workers,
+        env={"HOME": home},
+    )
+
+    def client_factory(path: str, headers: Dict[str, str]) -> Callable[[], bool]:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+        def send() -> bool:
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                return False
+            return response.status < 400
+
+        return send
+
+    try:
+        return [
+            load(
+                name,
+                "gunicorn",
+                lambda p=path, h=headers: client_factory(p, h),
+                concurrency,
+                requests,
+            )
+            for name, path, headers in endpoints
+        ]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def git_revision() -> Optional[str]:
+    """Get the checked out revision, with ``-dirty`` for local changes."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tree",
+        default=os.path.join(tempfile.gettempdir(), "gst-rec-bench"),
+        help="Home directory holding the synthetic tree in rec/ (reused if present)",
+    )
+    parser.add_argument("--sessions", type=int, default=TreeSpec.sessions)
+    parser.add_argument("--sensors", type=int, default=TreeSpec.sensors)
+    parser.add_argument("--segments", type=int, default=TreeSpec.segments)
+    parser.add_argument("--flat-files", type=int, default=TreeSpec.flat_files)
+    parser.add_argument("--seed", type=int, default=TreeSpec.seed)
+    parser.add_argument(
+        "--iterations", type=int, default=50, help="Calls per service benchmark"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400, help="Per endpoint")
+    parser.add_argument("--workers", type=int, default=1, help="Gunicorn workers")
+    parser.add_argument("--no-gunicorn", action="store_true")
+    parser.add_argument("--label", help="Name of this run, e.g. a version")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    spec = TreeSpec(
+        sessions=args.sessions,
+        sensors=args.sensors,
+        segments=args.segments,
+        flat_files=args.flat_files,
+        seed=args.seed,
+    )
+    home = os.path.abspath(args.tree)
+    root = os.path.join(home, "rec")
+    tree = generate_tree(root, spec)
+
+    # Browsing is limited to the home directory, and the settings file is read
+    # from the working directory when the application is imported
+    os.environ["HOME"] = home
+    workdir = tempfile.mkdtemp(prefix="gst-rec-bench-")
+    with open(os.path.join(workdir, "settings.json"), "w") as f:
+        json.dump({"recorder_backend": "fake", "default_path": root}, f)
+    os.chdir(workdir)
+    sys.path.insert(0, REPO)
+
+    # Keep stdout for the report; the application logs there
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_services(root, workdir, args.iterations)
+        endpoints = endpoint_paths(root)
+        results += run_test_client(endpoints, args.concurrency, args.requests)
+        if not args.no_gunicorn:
+            results += run_gunicorn(
+                endpoints, root, home, args.concurrency, args.requests, args.workers
+            )
+
+    from gst_rec_app import __version__
+
+    report = {
+        "meta": {
+            "label": args.label,
+            "version": __version__,
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "tree": {**vars(spec), **tree},
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Synthetic recordings tree generator.
+
+Creates a recordings directory laid out like the recorder's output: session
+directories (``rec_YYYYmmdd_HHMMSS``) with a ``session.json`` manifest and one
+file, or one directory of segments, per sensor. A ``flat`` directory of
+``--flat-files`` entries exercises listings of large directories. Files are
+sparse, so a tree of any size takes little disk space.
+
+The tree is fully determined by its parameters and the seed. They are stored
+in ``.tree.json`` in the root, and an existing tree with the same parameters
+is reused instead of being generated again.
+
+Example
+-------
+    python -m benchmarks.synthetic_tree /tmp/bench/rec --sessions 1000 --segments 250
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+TREE_FILE = ".tree.json"
+SENSORS = ("camera1", "camera2", "microphone", "imu")
+EXTENSIONS = {"camera1": "mkv", "camera2": "mkv", "microphone": "mkv", "imu": "imu"}
+
+
+@dataclass
+class TreeSpec:
+    """Parameters of a synthetic tree."""
+
+    sessions: int = 200
+    sensors: int = 4  # first n of SENSORS
+    segments: int = 0  # segments per video/audio recording; 0 for single files
+    flat_files: int = 10000  # entries of the flat directory
+    seed: int = 0
+
+    @property
+    def files(self) -> int:
+        """Number of files in the tree, excluding manifests."""
+        per_sensor = [
+            1 if sensor == "imu" else max(1, self.segments)
+            for sensor in SENSORS[: self.sensors]
+        ]
+        return self.sessions * sum(per_sensor) + self.flat_files
+
+
+def generate_tree(root: str, spec: TreeSpec) -> Dict[str, float]:
+    """Create the tree of a spec in ``root``, unless it already exists.
+
+    Returns
+    -------
+    Dict[str, float]
+        The number of files and the generation time in seconds (0 if reused)
+    """
+    marker = os.path.join(root, TREE_FILE)
+    try:
+        with open(marker) as f:
+            if json.load(f) == asdict(spec):
+                return {"files": spec.files, "seconds": 0.0}
+    except (OSError, ValueError):
+        pass
+    if os.path.exists(root) and os.listdir(root):
+        raise RuntimeError(f"{root} is not empty and not a tree of this spec")
+
+    start = time.perf_counter()
+    rng = random.Random(spec.seed)
+    os.makedirs(root, exist_ok=True)
+    base = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+    for index in range(spec.sessions):
+        started = base + index * 3600
+        _write_session(root, started, SENSORS[: spec.sensors], spec.segments, rng)
+
+    flat = os.path.join(root, "flat")
+    os.makedirs(flat)
+    for index in range(spec.flat_files):
+        if index % 10 == 0:
+            os.mkdir(os.path.join(flat, f"dir_{index:07d}"))
+        else:
+            _sparse_file(os.path.join(flat, f"file_{index:07d}.bin"), rng)
+
+    with open(marker, "w") as f:
+        json.dump(asdict(spec), f)
+    return {"files": spec.files, "seconds": round(time.perf_counter() - start, 2)}
+
+
+def _write_session(
+    root: str, started: float, sensors: List[str], segments: int, rng: random.Random
+) -> None:
+    """Create one session directory with its manifest and sensor outputs."""
+    name = time.strftime("rec_%Y%m%d_%H%M%S", time.localtime(started))
+    directory = os.path.join(root, name)
+    os.makedirs(directory)
+    duration_ns = rng.randint(60, 3600) * 10**9
+    manifest = {
+        "session": name,
+        "base_time_ns": int(started * 1e9),
+        "sensors": {},
+    }
+    for sensor in sensors:
+        extension = EXTENSIONS[sensor]
+        if segments and sensor != "imu":
+            os.mkdir(os.path.join(directory, sensor))
+            for segment in range(segments):
+                path = os.path.join(directory, sensor, f"seg_{segment:05d}.{extension}")
+                _sparse_file(path, rng)
+            relative = f"{sensor}/seg_%05d.{extension}"
+        else:
+            relative = f"{sensor}.{extension}"
+            _sparse_file(os.path.join(directory, relative), rng)
+        manifest["sensors"][sensor] = {
+            "name": sensor,
+            "path": relative,
+            "started_offset_ns": rng.randint(0, 10**8),
+            "stopped_offset_ns": duration_ns,
+        }
+    with open(os.path.join(directory, "session.json"), "w") as f:
+        json.dump(manifest, f)
+
+
+def _sparse_file(path: str, rng: random.Random) -> None:
+    """Create a sparse file of random size, between 1 KB and 2 GB."""
+    with open(path, "wb") as f:
+        f.truncate(int(1024 * 2 ** rng.uniform(0, 21)))
+
+
+def main() -> None:
+    """Parse arguments, generate the tree and print its summary as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="Recordings directory to create")
+    parser.add_argument("--sessions", type=int, default=TreeSpec.sessions)
+    parser.add_argument("--sensors", type=int, default=TreeSpec.sensors)
+    parser.add_argument("--segments", type=int, default=TreeSpec.segments)
+    parser.add_argument("--flat-files", type=int, default=TreeSpec.flat_files)
+    parser.add_argument("--seed", type=int, default=TreeSpec.seed)
+    args = parser.parse_args()
+    spec = TreeSpec(
+        sessions=args.sessions,
+        sensors=args.sensors,
+        segments=args.segments,
+        flat_files=args.flat_files,
+        seed=args.seed,
+    )
+    print(json.dumps(generate_tree(args.root, spec)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
-"""Flask application initialization."""
+"""Flask application initialization.
 
-__version__ = "0.1.0"
+Flask is imported by :func:`create_app`, not with the package, so that
+processes without a web server (e.g. the recorder daemon) start quickly.
+"""
 
-from flask import Flask, Response
-from flask_cors import CORS
+__version__ = "0.1.0"
 
 
 def create_app():
@@ -14,21 +15,18 @@ def create_app():
     Flask
         Configured Flask application instance
     """
+    from flask import Flask
+    from flask_cors import CORS
+
     app = Flask(__name__)
 
     # Enable CORS with specific options
     CORS(app, supports_credentials=True)
 
-    # Add no-cache headers to all responses
-    @app.after_request
-    def add_header(response: Response) -> Response:
-        """Add headers to prevent caching."""
-        response.headers[
-            "Cache-Control"
-        ] = "no-store, no-cache, must-revalidate, max-age=0"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        return response
+    # Cache static assets and listings selectively, compress large JSON
+    from gst_rec_app import caching
+
+    caching.init_app(app)
 
     # Register blueprints
     from gst_rec_app.routes import main
@@ -0,0 +1,139 @@
+"""HTTP caching and compression module.
+
+This module applies a caching policy per kind of response instead of
+forbidding caching everywhere:
+
+- Static assets are linked with a content hash (``?v=...``) and cached for a
+  year, so a changed file gets a new URL and an unchanged one is never fetched
+  again.
+- Listing endpoints decorated with :func:`conditional` get a weak ETag over
+  their body and answer ``If-None-Match`` with 304 Not Modified.
+- Responses that set their own ``Cache-Control`` (e.g. downloads) keep it; any
+  other response is marked ``no-store``.
+- Large JSON responses are compressed with brotli (if installed) or gzip.
+"""
+
+import functools
+import gzip
+import hashlib
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask, Response, make_response, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+STATIC_MAX_AGE = 365 * 24 * 3600
+COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are not worth compressing
+COMPRESS_MIMETYPES = ("application/json",)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_hashes: Dict[str, Tuple[int, str]] = {}
+
+
+def static_hash(app: Flask, filename: str) -> Optional[str]:
+    """Get a short content hash of a static file.
+
+    Hashes are cached and only recomputed when the file's mtime changes.
+
+    Returns
+    -------
+    str, optional
+        First 12 hex digits of the SHA-256 digest, or None if the file does
+        not exist
+    """
+    path = os.path.join(app.static_folder or "", filename)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _hashes.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = _hashes[path] = (mtime, hashlib.sha256(f.read()).hexdigest()[:12])
+    return cached[1]
+
+
+def conditional(view: Callable[..., Any]) -> Callable[..., Any]:
+    """Make a view's successful responses revalidatable with an ETag.
+
+    The ETag is weak, so it stays valid when the body is compressed. Streamed
+    responses are passed through unchanged.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Response:
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200 or response.is_streamed:
+            return response
+        digest = hashlib.sha1(response.get_data()).hexdigest()
+        response.set_etag(digest, weak=True)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    return wrapper
+
+
+def compress(response: Response) -> Response:
+    """Compress a large JSON response if the client accepts it."""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or response.mimetype not in COMPRESS_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+        response.content_encoding = "br"
+    elif accepted["gzip"]:
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+        response.content_encoding = "gzip"
+    return response
+
+
+def init_app(app: Flask) -> None:
+    """Install the caching policy and compression on an application.
+
+    Parameters
+    ----------
+    app : Flask
+        Application to configure
+    """
+
+    @app.url_defaults
+    def add_static_hash(endpoint: str, values: Dict[str, Any]) -> None:
+        """Add the content hash to static URLs built with ``url_for``."""
+        if endpoint == "static" and "filename" in values and "v" not in values:
+            digest = static_hash(app, values["filename"])
+            if digest is not None:
+                values["v"] = digest
+
+    @app.after_request
+    def add_cache_headers(response: Response) -> Response:
+        """Apply the caching policy of the response's kind, then compress."""
+        if request.endpoint == "static" and request.args.get("v"):
+            # The URL changes with the content, so it never needs revalidation
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        elif "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = (
+                "no-store, no-cache, must-revalidate, max-age=0"
+            )
+            response.headers["Pragma"] = "no-cache"
+            response.headers["Expires"] = "0"
+        return compress(response)
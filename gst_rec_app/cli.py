@@ -1,58 +1,35 @@
 """Command-line interface for the GST Recording application.
 
 This module provides command-line interfaces for running the application in both
-production and development modes. It includes a custom Gunicorn application class
-for production deployment and a development server with debug capabilities.
+production and development modes, and the recorder daemon. Gunicorn, Flask and
+the application are imported only once the arguments are parsed, and only by
+the commands that need them, so starting (or failing on bad arguments) is fast.
 """
 
 import argparse
-from pathlib import Path
-from typing import Any, Dict, Optional
+import importlib.util
+import logging
+import os
 
-import gunicorn.app.base
-from flask import Flask
+# Both keep serving other requests while /api/events streams stay open; a sync
+# worker would be taken by the first browser tab
+WORKER_CLASSES = ("gthread", "gevent")
+SETTINGS_HELP = "Settings file (default: $GST_REC_SETTINGS or ./settings.json)"
 
 
-class GunicornApplication(gunicorn.app.base.Application):
-    """Custom Gunicorn application for production deployment.
+def use_settings_file(path: str) -> None:
+    """Select the settings file of this process and of the processes it starts.
 
-    This class extends Gunicorn's BaseApplication to provide a customized WSGI
-    server implementation with configuration loading from a file.
+    Must be called before the settings are first used.
 
     Parameters
     ----------
-    app: The WSGI application to serve
-    options: Optional dictionary of Gunicorn configuration options
+    path : str
+        Settings file; relative paths are resolved against the working directory
     """
+    from gst_rec_app.models import SETTINGS_ENV
 
-    def __init__(self, app: Flask, options: Optional[Dict[str, Any]] = None) -> None:
-        self.options = options or {}
-        self.application = app
-        super().__init__()
-
-    def load_config(self) -> None:
-        """Load Gunicorn configuration from file and CLI options.
-
-        Loads the default configuration from gunicorn_conf.py and then
-        overrides settings with any provided CLI options.
-        """
-        # Load the default config file
-        config_path = Path(__file__).parent / "gunicorn_conf.py"
-        self.load_config_from_file(str(config_path))
-
-        # Override with CLI options
-        for key, value in self.options.items():
-            if key in self.cfg.settings and value is not None:
-                self.cfg.set(key.lower(), value)
-
-    def load(self) -> Flask:
-        """Return the WSGI application to be run.
-
-        Returns
-        -------
-        The Flask application instance
-        """
-        return self.application
+    os.environ[SETTINGS_ENV] = os.path.abspath(path)
 
 
 def run_prod() -> None:
@@ -60,26 +37,53 @@ def run_prod() -> None:
 
     Parses command line arguments and starts a production Gunicorn server
     with the specified configuration. Supports customization of host, port,
-    number of workers, and log level.
+    number of workers, worker class, threads per worker, and log level.
+
+    The worker class selects the concurrency mode: ``gthread`` (default) serves
+    requests from a thread pool, ``gevent`` from greenlets (requires the
+    ``gevent`` extra). Recording commands are serialized by the control plane
+    in both modes. More than one worker requires the recorder daemon, which
+    then owns the devices.
     """
     parser = argparse.ArgumentParser(description="GST Recording App Server")
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--workers", type=int, help="Number of worker processes")
+    parser.add_argument(
+        "--worker-class",
+        choices=WORKER_CLASSES,
+        help="Concurrency mode of the workers (default: gthread)",
+    )
+    parser.add_argument(
+        "--threads", type=int, help="Request threads per gthread worker"
+    )
     parser.add_argument("--log-level", default="info", help="Logging level")
+    parser.add_argument("--settings", help=SETTINGS_HELP)
 
     args = parser.parse_args()
+    if args.worker_class == "gevent" and importlib.util.find_spec("gevent") is None:
+        parser.error("--worker-class gevent requires gevent (pip install gevent)")
+    if args.settings:
+        use_settings_file(args.settings)
+    if args.workers and args.workers > 1:
+        from gst_rec_app.models import get_settings
 
-    # Import app here to avoid circular imports
-    from gst_rec_app.wsgi import app
+        # Each worker would drive the devices on its own
+        if not get_settings().get("daemon_socket"):
+            parser.error("--workers > 1 requires a recorder daemon (daemon_socket)")
 
     options = {
         "bind": f"{args.host}:{args.port}",
         "workers": args.workers,
+        "worker_class": args.worker_class,
+        "threads": args.threads,
         "loglevel": args.log_level,
     }
 
-    GunicornApplication(app, options).run()
+    from gst_rec_app.server import GunicornApplication
+
+    # The app is loaded after gunicorn_conf.py, which configures metrics
+    GunicornApplication(options=options).run()
 
 
 def run_dev() -> None:
@@ -93,11 +97,53 @@ def run_dev() -> None:
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=5000, help="Port to bind to")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
+    parser.add_argument("--settings", help=SETTINGS_HELP)
 
     args = parser.parse_args()
+    if args.settings:
+        use_settings_file(args.settings)
 
     # Import app here to avoid circular imports
     from gst_rec_app import create_app
+    from gst_rec_app.models import get_settings
+    from gst_rec_app.services.recording import manager, start_owner_services
 
     app = create_app()
-    app.run(host=args.host, port=args.port, debug=True, use_reloader=args.reload)
+    settings = get_settings()
+    # With the reloader, requests are served by a child process it restarts
+    serving = not args.reload or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+    if serving and not settings.get("daemon_socket"):
+        start_owner_services(settings)
+    try:
+        app.run(host=args.host, port=args.port, debug=True, use_reloader=args.reload)
+    finally:
+        manager.close_preroll()
+
+
+def run_daemon() -> None:
+    """Run the recorder daemon.
+
+    The daemon owns the recording pipelines and serves start, stop and status
+    commands on a Unix domain socket. Web workers use it when the
+    ``daemon_socket`` setting points at the same socket.
+    """
+    parser = argparse.ArgumentParser(description="GST Recording Daemon")
+    parser.add_argument(
+        "--socket", help="Socket path (default: daemon_socket setting or /tmp)"
+    )
+    parser.add_argument("--log-level", default="info", help="Logging level")
+    parser.add_argument("--settings", help=SETTINGS_HELP)
+
+    args = parser.parse_args()
+    if args.settings:
+        use_settings_file(args.settings)
+
+    from gst_rec_app.models import settings
+    from gst_rec_app.services.daemon import serve
+    from gst_rec_app.services.ipc import DEFAULT_SOCKET
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="[%(asctime)s] [%(process)d] [%(levelname)s] %(message)s",
+    )
+    serve(args.socket or settings.get("daemon_socket") or DEFAULT_SOCKET, settings)
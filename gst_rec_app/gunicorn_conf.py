@@ -6,21 +6,43 @@ This configuration is optimized for an application that:
 3. Requires consistent client-server connections
 """
 
+import glob
+import os
+import tempfile
+from typing import Any
+
+# Metrics: workers share their counters through files in this directory. It is
+# set up before the application is loaded, which imports prometheus_client, and
+# emptied of the files of a previous run
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "gst-rec-metrics")
+)
+os.makedirs(metrics_dir, exist_ok=True)
+for stale in glob.glob(os.path.join(metrics_dir, "*.db")):
+    os.unlink(stale)
+
 # Server socket
 bind = "0.0.0.0:8000"
-backlog = 64  # Reduced backlog since we expect fewer concurrent connections
+backlog = 256  # Room for bursts of concurrent clients
 
 # Worker processes
-workers = 1  # Single worker to prevent race conditions with hardware
-worker_class = "sync"  # Synchronous workers for predictable hardware access
-worker_connections = 100  # Reduced connections per worker
+workers = 1  # Single worker owns the hardware, unless a recorder daemon is used
+worker_class = "gthread"  # Threads, so /api/events streams do not block requests
+threads = 32  # Concurrent requests (including event streams) per worker
+# Threads of a gthread worker kept for other requests: each /api/events stream
+# holds a thread while it is open, so further streams are answered with 503
+# and those browsers poll instead
+reserved_threads_ratio = 0.25
+worker_connections = 1000  # Concurrent clients per gevent worker
 timeout = 120  # Increased timeout for long-running recording operations
 keepalive = 5
 
 # Graceful shutdown
 graceful_timeout = 30
-max_requests = 100  # Restart workers periodically to prevent memory leaks
-max_requests_jitter = 10
+# No periodic worker restarts: the worker owns the recording pipelines and the
+# open event streams, and a restart would interrupt both
+max_requests = 0
+max_requests_jitter = 0
 
 # Logging
 accesslog = "-"
@@ -35,3 +57,36 @@ proc_name = "gst-rec-app"
 # Process management
 preload_app = True  # Load application code before forking
 reload = False  # Disable auto-reload in production
+
+
+# Server hooks
+def post_worker_init(worker: Any) -> None:
+    """Limit event streams, and start background work if the worker owns recordings.
+
+    Without a recorder daemon the single worker owns the recordings; the work starts
+    after the fork, since threads do not survive it.
+    """
+    from gst_rec_app.models import get_settings
+    from gst_rec_app.services.events import bus
+    from gst_rec_app.services.recording import start_owner_services
+
+    if worker.cfg.worker_class_str == "gthread":
+        threads = worker.cfg.threads
+        bus.max_subscribers = threads - max(1, int(threads * reserved_threads_ratio))
+    settings = get_settings()
+    if not settings.get("daemon_socket"):
+        start_owner_services(settings)
+
+
+def worker_exit(server: Any, worker: Any) -> None:
+    """Stop the pre-roll encoders of an exiting worker, which would outlive it."""
+    from gst_rec_app.services.recording import manager
+
+    manager.close_preroll()
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Stop reporting live gauges of an exited worker."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
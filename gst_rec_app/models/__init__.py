@@ -2,26 +2,83 @@
 
 This package contains data models and response structures used throughout the application.
 It includes models for API responses, recording data, sensor status, and application settings.
+
+The ``settings`` singleton is created on first access, not at import, from the file
+named by the ``GST_REC_SETTINGS`` environment variable or ``settings.json`` in the
+working directory.
 """
 
+import os
+import threading
+from typing import Any, Optional
+
 from .responses import (
     ApiResponse,
+    ProcessingJob,
+    RecorderStats,
     Recording,
+    RecordingJob,
     RecordingsResponse,
+    RecordingStatus,
+    SamplesResponse,
+    SearchResponse,
+    SearchResult,
     SensorStatus,
+    SessionJob,
+    SessionStatus,
     StorageInfo,
 )
 from .settings import Settings
 
-# Create a singleton instance of Settings
-settings = Settings()
+# Importing the submodule bound its name here; unbind it so that ``settings``
+# resolves to the singleton through __getattr__
+del settings  # noqa: F821
+
+SETTINGS_ENV = "GST_REC_SETTINGS"
+DEFAULT_SETTINGS_FILE = "settings.json"
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Get the application settings, loading them on first use.
+
+    Returns
+    -------
+    Settings
+        Singleton of the file named by ``GST_REC_SETTINGS``, or
+        ``settings.json`` in the working directory
+    """
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings(os.environ.get(SETTINGS_ENV) or DEFAULT_SETTINGS_FILE)
+        return _settings
+
+
+def __getattr__(name: str) -> Any:
+    """Create the ``settings`` singleton when it is first imported (PEP 562)."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "Settings",
-    "settings",
+    "get_settings",
     "ApiResponse",
+    "ProcessingJob",
+    "RecorderStats",
     "Recording",
+    "RecordingJob",
     "RecordingsResponse",
+    "RecordingStatus",
+    "SamplesResponse",
+    "SearchResponse",
+    "SearchResult",
     "StorageInfo",
     "SensorStatus",
+    "SessionJob",
+    "SessionStatus",
 ]
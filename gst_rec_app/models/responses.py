@@ -1,8 +1,8 @@
 """Models for API responses and data structures."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -13,15 +13,86 @@ class ApiResponse:
     message: str
 
 
+@dataclass
+class RecordingJob:
+    """Response format for a requested recording state transition."""
+
+    status: str
+    message: str
+    state: str
+    job_id: Optional[str] = None
+    sensor: Optional[str] = None
+
+
+@dataclass
+class SessionJob:
+    """Response format for transitions requested on a group of sensors."""
+
+    status: str
+    message: str
+    session: Optional[str]
+    jobs: List[RecordingJob]
+
+
+@dataclass
+class RecorderStats:
+    """Represents throughput statistics of a recording pipeline."""
+
+    bytes_written: int = 0
+    frames_dropped: int = 0
+    latency_ms: Optional[float] = None
+
+
+@dataclass
+class RecordingStatus:
+    """Represents the current recording pipeline state."""
+
+    is_recording: bool
+    state: str
+    job_id: Optional[str] = None
+    error: Optional[str] = None
+    since: Optional[float] = None
+    path: Optional[str] = None
+    stats: Optional[RecorderStats] = None
+    sensor: Optional[str] = None
+    throughput: Optional[float] = None  # bytes/s
+
+
+@dataclass
+class SessionStatus:
+    """Represents the recording state of all sensors in the current session."""
+
+    is_recording: bool
+    state: str
+    session: Optional[str]
+    base_time_ns: Optional[int]
+    sensors: List[RecordingStatus]
+
+
+@dataclass
+class ProcessingJob:
+    """Represents a post-processing job of a recording."""
+
+    id: int
+    kind: str  # remux, thumbnails or checksum
+    state: str  # queued, running, done or failed
+    progress: float  # 0 to 1
+    message: Optional[str] = None
+
+
 @dataclass
 class Recording:
     """Represents a single recording."""
 
     id: int
     date: datetime
-    duration: str
-    size: str
+    duration: float  # seconds
+    size: int  # bytes
     path: str
+    sensor: str
+    session: str
+    segments: int
+    jobs: List[ProcessingJob] = field(default_factory=list)
 
 
 @dataclass
@@ -29,6 +100,46 @@ class RecordingsResponse:
     """Response format for recordings list."""
 
     recordings: List[Recording]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class SamplesResponse:
+    """Response format for a time range of a recording's samples.
+
+    ``columns`` holds ``t_ns`` and one list per value field, or, when
+    ``decimated``, the first timestamp and ``<field>_min``/``<field>_max`` of
+    each bucket.
+    """
+
+    recording: int
+    sensor: str
+    count: int  # samples in the range before downsampling
+    decimated: bool
+    columns: Dict[str, List[Any]]
+
+
+@dataclass
+class SearchResult:
+    """Represents a file or directory found in the recordings archive."""
+
+    name: str
+    path: str
+    is_dir: bool
+    size: Optional[int]  # bytes, None for directories
+    mtime: float
+    sensor: Optional[str] = None  # set on the outputs of a recording
+    recording: Optional[int] = None  # id of that recording
+
+
+@dataclass
+class SearchResponse:
+    """Represents one page of search results."""
+
+    results: List[SearchResult]
+    next_cursor: Optional[str] = None
+    indexing: bool = False  # results may miss entries not indexed yet
 
 
 @dataclass
@@ -39,6 +150,11 @@ class StorageInfo:
     used: int
     free: int
     percent: float
+    write_rate: Optional[float] = None  # bytes/s, over the last minute
+    time_until_full: Optional[float] = None  # seconds at the current write rate
+    sensors: Dict[str, int] = field(default_factory=dict)  # bytes per sensor
+    directories: Dict[str, int] = field(default_factory=dict)  # largest sessions
+    sampled_at: Optional[float] = None
 
 
 @dataclass
@@ -48,3 +164,10 @@ class SensorStatus:
     name: str
     status: str
     value: Optional[float] = None
+    id: Optional[str] = None
+    kind: Optional[str] = None  # video, audio or imu
+    device: Optional[str] = None
+    last_seen: Optional[float] = None  # epoch time of the last successful probe
+    fps: Optional[float] = None
+    errors: int = 0  # failed probes since startup
+    error: Optional[str] = None
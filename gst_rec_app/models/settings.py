@@ -1,9 +1,26 @@
-"""Settings management module for the application."""
+"""Settings management module for the application.
 
+Settings are kept in memory and written behind: :meth:`Settings.set` only
+schedules a save, and all changes made within ``flush_delay`` seconds are
+written together. Saves are atomic (temporary file, fsync, rename), so a crash
+never leaves a truncated file behind.
+
+Several processes (e.g. gunicorn workers) may share one settings file. Each
+one notices changes made by the others through the file's mtime, checked at
+most every ``check_interval`` seconds, and saves merge the pending changes
+into the current file contents under an exclusive lock.
+"""
+
+import atexit
+import fcntl
 import json
 import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 
 @dataclass
@@ -11,32 +28,128 @@ class Settings:
     """Handles application settings storage and retrieval."""
 
     settings_file: str
+    flush_delay: float
+    check_interval: float
     _settings: Dict[str, Any]
 
-    def __init__(self, settings_file: str = "settings.json"):
+    def __init__(
+        self,
+        settings_file: str = "settings.json",
+        flush_delay: float = 0.5,
+        check_interval: float = 1.0,
+    ):
         self.settings_file = settings_file
+        self.flush_delay = flush_delay
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Any] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._last_check = time.monotonic()
         self._settings = self._load_settings()
+        atexit.register(self.flush)
 
     def _load_settings(self) -> Dict[str, Any]:
         """Load settings from file or create default if not exists."""
-        if os.path.exists(self.settings_file):
+        try:
             with open(self.settings_file, "r") as f:
+                self._signature = _signature(os.fstat(f.fileno()))
                 return json.load(f)
-        return {}
+        except FileNotFoundError:
+            self._signature = None
+            return {}
 
     def _save_settings(self) -> None:
-        """Save current settings to file."""
-        with open(self.settings_file, "w") as f:
-            json.dump(self._settings, f, indent=4)
+        """Merge pending changes into the file and replace it atomically."""
+        with self._lock:
+            if not self._pending:
+                return
+            with _file_lock(self.settings_file + ".lock"):
+                self._reload_if_changed()
+                self._write_settings()
+            self._pending.clear()
+
+    def _write_settings(self) -> None:
+        """Replace the file, timing the write for the metrics."""
+        # Imported on first write: prometheus_client is slow to import, and
+        # processes that never write settings do not need it
+        from gst_rec_app.services.metrics import SETTINGS_WRITE_DURATION
+
+        with SETTINGS_WRITE_DURATION.time():
+            self._replace_file()
+
+    def _replace_file(self) -> None:
+        """Write to a temporary file, fsync it and rename it over the file."""
+        directory = os.path.dirname(os.path.abspath(self.settings_file))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".settings-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._settings, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.settings_file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _fsync_directory(directory)
+        self._signature = _signature(os.stat(self.settings_file))
+
+    def _reload_if_changed(self) -> None:
+        """Reload the file if another process replaced it.
+
+        Pending changes of this process are applied on top of the reloaded
+        values, so they are not lost.
+        """
+        try:
+            signature = _signature(os.stat(self.settings_file))
+        except FileNotFoundError:
+            signature = None
+        if signature != self._signature:
+            try:
+                settings = self._load_settings()
+            except ValueError:
+                # A file written by an older, non-atomic version; keep ours
+                return
+            settings.update(self._pending)
+            self._settings = settings
+
+    def _refresh(self) -> None:
+        """Check for changes by other processes at most every check_interval."""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            self._reload_if_changed()
+
+    def flush(self) -> None:
+        """Write pending changes to the file now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._save_settings()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a setting value."""
+        self._refresh()
         return self._settings.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        """Set a setting value and save to file."""
-        self._settings[key] = value
-        self._save_settings()
+        """Set a setting value and schedule saving it to file."""
+        with self._lock:
+            self._settings[key] = value
+            self._pending[key] = value
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self._flush_later)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_later(self) -> None:
+        """Timer callback of :meth:`set`."""
+        with self._lock:
+            self._timer = None
+            self._save_settings()
 
     def get_value(self, key: str, default: Any = None) -> Any:
         """Alias for get method."""
@@ -45,3 +158,32 @@ class Settings:
     def set_value(self, key: str, value: Any) -> None:
         """Alias for set method."""
         self.set(key, value)
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    """Identify a version of the settings file.
+
+    The inode changes on every atomic replace, so it catches writes that land
+    within the filesystem's mtime granularity.
+    """
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a lock file, shared across processes."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename by syncing its directory."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -4,24 +4,75 @@ This module defines the routes for the application, including the main index pag
 API endpoints for settings, storage, sensors, and recordings.
 """
 
+import json
 import os
+import time
 from dataclasses import asdict
 from pathlib import Path
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, Response, g, jsonify, render_template, request
 
-from gst_rec_app.models import settings
-from gst_rec_app.services.filesystem import list_directory
+from gst_rec_app.caching import conditional
+from gst_rec_app.models import ApiResponse, settings
+from gst_rec_app.services.downloads import (
+    get_download_config,
+    resolve_download,
+    send_recording,
+)
+from gst_rec_app.services.events import SubscriberLimitError, bus
+from gst_rec_app.services.filesystem import (
+    DEFAULT_PAGE_SIZE,
+    iter_directory,
+    list_directory,
+    list_directory_page,
+)
+from gst_rec_app.services.ipc import DaemonError
+from gst_rec_app.services.metrics import generate_metrics, observe_request
 from gst_rec_app.services.recording import (
     get_recording_status,
     start_recording,
     stop_recording,
 )
-from gst_rec_app.services.recordings import get_recordings
+from gst_rec_app.services.recordings import (
+    RecordingsQuery,
+    SamplesQuery,
+    SearchQuery,
+    get_recordings,
+    get_samples,
+    search_archive,
+)
 from gst_rec_app.utils import get_sensors_status, get_storage_info
 
 main = Blueprint("main", __name__)
 
+# Values pushed to /api/events subscribers, each computed once per interval
+bus.add_source("status", lambda: asdict(get_recording_status(settings)), 1.0)
+bus.add_source("sensors", get_sensors_status, 5.0)
+bus.add_source("storage", lambda: asdict(get_storage_info()), 10.0)
+
+
+@main.before_request
+def start_timer() -> None:
+    """Note when the request started, for its latency metric."""
+    g.request_started = time.perf_counter()
+
+
+@main.after_request
+def record_request(response: Response) -> Response:
+    """Record the request's latency and status code per route.
+
+    Streamed responses are timed until their first byte can be sent.
+    """
+    started = g.pop("request_started", None)
+    if started is not None:
+        observe_request(
+            request.endpoint or "",
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+        )
+    return response
+
 
 def get_default_path() -> str:
     """Get the default recordings path.
@@ -91,39 +142,148 @@ def sensors():
 
 
 @main.route("/api/recordings")
+@conditional
 def recordings():
-    """Get list of recordings.
+    """Get one page of recordings.
+
+    Accepts ``limit``, ``cursor``, ``sort`` (date, size, duration), ``order``
+    (asc, desc), ``since``, ``until`` and ``sensor`` query parameters.
 
     Returns
     -------
-        Response: JSON response containing list of recording entries.
+        Response: JSON response containing the page of recording entries, the
+        total number of matches and the cursor of the next page.
     """
-    result = get_recordings()
+    try:
+        query = RecordingsQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 400
+    result = get_recordings(settings, query)
     return jsonify(asdict(result))
 
 
+@main.route("/api/search")
+@conditional
+def search():
+    """Search files and directories across the recordings directory.
+
+    Accepts ``name`` (glob), ``path``, ``since``, ``until``, ``min_size``,
+    ``max_size``, ``sensor``, ``type`` (file, dir), ``limit``, ``cursor``,
+    ``sort`` (mtime, size, name) and ``order`` (asc, desc) query parameters.
+
+    Returns
+    -------
+        Response: JSON response containing the page of matching entries and the
+        cursor of the next page.
+    """
+    try:
+        result = search_archive(settings, SearchQuery.from_args(request.args))
+    except ValueError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 400
+    return jsonify(asdict(result))
+
+
+@main.route("/api/recordings/<int:recording_id>/samples")
+def recording_samples(recording_id: int):
+    """Get a time range of a sensor sample recording.
+
+    Accepts ``start`` and ``end`` (ISO 8601 or epoch seconds) and ``decimate``
+    (maximum number of points; longer ranges are min/max downsampled).
+
+    Returns
+    -------
+        Response: JSON response containing the sample columns, or an error if
+        the recording does not exist or holds no samples.
+    """
+    try:
+        result = get_samples(
+            settings, recording_id, SamplesQuery.from_args(request.args)
+        )
+    except (OSError, ValueError) as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 400
+    if result is None:
+        message = f"Unknown recording: {recording_id}"
+        return jsonify(asdict(ApiResponse(status="error", message=message))), 404
+    # The columns are already plain lists, so skip asdict's deep copy
+    return jsonify(vars(result))
+
+
+@main.route("/api/recordings/<int:recording_id>/download")
+def download_recording(recording_id: int):
+    """Download a recording, or a segment of a segmented recording.
+
+    Accepts ``segment`` (file name within a segmented recording). Supports
+    ``Range``, ``If-Range``, ``If-None-Match`` and ``If-Modified-Since``.
+
+    Returns
+    -------
+        Response: The file (or the requested range of it), or an error if the
+        recording or segment does not exist.
+    """
+    root = settings.get_value("default_path") or get_default_path()
+    try:
+        path = resolve_download(root, recording_id, request.args.get("segment"))
+    except ValueError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 400
+    if path is None:
+        message = f"Unknown recording or segment: {recording_id}"
+        return jsonify(asdict(ApiResponse(status="error", message=message))), 404
+    try:
+        config = get_download_config(settings)
+    except ValueError as e:
+        # A bad setting, not a bad request
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 500
+    return send_recording(path, root, request.environ, config)
+
+
 @main.route("/api/recording/start", methods=["POST"])
 def start_recording_route():
-    """Start a new recording.
+    """Start recording on all sensors, or on the selected sensors or group.
+
+    The optional JSON body may contain ``sensors`` (list of sensor ids) and/or
+    ``group``. Pipelines are brought up in the background; poll the status
+    endpoint until each returned job reaches ``recording`` or ``failed``.
 
     Returns
     -------
-        Response: JSON response indicating recording start status.
+        Response: JSON response containing the accepted job of each sensor.
     """
-    result = start_recording(settings)
-    return jsonify(asdict(result))
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        message = "Request body must be a JSON object"
+        return jsonify(asdict(ApiResponse(status="error", message=message))), 400
+    try:
+        result = start_recording(settings, body.get("sensors"), body.get("group"))
+    except ValueError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 400
+    except DaemonError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 503
+    return jsonify(asdict(result)), 202 if result.status == "success" else 409
 
 
 @main.route("/api/recording/stop", methods=["POST"])
 def stop_recording_route():
-    """Stop the current recording.
+    """Stop recording on all active sensors, or on the selected sensors or group.
+
+    The optional JSON body may contain ``sensors`` (list of sensor ids) and/or
+    ``group``. Pipelines are torn down in the background; poll the status
+    endpoint until each returned job reaches ``idle`` or ``failed``.
 
     Returns
     -------
-        Response: JSON response indicating recording stop status.
+        Response: JSON response containing the accepted job of each sensor.
     """
-    result = stop_recording(settings)
-    return jsonify(asdict(result))
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        message = "Request body must be a JSON object"
+        return jsonify(asdict(ApiResponse(status="error", message=message))), 400
+    try:
+        result = stop_recording(settings, body.get("sensors"), body.get("group"))
+    except ValueError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 400
+    except DaemonError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 503
+    return jsonify(asdict(result)), 202 if result.status == "success" else 409
 
 
 @main.route("/api/recording/status", methods=["GET"])
@@ -132,22 +292,72 @@ def get_recording_status_route():
 
     Returns
     -------
-        Response: JSON response containing current recording state.
+        Response: JSON response containing the aggregate recording state and the
+        state and throughput of each sensor.
     """
-    result = get_recording_status(settings)
-    return jsonify(result)
+    try:
+        result = get_recording_status(settings)
+    except DaemonError as e:
+        return jsonify(asdict(ApiResponse(status="error", message=str(e)))), 503
+    return jsonify(asdict(result))
+
+
+@main.route("/metrics")
+def metrics():
+    """Export metrics in the Prometheus text format.
+
+    Returns
+    -------
+        Response: request latencies per route, recording state, bytes written
+        and dropped frames per sensor, disk usage, directory scan timings and
+        settings writes.
+    """
+    body, content_type = generate_metrics(settings)
+    return Response(body, content_type=content_type)
+
+
+@main.route("/api/events")
+def events():
+    """Stream application state as server-sent events.
+
+    Emits ``status``, ``sensors`` and ``storage`` events with the same payloads
+    as the corresponding endpoints whenever they change (the latest values are
+    sent on connect), and a ``recording`` event when a recording finalizes.
+
+    Returns
+    -------
+        Response: text/event-stream response that stays open, or an error if
+        the worker already serves as many streams as it accepts.
+    """
+    try:
+        stream = bus.stream()
+    except SubscriberLimitError as e:
+        response = jsonify(asdict(ApiResponse(status="error", message=str(e))))
+        return response, 503, {"Retry-After": "30"}
+    return Response(
+        stream,
+        mimetype="text/event-stream",
+        headers={"X-Accel-Buffering": "no"},
+    )
 
 
 @main.route("/api/browse", methods=["GET"])
+@conditional
 def browse_filesystem():
     """Browse the file system.
 
+    Without paging parameters the whole sorted listing is returned as a JSON
+    array. With ``limit`` and/or ``cursor`` a page object with ``entries`` and
+    ``next_cursor`` is returned instead. With ``stream=1`` (or an
+    ``Accept: application/x-ndjson`` header) entries are streamed as NDJSON in
+    filesystem order while the directory is being read.
+
     Returns
     -------
-        Response: JSON response containing directory listing.
+        Response: JSON or NDJSON response containing directory listing.
     """
+    path = request.args.get("path")
     try:
-        path = request.args.get("path")
         print(f"Browsing path: {path}")  # Debug log
 
         if path:
@@ -159,12 +369,39 @@ def browse_filesystem():
             except Exception as e:
                 print(f"Error checking access: {e}")  # Debug log
 
+        if _wants_ndjson():
+            # Opens the directory now, so errors are answered below, not streamed
+            entries = iter_directory(path)
+            return Response(
+                (json.dumps(asdict(entry)) + "\n" for entry in entries),
+                mimetype="application/x-ndjson",
+            )
+
+        if "limit" in request.args or "cursor" in request.args:
+            limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+            page = list_directory_page(path, limit, request.args.get("cursor"))
+            return jsonify(asdict(page))
+
         entries = list_directory(path)
         print(f"Found entries: {len(entries)}")  # Debug log
         return jsonify([asdict(entry) for entry in entries])
+    except ValueError as e:
+        return jsonify(
+            {"error": "Invalid request", "details": str(e), "path": path}
+        ), 400
     except Exception as e:
         error_msg = f"Error in browse_filesystem: {str(e)}"
         print(error_msg)  # Debug log
         return jsonify(
             {"error": "Access denied", "details": error_msg, "path": path}
         ), 403
+
+
+def _wants_ndjson() -> bool:
+    """Check whether the client asked for a streamed NDJSON listing."""
+    if request.args.get("stream") in ("1", "true"):
+        return True
+    best = request.accept_mimetypes.best_match(
+        ["application/json", "application/x-ndjson"]
+    )
+    return best == "application/x-ndjson"
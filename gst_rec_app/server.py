@@ -0,0 +1,62 @@
+"""Gunicorn application module.
+
+Kept apart from :mod:`gst_rec_app.cli` so that only the production server
+command imports Gunicorn.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import gunicorn.app.base
+from flask import Flask
+
+
+class GunicornApplication(gunicorn.app.base.Application):
+    """Custom Gunicorn application for production deployment.
+
+    This class extends Gunicorn's BaseApplication to provide a customized WSGI
+    server implementation with configuration loading from a file.
+
+    Parameters
+    ----------
+    app: The WSGI application to serve; ``gst_rec_app.wsgi`` if not given
+    options: Optional dictionary of Gunicorn configuration options
+    """
+
+    def __init__(
+        self, app: Optional[Flask] = None, options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.options = options or {}
+        self.application = app
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Load Gunicorn configuration from file and CLI options.
+
+        Loads the default configuration from gunicorn_conf.py and then
+        overrides settings with any provided CLI options.
+        """
+        # Load the default config file
+        config_path = Path(__file__).parent / "gunicorn_conf.py"
+        self.load_config_from_file(str(config_path))
+
+        # Override with CLI options
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self) -> Flask:
+        """Return the WSGI application to be run.
+
+        Without an application given, ``gst_rec_app.wsgi`` is imported now,
+        after the configuration file has set up the environment.
+
+        Returns
+        -------
+        The Flask application instance
+        """
+        if self.application is None:
+            from gst_rec_app.wsgi import app
+
+            self.application = app
+        return self.application
@@ -0,0 +1,78 @@
+"""Control plane module.
+
+Request handlers may run concurrently (threaded or gevent workers), but
+commands that change recording state or touch devices must not interleave.
+This module runs such commands one at a time on a single dedicated thread,
+fed by a command queue; request handlers only enqueue commands and wait for
+their results. Read-only endpoints never go through it.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Tuple
+
+
+class ControlPlane:
+    """Single owner thread that executes queued commands in order.
+
+    Parameters
+    ----------
+    name : str
+        Name of the owner thread
+    """
+
+    def __init__(self, name: str = "control-plane") -> None:
+        self.name = name
+        self._commands: "queue.Queue[Tuple[Future, Callable, tuple, dict]]" = (
+            queue.Queue()
+        )
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue a command and return a future of its result."""
+        future: Future = Future()
+        self._commands.put((future, func, args, kwargs))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+        return future
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a command on the owner thread and wait for its result.
+
+        Commands issued from the owner thread itself run inline, so commands
+        may call each other without deadlocking.
+
+        Raises
+        ------
+        Exception
+            Whatever the command raised
+        """
+        if threading.current_thread() is self._thread:
+            return func(*args, **kwargs)
+        return self.submit(func, *args, **kwargs).result(timeout)
+
+    def _run(self) -> None:
+        """Execute queued commands forever."""
+        while True:
+            future, func, args, kwargs = self._commands.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+control = ControlPlane()
@@ -0,0 +1,171 @@
+"""Recorder daemon module.
+
+The recorder daemon owns the recording pipelines and their state, so web
+workers can be scaled, recycled and restarted without interrupting a
+recording. It serves the JSON lines protocol described in
+:mod:`gst_rec_app.services.ipc` on a Unix domain socket.
+"""
+
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import threading
+from dataclasses import asdict
+from typing import Any, Callable, Dict
+
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.control import control
+from gst_rec_app.services.events import bus
+from gst_rec_app.services.ipc import encode_message
+from gst_rec_app.services.recording import manager, start_owner_services
+from gst_rec_app.services.sensors import get_sensor_configs
+
+logger = logging.getLogger(__name__)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves the commands of one client connection."""
+
+    server: "RecorderDaemon"
+
+    def handle(self) -> None:
+        """Reply to each request line until the client disconnects."""
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                command = request["command"]
+                args = request.get("args") or {}
+            except (ValueError, KeyError, TypeError):
+                self._reply({"error": "Malformed request", "type": "ValueError"})
+                continue
+            if command == "events":
+                self._stream_events()
+                return
+            self._reply(self.server.dispatch(command, args))
+
+    def _reply(self, message: Dict[str, Any]) -> None:
+        """Write one reply line."""
+        self.wfile.write(encode_message(message))
+        self.wfile.flush()
+
+    def _stream_events(self) -> None:
+        """Forward event frames until the client disconnects."""
+        try:
+            for frame in bus.stream():
+                self.wfile.write(frame.encode())
+                self.wfile.flush()
+        except OSError:
+            pass
+
+
+class RecorderDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server running recording commands for the web workers.
+
+    Parameters
+    ----------
+    path : str
+        Socket path; a stale socket file is replaced
+    settings : Settings
+        Application settings providing ``default_path``, sensors and pipelines
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, settings: Settings) -> None:
+        self.path = path
+        self.settings = settings
+        self._commands: Dict[str, Callable[..., Any]] = {
+            "start": self._start,
+            "stop": self._stop,
+            "status": self._status,
+        }
+        if os.path.exists(path):
+            _remove_stale_socket(path)
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o660)
+
+    def dispatch(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command and build its reply."""
+        handler = self._commands.get(command)
+        if handler is None:
+            return {"error": f"Unknown command: {command}", "type": "ValueError"}
+        try:
+            return {"result": handler(**args)}
+        except (TypeError, ValueError) as e:
+            return {"error": str(e), "type": "ValueError"}
+        except Exception as e:
+            logger.exception("Command %s failed", command)
+            return {"error": str(e), "type": type(e).__name__}
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _start(self, sensors: Any = None, group: Any = None) -> Dict[str, Any]:
+        """Handle the ``start`` command."""
+        return asdict(control.call(manager.start, self.settings, sensors, group))
+
+    def _stop(self, sensors: Any = None, group: Any = None) -> Dict[str, Any]:
+        """Handle the ``stop`` command."""
+        return asdict(control.call(manager.stop, self.settings, sensors, group))
+
+    def _status(self) -> Dict[str, Any]:
+        """Handle the ``status`` command."""
+        sensor_ids = [sensor.id for sensor in get_sensor_configs(self.settings)]
+        return asdict(manager.status(sensor_ids))
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left behind by a daemon that is not running.
+
+    Raises
+    ------
+    RuntimeError
+        If another daemon is listening on the socket
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise RuntimeError(f"Another recorder daemon is listening on {path}")
+
+
+def serve(path: str, settings: Settings) -> None:
+    """Run the recorder daemon until SIGINT or SIGTERM.
+
+    Active recordings are stopped cleanly before exiting. Queued
+    post-processing jobs and pre-roll captures run in the daemon.
+
+    Parameters
+    ----------
+    path : str
+        Socket path
+    settings : Settings
+        Application settings
+    """
+    daemon = RecorderDaemon(path, settings)
+
+    def shutdown(signum: int, frame: Any) -> None:
+        # shutdown() waits for serve_forever, so it must run on another thread
+        threading.Thread(target=daemon.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    # The daemon owns the recordings: it resumes their interrupted jobs and
+    # runs the pre-roll captures
+    start_owner_services(settings)
+    logger.info("Recorder daemon listening on %s", path)
+    try:
+        daemon.serve_forever()
+    finally:
+        daemon.server_close()
+        control.call(manager.stop, settings)
+        manager.wait_idle()
+        manager.close_preroll()
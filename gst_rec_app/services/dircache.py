@@ -0,0 +1,327 @@
+"""Directory listing cache module.
+
+This module keeps recently listed directories in memory so repeated browsing
+does not re-read them. Cached listings are invalidated through inotify watches
+where available; otherwise, or when the watch limit is reached, the directory
+mtime is checked on every lookup instead.
+
+Only changes to a directory's entries (create, delete, rename, attribute change,
+file closed after writing) invalidate its listing. Sizes of files that are
+still being written are refreshed when the writer closes them.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from gst_rec_app.services.metrics import (
+    DIRECTORY_CACHE_LOOKUPS,
+    DIRECTORY_SCAN_DURATION,
+)
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Rough per-entry overhead of a cached FileSystemEntry, on top of its strings
+_ENTRY_OVERHEAD = 250
+# Listings of directories modified this recently are not trusted by mtime
+_RACY_SECONDS = 2.0
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal ctypes binding to the Linux inotify API.
+
+    Raises
+    ------
+    OSError
+        If inotify is not available on this platform
+    """
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: str, mask: int = _WATCH_MASK) -> int:
+        """Watch a directory and return the watch descriptor.
+
+        Raises
+        ------
+        OSError
+            If the watch could not be added, e.g. the watch limit is reached
+        """
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Remove a watch, ignoring watches that are already gone."""
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int]]:
+        """Block until events are available and return ``(wd, mask)`` pairs."""
+        data = os.read(self.fd, 64 * 1024)
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            events.append((wd, mask))
+            offset += _EVENT_HEADER.size + length
+        return events
+
+
+@dataclass
+class CachedListing:
+    """A cached directory listing."""
+
+    entries: List
+    size: int
+    mtime_ns: int
+    wd: Optional[int] = None
+    keys: Optional[List[Tuple[bool, str]]] = field(default=None, repr=False)
+
+
+class DirectoryCache:
+    """LRU cache of directory listings bounded by an estimated memory size.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Approximate memory cap for all cached listings
+    use_inotify : bool
+        Invalidate through inotify watches when available
+    """
+
+    def __init__(
+        self, max_bytes: int = DEFAULT_MAX_BYTES, use_inotify: bool = True
+    ) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[str, CachedListing]" = OrderedDict()
+        self._size = 0
+        self._generations: Dict[str, int] = {}
+        self._watches: Dict[int, str] = {}
+        self._warming: Set[str] = set()
+        self._warmer = ThreadPoolExecutor(max_workers=1)
+        # Set up on first use, in the process (e.g. forked worker) listing
+        self.use_inotify = use_inotify
+        self._inotify: Optional[Inotify] = None
+
+    def get(self, path: str, loader: Callable[[str], List]) -> List:
+        """Get the listing of a directory, loading and caching it on a miss.
+
+        Parameters
+        ----------
+        path : str
+            Directory path
+        loader : Callable[[str], List]
+            Lists the directory on a miss
+
+        Returns
+        -------
+        List
+            The cached or freshly loaded listing; callers must not modify it
+        """
+        listing = self.lookup(path)
+        if listing is not None:
+            return listing.entries
+        return self._load(path, loader).entries
+
+    def lookup(self, path: str) -> Optional[CachedListing]:
+        """Get a cached listing if it is still valid, without loading it."""
+        listing = self._lookup(path)
+        DIRECTORY_CACHE_LOOKUPS.labels("miss" if listing is None else "hit").inc()
+        return listing
+
+    def _lookup(self, path: str) -> Optional[CachedListing]:
+        """Find a valid cached listing; see :meth:`lookup`."""
+        path = os.path.abspath(path)
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is None:
+                return None
+            self._listings.move_to_end(path)
+            if listing.wd is not None:
+                return listing
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != listing.mtime_ns:
+            self.invalidate(path)
+            return None
+        return listing
+
+    def warm(self, path: str, loader: Callable[[str], List]) -> None:
+        """Load a directory into the cache in the background."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self._listings or path in self._warming:
+                return
+            self._warming.add(path)
+        self._warmer.submit(self._warm, path, loader)
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached listing of a directory."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._generations[path] = self._generations.get(path, 0) + 1
+            listing = self._listings.pop(path, None)
+            if listing is not None:
+                self._drop(path, listing)
+
+    def _load(self, path: str, loader: Callable[[str], List]) -> CachedListing:
+        """List a directory and cache it unless it changed while listing."""
+        path = os.path.abspath(path)
+        with self._lock:
+            generation = self._generations.get(path, 0)
+        # Watch before listing, so no change can slip in between
+        wd = self._add_watch(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with DIRECTORY_SCAN_DURATION.labels("full").time():
+                entries = loader(path)
+        except Exception:
+            self._release_watch(path, wd)
+            raise
+
+        size = sum(
+            _ENTRY_OVERHEAD + len(entry.name) + len(entry.path) for entry in entries
+        )
+        listing = CachedListing(entries=entries, size=size, mtime_ns=mtime_ns, wd=wd)
+        racy = wd is None and time.time_ns() - mtime_ns < _RACY_SECONDS * 1e9
+        with self._lock:
+            cacheable = (
+                size <= self.max_bytes
+                and not racy
+                and self._generations.get(path, 0) == generation
+            )
+            if cacheable:
+                previous = self._listings.pop(path, None)
+                if previous is not None:
+                    self._drop(path, previous, keep_watch=previous.wd == wd)
+                self._listings[path] = listing
+                self._size += size
+                self._evict()
+        if not cacheable:
+            self._release_watch(path, wd)
+        return listing
+
+    def _warm(self, path: str, loader: Callable[[str], List]) -> None:
+        """Background task of :meth:`warm`."""
+        try:
+            self._load(path, loader)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._warming.discard(path)
+
+    def _add_watch(self, path: str) -> Optional[int]:
+        """Watch a directory, or return None to fall back to mtime checks."""
+        if self.use_inotify and self._inotify is None:
+            self._start_inotify()
+        if self._inotify is None:
+            return None
+        try:
+            wd = self._inotify.add_watch(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._watches[wd] = path
+        return wd
+
+    def _start_inotify(self) -> None:
+        """Open the inotify instance and start reading its events, once."""
+        with self._lock:
+            if not self.use_inotify or self._inotify is not None:
+                return
+            self.use_inotify = False
+            try:
+                self._inotify = Inotify()
+            except OSError:
+                return
+        threading.Thread(
+            target=self._watch_events, name="dircache-inotify", daemon=True
+        ).start()
+
+    def _release_watch(self, path: str, wd: Optional[int]) -> None:
+        """Remove a watch that no cached listing uses."""
+        if wd is None:
+            return
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is not None and listing.wd == wd:
+                return
+            self._watches.pop(wd, None)
+        self._inotify.rm_watch(wd)
+
+    def _drop(
+        self, path: str, listing: CachedListing, keep_watch: bool = False
+    ) -> None:
+        """Account for a removed listing. Must be called with the lock held."""
+        self._size -= listing.size
+        if listing.wd is not None and not keep_watch:
+            # inotify returns the same wd for the same inode, so only remove
+            # the watch if nothing else is using it
+            if self._watches.pop(listing.wd, None) is not None:
+                self._inotify.rm_watch(listing.wd)
+
+    def _evict(self) -> None:
+        """Evict least recently used listings. Must be called with the lock held."""
+        while self._size > self.max_bytes and self._listings:
+            path, listing = self._listings.popitem(last=False)
+            self._drop(path, listing)
+
+    def _watch_events(self) -> None:
+        """Invalidate listings as inotify reports changes."""
+        while True:
+            try:
+                events = self._inotify.read_events()
+            except OSError:
+                return
+            for wd, mask in events:
+                with self._lock:
+                    path = self._watches.get(wd)
+                    if mask & _IN_IGNORED:
+                        self._watches.pop(wd, None)
+                if path is not None:
+                    self.invalidate(path)
@@ -0,0 +1,201 @@
+"""Recording downloads module.
+
+This module serves recording files and segments over HTTP with ``Range``,
+``ETag`` and conditional request support. By default the file is handed to the
+WSGI server's file wrapper, which Gunicorn sends with ``sendfile(2)``. Ranges
+are sent the same way: the file is positioned at the start of the range and
+Gunicorn sends ``Content-Length`` bytes from there (other servers read the
+range through Python). With an offload mode configured, only a header is
+returned and the front-end server (``X-Sendfile`` for Apache/lighttpd,
+``X-Accel-Redirect`` for nginx) reads the file and handles ranges itself, so
+file data never passes through Python.
+"""
+
+import os
+from dataclasses import dataclass, fields
+from typing import Any, BinaryIO, Dict, Optional
+from urllib.parse import quote
+
+from werkzeug.utils import send_file
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.index import get_index
+
+OFFLOAD_MODES = ("", "x-sendfile", "x-accel-redirect")
+
+
+@dataclass
+class DownloadConfig:
+    """Describes how downloads are sent."""
+
+    offload: str = ""  # one of OFFLOAD_MODES; "" sends the file from the worker
+    accel_prefix: str = "/recordings-internal/"  # nginx internal location of the root
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "DownloadConfig":
+        """Build a config from a settings dict, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        config = cls(**{k: v for k, v in values.items() if k in known})
+        if config.offload not in OFFLOAD_MODES:
+            raise ValueError(f"Unknown download offload mode: {config.offload}")
+        return config
+
+
+class FileRange:
+    """Readable part of an open file, from ``start`` for ``length`` bytes.
+
+    The file descriptor is positioned at ``start``, so a server that sends its
+    file wrapper with ``sendfile(2)`` from the current offset sends the range
+    without reading it, and other servers read just the range.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        File opened for reading, closed with the range
+    start : int
+        Offset of the first byte
+    length : int
+        Number of bytes
+    """
+
+    def __init__(self, file: BinaryIO, start: int, length: int) -> None:
+        file.seek(start)
+        self._file = file
+        self._remaining = length
+
+    def fileno(self) -> int:
+        """Get the descriptor of the file."""
+        return self._file.fileno()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of the range (the rest if negative)."""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+def resolve_download(
+    root: str, recording_id: int, segment: Optional[str] = None
+) -> Optional[str]:
+    """Get the file to download for a recording or one of its segments.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+    recording_id : int
+        Id of the recording in the recordings index
+    segment : str, optional
+        File name of a segment; required for segmented recordings
+
+    Returns
+    -------
+    str, optional
+        Path of the file, or None if the recording or segment does not exist
+
+    Raises
+    ------
+    ValueError
+        If ``segment`` is missing, not a plain file name or not applicable
+    """
+    recording = get_index(root).get(recording_id)
+    if recording is None:
+        return None
+    if not os.path.isdir(recording.path):
+        if segment:
+            raise ValueError("Recording is not segmented")
+        path = recording.path
+    elif not segment:
+        raise ValueError("Recording is segmented; pass segment=<file name>")
+    elif os.path.basename(segment) != segment or segment.startswith("."):
+        raise ValueError(f"Invalid segment: {segment}")
+    else:
+        path = os.path.join(recording.path, segment)
+    return path if os.path.isfile(path) else None
+
+
+def get_download_config(settings: Settings) -> DownloadConfig:
+    """Get the ``downloads`` settings.
+
+    Raises
+    ------
+    ValueError
+        If the offload mode is unknown
+    """
+    return DownloadConfig.from_dict(settings.get("downloads", {}))
+
+
+def send_recording(
+    path: str, root: str, environ: Dict[str, Any], config: DownloadConfig
+) -> Response:
+    """Build the download response of a recording file.
+
+    Parameters
+    ----------
+    path : str
+        File to send, inside ``root``
+    root : str
+        Recordings directory, mapped to ``accel_prefix`` for nginx
+    environ : Dict[str, Any]
+        WSGI environment of the request, for its range and conditional headers
+    config : DownloadConfig
+        How to send the file
+
+    Returns
+    -------
+    Response
+        A full (200), partial (206) or not modified (304) response, with an
+        ETag derived from the file's mtime and size
+    """
+    if not config.offload:
+        response = send_file(
+            path, environ, as_attachment=True, conditional=True, etag=True
+        )
+        if response.status_code == 206:
+            _send_range(response, path, environ)
+    else:
+        # The front-end server applies Range itself, so only validators are
+        # evaluated here
+        response = send_file(
+            path,
+            environ,
+            as_attachment=True,
+            use_x_sendfile=True,
+            conditional=False,
+            etag=True,
+        )
+        response = response.make_conditional(environ)
+        sendfile = response.headers.pop("X-Sendfile", None)
+        if sendfile and response.status_code == 200:
+            if config.offload == "x-sendfile":
+                response.headers["X-Sendfile"] = sendfile
+            else:
+                relative = os.path.relpath(path, root).replace(os.sep, "/")
+                response.headers["X-Accel-Redirect"] = (
+                    config.accel_prefix.rstrip("/") + "/" + quote(relative)
+                )
+    # Recordings in progress keep growing, so clients revalidate every time
+    response.cache_control.private = True
+    return response
+
+
+def _send_range(response: Response, path: str, environ: Dict[str, Any]) -> None:
+    """Replace the body of a partial response with a file wrapper of its range.
+
+    Werkzeug copies ranges through Python; the file wrapper lets the server
+    send them with ``sendfile(2)`` instead.
+    """
+    content_range = response.content_range
+    body = FileRange(
+        open(path, "rb"), content_range.start, content_range.stop - content_range.start
+    )
+    response.response.close()
+    response.response = wrap_file(environ, body)
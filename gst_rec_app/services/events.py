@@ -0,0 +1,244 @@
+"""Server-sent events module.
+
+This module pushes application state to connected browsers instead of having
+each of them poll the API. Values are produced by *sources*: functions that a
+single publisher thread calls periodically (or immediately when notified), and
+whose results are published only when they change. Each published event is
+encoded once and fanned out to every subscriber.
+
+Clients receive the latest value of every source when they subscribe, so a
+reconnecting client is up to date without extra requests.
+
+Each open stream holds a server thread under the ``gthread`` worker, so the bus
+can be limited to fewer subscribers than there are threads; further clients are
+turned away and fall back to polling.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_INTERVAL = 15.0
+RETRY_MS = 3000
+
+
+@dataclass
+class EventSource:
+    """A periodically sampled value published as an event.
+
+    Attributes
+    ----------
+    name : str
+        Event name
+    produce : Callable[[], Any]
+        Computes the JSON-serializable value
+    interval : float
+        Seconds between two samples
+    """
+
+    name: str
+    produce: Callable[[], Any]
+    interval: float
+    due: float = 0.0
+
+
+class SubscriberLimitError(Exception):
+    """Raised when the bus already has as many subscribers as it accepts."""
+
+
+def format_event(name: str, data: Any) -> str:
+    """Encode an event in the text/event-stream format."""
+    return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Subscription:
+    """Queue of encoded events for one client.
+
+    A client that falls ``max_pending`` events behind is disconnected; the
+    browser reconnects and starts again from the latest values.
+    """
+
+    def __init__(self, max_pending: int = 64) -> None:
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(max_pending)
+        self.closed = False
+
+    def put(self, frame: str) -> None:
+        """Queue an encoded event, closing the subscription if it is full."""
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.close()
+
+    def close(self) -> None:
+        """Close the subscription, ending its stream."""
+        self.closed = True
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def frames(self, keepalive: float = KEEPALIVE_INTERVAL) -> Iterator[str]:
+        """Yield encoded events, with a comment every ``keepalive`` seconds."""
+        yield f"retry: {RETRY_MS}\n\n"
+        while not self.closed:
+            try:
+                frame = self._queue.get(timeout=keepalive)
+            except queue.Empty:
+                # Also detects disconnected clients, as the write then fails
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                return
+            yield frame
+
+
+class EventBus:
+    """Publishes source values and one-off events to all subscribers.
+
+    Parameters
+    ----------
+    tick : float
+        Resolution of the publisher thread's schedule in seconds
+    max_subscribers : int, optional
+        Number of subscribers accepted at a time (unlimited if None)
+    """
+
+    def __init__(
+        self, tick: float = 0.5, max_subscribers: Optional[int] = None
+    ) -> None:
+        self.tick = tick
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._sources: Dict[str, EventSource] = {}
+        self._latest: Dict[str, str] = {}
+        self._values: Dict[str, Any] = {}
+        self._subscribers: List[Subscription] = []
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_source(
+        self, name: str, produce: Callable[[], Any], interval: float
+    ) -> None:
+        """Register a source published as event ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Event name
+        produce : Callable[[], Any]
+            Computes the JSON-serializable value
+        interval : float
+            Seconds between two samples
+        """
+        with self._lock:
+            self._sources[name] = EventSource(name, produce, interval)
+
+    def notify(self, name: str) -> None:
+        """Sample a source as soon as possible, e.g. after a state change."""
+        with self._lock:
+            source = self._sources.get(name)
+            if source is None:
+                return
+            source.due = 0.0
+        self._wakeup.set()
+
+    def publish(self, name: str, data: Any) -> None:
+        """Send a one-off event to all subscribers."""
+        self.broadcast(format_event(name, data))
+
+    def subscribe(self) -> Subscription:
+        """Subscribe to events, starting with the latest value of each source.
+
+        Raises
+        ------
+        SubscriberLimitError
+            If ``max_subscribers`` clients are already subscribed
+        """
+        subscription = Subscription()
+        with self._lock:
+            if (
+                self.max_subscribers is not None
+                and len(self._subscribers) >= self.max_subscribers
+            ):
+                raise SubscriberLimitError(
+                    f"Too many event streams ({self.max_subscribers}), poll instead"
+                )
+            for frame in self._latest.values():
+                subscription.put(frame)
+            self._subscribers.append(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="event-publisher", daemon=True
+                )
+                self._thread.start()
+        # Sources that have no value yet are sampled right away
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription, e.g. when its client disconnects."""
+        subscription.close()
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def stream(self) -> Iterator[str]:
+        """Subscribe and yield encoded events until the client disconnects.
+
+        Subscribes when called rather than when the first event is read, so a
+        SubscriberLimitError can still be answered with an error status.
+        """
+        return self._stream(self.subscribe())
+
+    def _stream(self, subscription: Subscription) -> Iterator[str]:
+        """Yield a subscription's events, unsubscribing when the stream ends."""
+        try:
+            yield from subscription.frames()
+        finally:
+            self.unsubscribe(subscription)
+
+    def broadcast(self, frame: str) -> None:
+        """Queue an encoded event for every subscriber."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(frame)
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if not s.closed]
+
+    def _run(self) -> None:
+        """Sample due sources while anyone is subscribed."""
+        while True:
+            self._wakeup.wait(self.tick)
+            self._wakeup.clear()
+            with self._lock:
+                if not self._subscribers:
+                    continue
+                now = time.monotonic()
+                due = [s for s in self._sources.values() if s.due <= now]
+                for source in due:
+                    source.due = now + source.interval
+            for source in due:
+                try:
+                    value = source.produce()
+                except Exception as e:
+                    logger.warning("Event source %s failed: %s", source.name, e)
+                    continue
+                if self._values.get(source.name, self) == value:
+                    continue
+                frame = format_event(source.name, value)
+                self._values[source.name] = value
+                with self._lock:
+                    self._latest[source.name] = frame
+                self.broadcast(frame)
+
+
+bus = EventBus()
@@ -1,12 +1,25 @@
 """File system service module.
 
 This module provides functions for browsing and managing the file system.
+Listings are served from an in-memory :class:`DirectoryCache` when possible.
 """
 
+import heapq
 import os
+from bisect import bisect_right
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
+
+from gst_rec_app.services.dircache import CachedListing, DirectoryCache
+from gst_rec_app.services.metrics import DIRECTORY_SCAN_DURATION
+from gst_rec_app.utils import decode_cursor, encode_cursor
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 5000
+
+directory_cache = DirectoryCache()
 
 
 @dataclass
@@ -16,6 +29,16 @@ class FileSystemEntry:
     name: str
     path: str
     is_dir: bool
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+
+
+@dataclass
+class DirectoryPage:
+    """Represents one page of a directory listing."""
+
+    entries: List[FileSystemEntry]
+    next_cursor: Optional[str] = None
 
 
 def is_safe_path(path: str) -> Tuple[bool, str]:
@@ -65,7 +88,7 @@ def list_directory(path: str = None) -> List[FileSystemEntry]:
         return []
 
     try:
-        return _list_directory_contents(path)
+        return directory_cache.get(path, _list_directory_contents)
     except PermissionError:
         # Return empty list when permission is denied
         return []
@@ -77,6 +100,168 @@ def list_directory(path: str = None) -> List[FileSystemEntry]:
         return []
 
 
+def list_directory_page(
+    path: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+) -> DirectoryPage:
+    """List one page of a directory, in the same order as :func:`list_directory`.
+
+    Pages are sliced from the cached listing when the directory is cached.
+    Otherwise the directory is scanned once keeping only the ``limit`` smallest
+    entries after the cursor, and only those entries are stat'ed, while the full
+    listing is loaded into the cache in the background for the next pages.
+
+    Parameters
+    ----------
+    path : str, optional
+        Directory path to list, by default None (uses home directory)
+    limit : int
+        Maximum number of entries, excluding the parent entry
+    cursor : str, optional
+        ``next_cursor`` of the previous page
+
+    Returns
+    -------
+    DirectoryPage
+        The entries of the page and the cursor of the next page
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed
+    """
+    path = path or str(Path.home())
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    after = parse_page_cursor(cursor) if cursor else None
+    if not _is_path_safe(path):
+        return DirectoryPage(entries=[])
+
+    listing = directory_cache.lookup(path)
+    if listing is not None:
+        return _page_from_cache(listing, limit, after)
+    directory_cache.warm(path, _list_directory_contents)
+
+    try:
+        with DIRECTORY_SCAN_DURATION.labels("page").time(), os.scandir(path) as it:
+            keyed = (
+                (_sort_key(dir_entry), dir_entry)
+                for dir_entry in it
+                if not dir_entry.name.startswith(".")
+            )
+            selected = heapq.nsmallest(
+                limit + 1,
+                (item for item in keyed if after is None or item[0] > after),
+                key=itemgetter(0),
+            )
+    except OSError:
+        return DirectoryPage(entries=[])
+
+    entries = []
+    if after is None:
+        parent_entry = _get_parent_entry(path)
+        if parent_entry:
+            entries.append(parent_entry)
+    for _, dir_entry in selected[:limit]:
+        entry = _create_entry(dir_entry)
+        if entry:
+            entries.append(entry)
+
+    next_cursor = None
+    if len(selected) > limit:
+        next_cursor = encode_cursor(selected[limit - 1][0])
+    return DirectoryPage(entries=entries, next_cursor=next_cursor)
+
+
+def parse_page_cursor(cursor: str) -> Tuple[bool, str]:
+    """Decode a listing cursor into its ``(is file, name)`` position.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed
+    """
+    key = decode_cursor(cursor)
+    if len(key) != 2 or not isinstance(key[0], bool) or not isinstance(key[1], str):
+        raise ValueError("Invalid cursor")
+    return key[0], key[1]
+
+
+def iter_directory(path: str = None) -> Iterator[FileSystemEntry]:
+    """Lazily yield the contents of a directory in filesystem order.
+
+    Unlike :func:`list_directory` the entries are not sorted, so the first
+    entry is available as soon as the directory is opened, regardless of its
+    size. The parent entry, if any, is yielded first. The path is checked and
+    the directory opened by this call, so errors surface before a response
+    starts streaming.
+
+    Parameters
+    ----------
+    path : str, optional
+        Directory path to list, by default None (uses home directory)
+
+    Returns
+    -------
+    Iterator[FileSystemEntry]
+        Entries of the directory
+
+    Raises
+    ------
+    PermissionError
+        If the path is outside the home directory or not readable
+    OSError
+        If the directory cannot be opened
+    """
+    path = path or str(Path.home())
+    is_safe, message = is_safe_path(path)
+    if not is_safe:
+        raise PermissionError(message)
+    return _iter_entries(path, os.scandir(path))
+
+
+def _iter_entries(path: str, it: Iterator[os.DirEntry]) -> Iterator[FileSystemEntry]:
+    """Yield the parent entry and the entries of an open directory."""
+    with it:
+        parent_entry = _get_parent_entry(path)
+        if parent_entry:
+            yield parent_entry
+        try:
+            for dir_entry in it:
+                entry = _create_entry(dir_entry)
+                if entry:
+                    yield entry
+        except OSError:
+            # Too late to report an error once streaming started
+            return
+
+
+def _page_from_cache(
+    listing: CachedListing, limit: int, after: Optional[Tuple]
+) -> DirectoryPage:
+    """Slice a page out of a cached, sorted listing."""
+    entries = listing.entries
+    offset = 1 if entries and entries[0].name == ".." else 0
+    if listing.keys is None:
+        listing.keys = [(not entry.is_dir, entry.name) for entry in entries[offset:]]
+    keys = listing.keys
+
+    start = bisect_right(keys, after) if after is not None else 0
+    page = entries[offset + start : offset + start + limit]
+    if offset and after is None:
+        page = [entries[0]] + page
+    next_cursor = None
+    if start + limit < len(keys):
+        next_cursor = encode_cursor(keys[start + limit - 1])
+    return DirectoryPage(entries=page, next_cursor=next_cursor)
+
+
+def _sort_key(dir_entry: os.DirEntry) -> Tuple[bool, str]:
+    """Get the listing sort key of a directory entry: directories first, then name."""
+    try:
+        return not dir_entry.is_dir(), dir_entry.name
+    except OSError:
+        return True, dir_entry.name
+
+
 def _is_under_home(path: str, home: str) -> bool:
     """Check if path is under home directory."""
     return path.startswith(home)
@@ -111,6 +296,10 @@ def _list_directory_contents(path: str) -> List[FileSystemEntry]:
     """List contents of a directory including parent if applicable.
 
     Directories are listed first, followed by files, both sorted alphabetically.
+    The directory is read with a single ``os.scandir`` pass: entry types come
+    from the cached ``DirEntry`` information and size and mtime from one
+    ``stat`` per entry. Safety is checked once for ``path`` by the caller, so
+    children are not checked individually.
 
     Raises
     ------
@@ -128,49 +317,45 @@ def _list_directory_contents(path: str) -> List[FileSystemEntry]:
     dir_entries = []
     file_entries = []
 
-    for entry_name in sorted(os.listdir(path)):
-        entry = _create_entry(path, entry_name)
-        if entry:
-            if entry.is_dir:
-                dir_entries.append(entry)
-            else:
-                file_entries.append(entry)
+    with os.scandir(path) as it:
+        for dir_entry in it:
+            entry = _create_entry(dir_entry)
+            if entry:
+                if entry.is_dir:
+                    dir_entries.append(entry)
+                else:
+                    file_entries.append(entry)
 
     # Combine entries: parent + directories + files
-    entries.extend(dir_entries)
-    entries.extend(file_entries)
+    entries.extend(sorted(dir_entries, key=_entry_name))
+    entries.extend(sorted(file_entries, key=_entry_name))
 
     return entries
 
 
-def _create_entry(directory: str, entry_name: str) -> Optional[FileSystemEntry]:
+def _entry_name(entry: FileSystemEntry) -> str:
+    """Get the sort key of an entry."""
+    return entry.name
+
+
+def _create_entry(dir_entry: os.DirEntry) -> Optional[FileSystemEntry]:
     """Create a FileSystemEntry for the given directory entry.
 
-    Returns None if the entry should not be included.
+    Returns None if the entry should not be included. Hidden entries (starting
+    with '.') and entries that vanished or cannot be stat'ed are skipped.
     """
+    if dir_entry.name.startswith("."):
+        return None
     try:
-        full_path = os.path.join(directory, entry_name)
-        if _should_include_entry(full_path):
-            return FileSystemEntry(
-                name=entry_name, path=full_path, is_dir=os.path.isdir(full_path)
-            )
+        is_dir = dir_entry.is_dir()
+        stat = dir_entry.stat()
     except OSError:
-        # Skip entries that can't be accessed
+        # Skip entries that can't be accessed, e.g. broken symlinks
         return None
-    return None
-
-
-def _should_include_entry(path: str) -> bool:
-    """Check if entry should be included in listing.
-
-    Excludes hidden files (starting with '.') except for the parent directory entry.
-    """
-    # Always include parent directory
-    if os.path.basename(path) == "..":
-        return True
-
-    # Skip hidden files
-    if os.path.basename(path).startswith("."):
-        return False
-
-    return os.path.exists(path) and _is_path_safe(path)
+    return FileSystemEntry(
+        name=dir_entry.name,
+        path=dir_entry.path,
+        is_dir=is_dir,
+        size=None if is_dir else stat.st_size,
+        mtime=stat.st_mtime,
+    )
@@ -0,0 +1,213 @@
+"""IMU sample storage module.
+
+High-rate sensor samples are stored as fixed-width binary records behind a
+small header, so a file is a plain array that can be memory-mapped and
+searched by timestamp without parsing. Samples are produced, written and read
+in NumPy batches; no Python object is created per sample.
+
+File layout: a 64-byte header (magic, record size, sample rate) followed by
+records of :data:`IMU_DTYPE`, ordered by timestamp. Reads memory-map the
+file, select a time range by binary search and downsample it with vectorized
+min/max reductions, so their cost is bounded by the range, not the file.
+"""
+
+import os
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, Optional
+
+import numpy as np
+
+IMU_DTYPE = np.dtype(
+    [
+        ("t_ns", "<i8"),  # epoch time in nanoseconds
+        ("ax", "<f4"),  # acceleration in m/s^2
+        ("ay", "<f4"),
+        ("az", "<f4"),
+        ("gx", "<f4"),  # angular rate in rad/s
+        ("gy", "<f4"),
+        ("gz", "<f4"),
+    ]
+)
+VALUE_FIELDS = IMU_DTYPE.names[1:]
+IMU_EXTENSION = "imu"
+
+MAGIC = b"GSTIMU1\0"
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIf")
+
+GRAVITY = 9.81
+
+
+class ImuSource(ABC):
+    """Interface for a source of IMU samples."""
+
+    rate: float
+
+    @abstractmethod
+    def read(self) -> np.ndarray:
+        """Get the samples produced since the last read as an IMU_DTYPE array."""
+
+
+class SimulatedImuSource(ImuSource):
+    """Generates noisy IMU samples at a fixed rate, for testing.
+
+    Parameters
+    ----------
+    rate : float
+        Sample rate in Hz
+    seed : int, optional
+        Seed of the noise generator
+    """
+
+    def __init__(self, rate: float = 1000.0, seed: Optional[int] = None) -> None:
+        self.rate = rate
+        self._period_ns = int(1e9 / rate)
+        self._next_ns = time.time_ns()
+        self._rng = np.random.default_rng(seed)
+
+    def read(self) -> np.ndarray:
+        """Generate the samples whose timestamps have passed."""
+        count = max(0, (time.time_ns() - self._next_ns) // self._period_ns + 1)
+        samples = np.empty(count, dtype=IMU_DTYPE)
+        samples["t_ns"] = self._next_ns + np.arange(count) * self._period_ns
+        self._next_ns += count * self._period_ns
+
+        seconds = samples["t_ns"] * 1e-9
+        noise = self._rng.normal(0.0, 0.05, size=(6, count)).astype(np.float32)
+        samples["ax"] = noise[0]
+        samples["ay"] = noise[1]
+        samples["az"] = GRAVITY + noise[2]
+        samples["gx"] = 0.1 * np.sin(2 * np.pi * 0.5 * seconds) + noise[3]
+        samples["gy"] = noise[4]
+        samples["gz"] = noise[5]
+        return samples
+
+
+class SampleWriter:
+    """Appends batches of records to a sample file.
+
+    Parameters
+    ----------
+    path : str
+        File to create
+    rate : float
+        Nominal sample rate, stored in the header
+    """
+
+    def __init__(self, path: str, rate: float) -> None:
+        self.path = path
+        self._file: BinaryIO = open(path, "wb")
+        header = _HEADER.pack(MAGIC, IMU_DTYPE.itemsize, rate)
+        self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self.bytes_written = HEADER_SIZE
+        self.samples_written = 0
+
+    def append(self, samples: np.ndarray) -> None:
+        """Write a batch of IMU_DTYPE records and flush it."""
+        if len(samples):
+            self._file.write(np.ascontiguousarray(samples, dtype=IMU_DTYPE).data)
+            self._file.flush()
+            self.bytes_written += samples.nbytes
+            self.samples_written += len(samples)
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+def read_header(path: str) -> float:
+    """Validate a sample file's header and return its sample rate.
+
+    Raises
+    ------
+    ValueError
+        If the file is not an IMU sample file of this version
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path} is not an IMU sample file")
+    magic, record_size, rate = _HEADER.unpack(header)
+    if magic != MAGIC or record_size != IMU_DTYPE.itemsize:
+        raise ValueError(f"{path} is not an IMU sample file")
+    return rate
+
+
+def open_samples(path: str) -> np.ndarray:
+    """Memory-map the records of a sample file read-only.
+
+    A partially written trailing record, e.g. of a file still being recorded,
+    is ignored.
+
+    Raises
+    ------
+    ValueError
+        If the file is not an IMU sample file
+    """
+    read_header(path)
+    count = (os.path.getsize(path) - HEADER_SIZE) // IMU_DTYPE.itemsize
+    if count <= 0:
+        return np.empty(0, dtype=IMU_DTYPE)
+    return np.memmap(path, dtype=IMU_DTYPE, mode="r", offset=HEADER_SIZE, shape=count)
+
+
+def read_range(
+    samples: np.ndarray, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+) -> np.ndarray:
+    """Select the records with ``start_ns <= t_ns < end_ns``.
+
+    Uses binary search on the timestamp column, so only the pages around the
+    boundaries and inside the range are touched.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        Records ordered by timestamp, e.g. from :func:`open_samples`
+    start_ns, end_ns : int, optional
+        Range bounds in epoch nanoseconds; open-ended if not given
+
+    Returns
+    -------
+    np.ndarray
+        View of the selected records
+    """
+    timestamps = samples["t_ns"]
+    first = 0 if start_ns is None else np.searchsorted(timestamps, start_ns, "left")
+    last = (
+        len(samples) if end_ns is None else np.searchsorted(timestamps, end_ns, "left")
+    )
+    return samples[first:last]
+
+
+def min_max_downsample(samples: np.ndarray, buckets: int) -> Dict[str, np.ndarray]:
+    """Reduce records to the minimum and maximum of each value per bucket.
+
+    The records are split into ``buckets`` runs of equal length (the last may
+    be shorter), so peaks survive downsampling, unlike plain decimation.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        Records ordered by timestamp
+    buckets : int
+        Maximum number of buckets
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        ``t_ns`` with the first timestamp of each bucket, and ``<field>_min``
+        and ``<field>_max`` for every value field
+    """
+    size = max(1, -(-len(samples) // buckets))
+    starts = np.arange(0, len(samples), size)
+    columns = {"t_ns": samples["t_ns"][starts]}
+    for name in VALUE_FIELDS:
+        values = samples[name]
+        if len(starts):
+            columns[f"{name}_min"] = np.minimum.reduceat(values, starts)
+            columns[f"{name}_max"] = np.maximum.reduceat(values, starts)
+        else:
+            columns[f"{name}_min"] = columns[f"{name}_max"] = values
+    return columns
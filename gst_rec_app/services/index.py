@@ -0,0 +1,764 @@
+"""Recordings index module.
+
+This module maintains a persistent SQLite index of the recordings under a
+recordings directory, so listing them is a single indexed query instead of a
+walk over every file.
+
+Each session directory (see :mod:`gst_rec_app.services.recording`) contributes
+one row per sensor. Sessions are re-probed when they finalize and otherwise by
+an incremental scan that only re-reads sessions whose mtime signature changed.
+
+The index also holds every file and directory under the root, for searching
+the whole archive. That table is built by a background scanner started by the
+first search, and kept current the same way: only directories whose mtime
+changed are listed again. Searches never wait for the scanner; until its first
+pass completes they return what is indexed so far.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from gst_rec_app.models.responses import Recording, SearchResult
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = ".recordings.db"
+MANIFEST_NAME = "session.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    signature INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recordings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    sensor TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    date REAL NOT NULL,
+    duration REAL NOT NULL,
+    size INTEGER NOT NULL,
+    segments INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recordings_session ON recordings (session);
+CREATE INDEX IF NOT EXISTS recordings_date ON recordings (date, id);
+CREATE INDEX IF NOT EXISTS recordings_size ON recordings (size, id);
+CREATE INDEX IF NOT EXISTS recordings_duration ON recordings (duration, id);
+CREATE INDEX IF NOT EXISTS recordings_sensor ON recordings (sensor, date, id);
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    ext TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sensor TEXT,
+    recording INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_ext ON files (ext, mtime, id);
+CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime, id);
+CREATE INDEX IF NOT EXISTS files_size ON files (size, id);
+CREATE INDEX IF NOT EXISTS files_name ON files (name, id);
+CREATE INDEX IF NOT EXISTS files_sensor ON files (sensor, mtime, id);
+"""
+
+_COLUMNS = "id, session, sensor, path, date, duration, size, segments"
+
+_FILE_COLUMNS = "id, path, name, is_dir, size, mtime, sensor, recording"
+
+SORT_COLUMNS = ("date", "size", "duration")
+SEARCH_SORT_COLUMNS = ("mtime", "size", "name")
+
+# Files table rows written per transaction while scanning
+_BATCH_ROWS = 5000
+
+# Glob patterns whose matches all have one extension, e.g. "*.mkv"
+_EXTENSION_GLOB = re.compile(r".*\.([^.*?\[\]/]+)")
+
+
+class RecordingsIndex:
+    """SQLite index of the recordings under one recordings directory.
+
+    The database lives in the recordings directory itself, so it follows the
+    archive if the directory is moved. Paths are stored relative to the root.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+    reconcile_interval : float
+        Minimum seconds between two incremental scans, and period of the
+        background scanner
+    """
+
+    def __init__(self, root: str, reconcile_interval: float = 30.0) -> None:
+        self.root = root
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._files_lock = threading.Lock()
+        self._scanner: Optional[threading.Thread] = None
+        self._scanner_lock = threading.Lock()
+        self._files_indexed = threading.Event()
+        self._last_reconcile = 0.0
+        self._last_files_reconcile = 0.0
+        os.makedirs(root, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(root, INDEX_NAME), timeout=10, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # The index can be rebuilt from the files, so skip fsyncs on commit
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def list(self) -> List[Recording]:
+        """Get all indexed recordings, newest first."""
+        return self.query()[0]
+
+    def get(self, recording_id: int) -> Optional[Recording]:
+        """Get one recording by id, or None if it is not indexed."""
+        self.reconcile()
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM recordings WHERE id = ?", (recording_id,)
+            ).fetchone()
+        return self._recording(row) if row is not None else None
+
+    def query(
+        self,
+        sort: str = "date",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        sensors: Optional[List[str]] = None,
+    ) -> Tuple[List[Recording], int, Optional[Tuple[float, int]]]:
+        """Get one page of recordings using keyset pagination.
+
+        Parameters
+        ----------
+        sort : str
+            Sort column, one of :data:`SORT_COLUMNS`; ties are broken by id
+        descending : bool
+            Sort direction
+        limit : int, optional
+            Maximum number of recordings to return
+        after : Tuple[float, int], optional
+            ``(sort value, id)`` of the last recording of the previous page
+        since : float, optional
+            Only recordings started at or after this epoch time
+        until : float, optional
+            Only recordings started before this epoch time
+        sensors : List[str], optional
+            Only recordings of these sensors
+
+        Returns
+        -------
+        Tuple[List[Recording], int, Optional[Tuple[float, int]]]
+            The page, the number of recordings matching the filters and the
+            ``after`` key of the next page (None on the last page)
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        self.reconcile()
+
+        where, params = [], []
+        if since is not None:
+            where.append("date >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("date < ?")
+            params.append(until)
+        if sensors:
+            where.append(f"sensor IN ({', '.join('?' * len(sensors))})")
+            params.extend(sensors)
+        filters = f"WHERE {' AND '.join(where)}" if where else ""
+
+        page_where, page_params = list(where), list(params)
+        if after is not None:
+            page_where.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            page_params.extend(after)
+        page_filters = f"WHERE {' AND '.join(page_where)}" if page_where else ""
+        direction = "DESC" if descending else "ASC"
+        page_sql = (
+            f"SELECT {_COLUMNS} FROM recordings {page_filters} "
+            f"ORDER BY {sort} {direction}, id {direction}"
+        )
+        if limit is not None:
+            page_sql += " LIMIT ?"
+            page_params.append(limit)
+
+        with self._lock:
+            rows = self._db.execute(page_sql, page_params).fetchall()
+            (total,) = self._db.execute(
+                f"SELECT COUNT(*) FROM recordings {filters}", params
+            ).fetchone()
+
+        next_after = None
+        if limit is not None and len(rows) == limit:
+            last = rows[-1]
+            next_after = (last[_COLUMNS.split(", ").index(sort)], last[0])
+        return [self._recording(row) for row in rows], total, next_after
+
+    def usage(self, by: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """Get the indexed bytes per sensor or per session.
+
+        Parameters
+        ----------
+        by : str
+            ``sensor`` or ``session``
+        limit : int, optional
+            Only the largest groups
+
+        Returns
+        -------
+        Dict[str, int]
+            Bytes per group, largest first
+        """
+        if by not in ("sensor", "session"):
+            raise ValueError(f"Cannot group by {by}")
+        sql = f"SELECT {by}, SUM(size) FROM recordings GROUP BY {by} ORDER BY 2 DESC"
+        params = []
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return dict(self._db.execute(sql, params).fetchall())
+
+    def session_usage(self, session: str) -> Dict[str, int]:
+        """Get the indexed bytes per sensor of one session."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT sensor, size FROM recordings WHERE session = ?", (session,)
+            ).fetchall()
+        return dict(rows)
+
+    def search(
+        self,
+        name: Optional[str] = None,
+        under: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        sensors: Optional[List[str]] = None,
+        kind: Optional[str] = None,
+        sort: str = "mtime",
+        descending: bool = True,
+        limit: int = 100,
+        after: Optional[Tuple[Any, int]] = None,
+    ) -> Tuple[List[SearchResult], Optional[Tuple[Any, int]]]:
+        """Find files and directories anywhere under the root.
+
+        Parameters
+        ----------
+        name : str, optional
+            Glob (``*``, ``?``, ``[...]``, case-sensitive) the name must match
+        under : str, optional
+            Only entries below this directory of the root
+        since : float, optional
+            Only entries modified at or after this epoch time
+        until : float, optional
+            Only entries modified before this epoch time
+        min_size : int, optional
+            Only files of at least this many bytes
+        max_size : int, optional
+            Only files of at most this many bytes
+        sensors : List[str], optional
+            Only the outputs (files and segments) of recordings of these sensors
+        kind : str, optional
+            ``file`` or ``dir`` to return only that kind of entry
+        sort : str
+            Sort column, one of :data:`SEARCH_SORT_COLUMNS`; ties are broken by id
+        descending : bool
+            Sort direction
+        limit : int
+            Maximum number of entries to return
+        after : Tuple[Any, int], optional
+            ``(sort value, id)`` of the last entry of the previous page
+
+        Returns
+        -------
+        Tuple[List[SearchResult], Optional[Tuple[Any, int]]]
+            The page and the ``after`` key of the next page (None on the last
+            page). Unlike :meth:`query`, matches are not counted, since that
+            may read the whole table. Until :attr:`files_indexed`, the page
+            may miss entries the scanner has not reached yet.
+        """
+        if sort not in SEARCH_SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        if kind not in (None, "file", "dir"):
+            raise ValueError(f"Unknown kind: {kind}")
+        self.start_scanner()
+
+        where, params = self._path_filters(name, under)
+        for clause, value in (
+            ("mtime >= ?", since),
+            ("mtime < ?", until),
+            ("size >= ? AND is_dir = 0", min_size),
+            ("size <= ? AND is_dir = 0", max_size),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        if sensors:
+            where.append(f"sensor IN ({', '.join('?' * len(sensors))})")
+            params.extend(sensors)
+        if kind is not None:
+            where.append("is_dir = ?")
+            params.append(int(kind == "dir"))
+        if after is not None:
+            where.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+        filters = f"WHERE {' AND '.join(where)}" if where else ""
+        direction = "DESC" if descending else "ASC"
+
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_FILE_COLUMNS} FROM files {filters} "
+                f"ORDER BY {sort} {direction}, id {direction} LIMIT ?",
+                params + [limit],
+            ).fetchall()
+
+        next_after = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_after = (last[_FILE_COLUMNS.split(", ").index(sort)], last[0])
+        return [self._search_result(row) for row in rows], next_after
+
+    def _path_filters(
+        self, name: Optional[str], under: Optional[str]
+    ) -> Tuple[List[str], List[Any]]:
+        """Build the search conditions on the name glob and parent directory.
+
+        Raises
+        ------
+        ValueError
+            If ``under`` is outside the root
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        if name:
+            where.append("name GLOB ?")
+            params.append(name)
+            match = _EXTENSION_GLOB.fullmatch(name)
+            if match and name[0] in "*?[":
+                # Implied by the glob, but lets SQLite use the extension index;
+                # globs with a literal prefix use the name index instead
+                where.append("ext = ?")
+                params.append(match[1].lower())
+        if under:
+            relative = os.path.relpath(os.path.join(self.root, under), self.root)
+            if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+                raise ValueError(f"{under} is not under {self.root}")
+            if relative != os.curdir:
+                # Range over the path index; "0" sorts right after "/"
+                where.append("path > ? AND path < ?")
+                params.extend([relative + "/", relative + "0"])
+        return where, params
+
+    @property
+    def files_indexed(self) -> bool:
+        """Whether the scanner of this process completed a pass over the root."""
+        return self._files_indexed.is_set()
+
+    def start_scanner(self) -> None:
+        """Start reconciling sessions and files in a background thread.
+
+        The scanner passes over the root right away and then every
+        ``reconcile_interval`` seconds.
+        """
+        with self._scanner_lock:
+            if self._scanner is None or not self._scanner.is_alive():
+                self._scanner = threading.Thread(
+                    target=self._scan, name="index-scanner", daemon=True
+                )
+                self._scanner.start()
+
+    def _scan(self) -> None:
+        """Reconcile sessions and files every ``reconcile_interval`` forever."""
+        while True:
+            try:
+                self.reconcile(force=True)
+                self.reconcile_files(force=True)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Scanning %s failed: %s", self.root, e)
+            else:
+                self._files_indexed.set()
+            time.sleep(self.reconcile_interval)
+
+    def reconcile(self, force: bool = False) -> None:
+        """Re-probe sessions whose signature changed since the last scan.
+
+        Parameters
+        ----------
+        force : bool
+            Scan even if the last scan is more recent than
+            ``reconcile_interval``
+        """
+        now = time.monotonic()
+        if not force and now - self._last_reconcile < self.reconcile_interval:
+            return
+        self._last_reconcile = now
+
+        with self._lock:
+            known = dict(self._db.execute("SELECT name, signature FROM sessions"))
+        found = set()
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                signature = _session_signature(entry.path)
+                if signature is None:
+                    continue
+                found.add(entry.name)
+                if known.get(entry.name) != signature:
+                    self._index_session(entry.name, signature)
+
+        with self._lock, self._db:
+            for name in known.keys() - found:
+                self._db.execute("DELETE FROM recordings WHERE session = ?", (name,))
+                self._db.execute("DELETE FROM sessions WHERE name = ?", (name,))
+
+    def reconcile_files(self, force: bool = False) -> None:
+        """Re-list the directories whose mtime changed since the last scan.
+
+        Unchanged directories cost one ``stat``, so a scan of an archive with
+        a million files in a few thousand directories takes milliseconds.
+        Files rewritten in place do not change their directory's mtime; their
+        size and mtime are updated when their session finalizes or their
+        directory changes.
+
+        Parameters
+        ----------
+        force : bool
+            Scan even if the last scan is more recent than
+            ``reconcile_interval``
+        """
+        with self._files_lock:
+            now = time.monotonic()
+            if not force and now - self._last_files_reconcile < self.reconcile_interval:
+                return
+            self._last_files_reconcile = now
+
+            with self._lock:
+                known = dict(self._db.execute("SELECT path, mtime_ns FROM directories"))
+                children: Dict[str, List[str]] = {}
+                for parent, path in self._db.execute(
+                    "SELECT dir, path FROM files WHERE is_dir = 1"
+                ):
+                    children.setdefault(parent, []).append(path)
+
+            found = set()
+            pending = [""]
+            batch: List[Tuple[str, int, List[Tuple]]] = []
+            batch_rows = 0
+            while pending:
+                relative = pending.pop()
+                try:
+                    mtime_ns = os.stat(os.path.join(self.root, relative)).st_mtime_ns
+                except OSError:
+                    continue
+                found.add(relative)
+                if known.get(relative) == mtime_ns:
+                    pending.extend(children.get(relative, ()))
+                    continue
+                rows = self._list_directory(relative)
+                if rows is None:
+                    continue
+                pending.extend(row[2] for row in rows if row[4])
+                batch.append((relative, mtime_ns, rows))
+                batch_rows += len(rows) + 1
+                if batch_rows >= _BATCH_ROWS:
+                    self._store_listings(batch)
+                    batch, batch_rows = [], 0
+            self._store_listings(batch)
+
+            with self._lock, self._db:
+                for relative in known.keys() - found:
+                    self._db.execute("DELETE FROM files WHERE dir = ?", (relative,))
+                    self._db.execute(
+                        "DELETE FROM directories WHERE path = ?", (relative,)
+                    )
+
+    def refresh_session(self, directory: str) -> None:
+        """Re-probe a session, e.g. when one of its recordings finalizes.
+
+        Parameters
+        ----------
+        directory : str
+            Session directory under the root
+        """
+        signature = _session_signature(directory)
+        if signature is None:
+            return
+        name = os.path.basename(directory)
+        self._index_session(name, signature)
+        with self._lock:
+            listed = self._db.execute(
+                "SELECT path FROM directories WHERE path = ? OR (path > ? AND path < ?)",
+                (name, name + "/", name + "0"),
+            ).fetchall()
+        # Only sessions already in the files table, which the scanner builds
+        listings = []
+        for (relative,) in listed:
+            try:
+                mtime_ns = os.stat(os.path.join(self.root, relative)).st_mtime_ns
+            except OSError:
+                continue
+            rows = self._list_directory(relative)
+            if rows is not None:
+                listings.append((relative, mtime_ns, rows))
+        self._store_listings(listings)
+
+    def _index_session(self, name: str, signature: int) -> None:
+        """Probe a session manifest and upsert one row per sensor."""
+        directory = os.path.join(self.root, name)
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        base = manifest.get("base_time_ns", 0) / 1e9
+        rows = []
+        for sensor, entry in manifest.get("sensors", {}).items():
+            path, size, segments, last_mtime = _probe_output(directory, entry["path"])
+            date = base + entry.get("started_offset_ns", 0) / 1e9
+            if "stopped_offset_ns" in entry:
+                duration = (
+                    entry["stopped_offset_ns"] - entry.get("started_offset_ns", 0)
+                ) / 1e9
+            else:
+                duration = max(0.0, last_mtime - date)
+            rows.append((name, sensor, path, date, duration, size, segments))
+
+        # One statement per row, so that workers indexing the same session
+        # cannot both insert it; the id of an existing row is kept
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO recordings (session, sensor, path, date, duration, "
+                "size, segments) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET session = excluded.session, "
+                "sensor = excluded.sensor, date = excluded.date, "
+                "duration = excluded.duration, size = excluded.size, "
+                "segments = excluded.segments",
+                rows,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (name, signature) VALUES (?, ?)",
+                (name, signature),
+            )
+
+    def _list_directory(self, relative: str) -> Optional[List[Tuple]]:
+        """Read the rows of one directory for the files table.
+
+        Returns None if the directory cannot be read.
+        """
+        rows = []
+        try:
+            with os.scandir(os.path.join(self.root, relative)) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    rows.append(
+                        (
+                            relative,
+                            entry.name,
+                            os.path.join(relative, entry.name),
+                            os.path.splitext(entry.name)[1][1:].lower(),
+                            is_dir,
+                            0 if is_dir else stat.st_size,
+                            stat.st_mtime,
+                        )
+                    )
+        except OSError:
+            return None
+        return rows
+
+    def _store_listings(self, listings: List[Tuple[str, int, List[Tuple]]]) -> None:
+        """Replace the files table rows of directories, in one transaction.
+
+        Entries keep their id while they exist, so search cursors stay valid.
+
+        Parameters
+        ----------
+        listings : List[Tuple[str, int, List[Tuple]]]
+            Root-relative path, mtime and :meth:`_list_directory` rows of each
+            directory
+        """
+        with self._lock, self._db:
+            for relative, mtime_ns, rows in listings:
+                self._store_listing(relative, mtime_ns, rows)
+
+    def _store_listing(self, relative: str, mtime_ns: int, rows: List[Tuple]) -> None:
+        """Replace the rows of one directory. Must be called with the lock held."""
+        # Recording paths are files, or segment directories, of a session
+        outputs = {
+            path: (sensor, id_)
+            for id_, sensor, path in self._db.execute(
+                "SELECT id, sensor, path FROM recordings WHERE session = ?",
+                (relative.split(os.sep, 1)[0],),
+            )
+        }
+        existing = dict(
+            self._db.execute(
+                "SELECT name, is_dir FROM files WHERE dir = ?", (relative,)
+            )
+        )
+        # Upserts keep the ids of existing rows, and cannot conflict with
+        # another worker listing the same directory
+        self._db.executemany(
+            "INSERT INTO files (dir, name, path, ext, is_dir, size, mtime, "
+            "sensor, recording) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET ext = excluded.ext, "
+            "is_dir = excluded.is_dir, size = excluded.size, "
+            "mtime = excluded.mtime, sensor = excluded.sensor, "
+            "recording = excluded.recording",
+            [
+                row + (outputs.get(row[2]) or outputs.get(relative) or (None, None))
+                for row in rows
+            ],
+        )
+
+        names = {row[1] for row in rows}
+        for name, is_dir in existing.items():
+            if name in names:
+                continue
+            path = os.path.join(relative, name)
+            self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+            if is_dir:
+                # Everything below a removed directory
+                self._db.execute(
+                    "DELETE FROM files WHERE path > ? AND path < ?",
+                    (path + "/", path + "0"),
+                )
+                self._db.execute(
+                    "DELETE FROM directories WHERE path = ? OR (path > ? AND path < ?)",
+                    (path, path + "/", path + "0"),
+                )
+        self._db.execute(
+            "INSERT OR REPLACE INTO directories (path, mtime_ns) VALUES (?, ?)",
+            (relative, mtime_ns),
+        )
+
+    def _search_result(self, row: Tuple) -> SearchResult:
+        """Build a :class:`SearchResult` from a result row."""
+        _, path, name, is_dir, size, mtime, sensor, recording = row
+        return SearchResult(
+            name=name,
+            path=os.path.join(self.root, path),
+            is_dir=bool(is_dir),
+            size=None if is_dir else size,
+            mtime=mtime,
+            sensor=sensor,
+            recording=recording,
+        )
+
+    def _recording(self, row: Tuple) -> Recording:
+        """Build a :class:`Recording` from a result row."""
+        id_, session, sensor, path, date, duration, size, segments = row
+        return Recording(
+            id=id_,
+            date=datetime.fromtimestamp(date, tz=timezone.utc),
+            duration=duration,
+            size=size,
+            path=os.path.join(self.root, path),
+            sensor=sensor,
+            session=session,
+            segments=segments,
+        )
+
+
+def _session_signature(directory: str) -> Optional[int]:
+    """Get the newest mtime of a session's manifest and subdirectories.
+
+    Returns None if the directory is not a recording session. Adding or
+    deleting segments changes the sensor subdirectory mtime, and every sensor
+    start/stop rewrites the manifest, so an unchanged signature means the
+    session does not need to be probed again.
+    """
+    try:
+        signature = os.stat(os.path.join(directory, MANIFEST_NAME)).st_mtime_ns
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    signature = max(signature, entry.stat().st_mtime_ns)
+    except OSError:
+        return None
+    return signature
+
+
+def _probe_output(directory: str, relative: str) -> Tuple[str, int, int, float]:
+    """Get the size, segment count and newest mtime of a sensor output.
+
+    Returns
+    -------
+    Tuple[str, int, int, float]
+        Root-relative path (the segment directory when segmented), total size,
+        number of files and newest mtime
+    """
+    session = os.path.basename(directory)
+    if "%" not in relative:
+        try:
+            stat = os.stat(os.path.join(directory, relative))
+        except OSError:
+            return os.path.join(session, relative), 0, 0, 0.0
+        return os.path.join(session, relative), stat.st_size, 1, stat.st_mtime
+
+    segment_dir = os.path.dirname(relative)
+    size, segments, last_mtime = 0, 0, 0.0
+    try:
+        with os.scandir(os.path.join(directory, segment_dir)) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    size += stat.st_size
+                    segments += 1
+                    last_mtime = max(last_mtime, stat.st_mtime)
+    except OSError:
+        pass
+    return os.path.join(session, segment_dir), size, segments, last_mtime
+
+
+_indexes: Dict[str, RecordingsIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(root: str) -> RecordingsIndex:
+    """Get the shared index of a recordings directory.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+
+    Returns
+    -------
+    RecordingsIndex
+        Index opened once per process and root
+    """
+    root = os.path.abspath(root)
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = RecordingsIndex(root)
+        return _indexes[root]
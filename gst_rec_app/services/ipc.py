@@ -0,0 +1,183 @@
+"""Recorder daemon client module.
+
+When the ``daemon_socket`` setting is set, recording pipelines and state live
+in the recorder daemon (:mod:`gst_rec_app.services.daemon`) instead of the web
+workers, which then stay stateless and can be scaled and recycled freely.
+
+The protocol is JSON lines over a Unix domain socket: the client writes one
+``{"command": ..., "args": {...}}`` object per line and reads one
+``{"result": ...}`` or ``{"error": ..., "type": ...}`` object per line. The
+``events`` command instead streams server-sent event frames, which the client
+relays to the local event bus.
+"""
+
+import json
+import logging
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from gst_rec_app.models.responses import (
+    RecorderStats,
+    RecordingJob,
+    RecordingStatus,
+    SessionJob,
+    SessionStatus,
+)
+from gst_rec_app.services.events import EventBus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = "/tmp/gst-rec-daemon.sock"
+
+
+class DaemonError(RuntimeError):
+    """The recorder daemon is unreachable or failed to handle a command."""
+
+
+class DaemonClient:
+    """Client of the recorder daemon.
+
+    Parameters
+    ----------
+    path : str
+        Path of the daemon's Unix domain socket
+    timeout : float
+        Seconds to wait for a reply
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._relay: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(
+        self, sensor_ids: Optional[List[str]] = None, group: Optional[str] = None
+    ) -> SessionJob:
+        """Request sensors to start recording, see ``RecordingManager.start``."""
+        return _session_job(self.call("start", sensors=sensor_ids, group=group))
+
+    def stop(
+        self, sensor_ids: Optional[List[str]] = None, group: Optional[str] = None
+    ) -> SessionJob:
+        """Request sensors to stop recording, see ``RecordingManager.stop``."""
+        return _session_job(self.call("stop", sensors=sensor_ids, group=group))
+
+    def status(self) -> SessionStatus:
+        """Get the recording status of all sensors."""
+        return _session_status(self.call("status"))
+
+    def call(self, command: str, **args: Any) -> Any:
+        """Send a command and return its result.
+
+        Raises
+        ------
+        ValueError
+            If the daemon rejected the arguments
+        DaemonError
+            If the daemon is unreachable or the command failed
+        """
+        try:
+            with self._connect() as conn, conn.makefile("rwb") as stream:
+                stream.write(encode_message({"command": command, "args": args}))
+                stream.flush()
+                line = stream.readline()
+        except OSError as e:
+            raise DaemonError(f"Recorder daemon unavailable: {e}") from e
+        if not line:
+            raise DaemonError("Recorder daemon closed the connection")
+        reply = json.loads(line)
+        if "error" in reply:
+            if reply.get("type") == "ValueError":
+                raise ValueError(reply["error"])
+            raise DaemonError(reply["error"])
+        return reply["result"]
+
+    def relay_events(self, bus: EventBus) -> None:
+        """Forward the daemon's events to a local bus in a background thread."""
+        with self._lock:
+            if self._relay is None or not self._relay.is_alive():
+                self._relay = threading.Thread(
+                    target=self._relay_events,
+                    args=(bus,),
+                    name="daemon-events",
+                    daemon=True,
+                )
+                self._relay.start()
+
+    def _relay_events(self, bus: EventBus) -> None:
+        """Read event frames from the daemon forever, reconnecting on errors."""
+        while True:
+            try:
+                with self._connect(stream=True) as conn:
+                    conn.sendall(encode_message({"command": "events", "args": {}}))
+                    with conn.makefile("r") as stream:
+                        frame = ""
+                        for line in stream:
+                            frame += line
+                            if line != "\n":
+                                continue
+                            if frame.startswith("event:"):
+                                bus.broadcast(frame)
+                            frame = ""
+            except OSError as e:
+                logger.debug("Daemon event stream interrupted: %s", e)
+            time.sleep(1.0)
+
+    def _connect(self, stream: bool = False) -> socket.socket:
+        """Open a connection to the daemon, without timeout for streams."""
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(None if stream else self.timeout)
+        try:
+            conn.connect(self.path)
+        except OSError:
+            conn.close()
+            raise
+        return conn
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a message as one JSON line."""
+    return (json.dumps(message, default=str) + "\n").encode()
+
+
+def _session_job(data: Dict[str, Any]) -> SessionJob:
+    """Rebuild a :class:`SessionJob` from its dict form."""
+    jobs = [RecordingJob(**job) for job in data.pop("jobs")]
+    return SessionJob(jobs=jobs, **data)
+
+
+def _session_status(data: Dict[str, Any]) -> SessionStatus:
+    """Rebuild a :class:`SessionStatus` from its dict form."""
+    sensors = []
+    for sensor in data.pop("sensors"):
+        stats = sensor.pop("stats")
+        sensors.append(
+            RecordingStatus(stats=RecorderStats(**stats) if stats else None, **sensor)
+        )
+    return SessionStatus(sensors=sensors, **data)
+
+
+_clients: Dict[str, DaemonClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(path: str) -> DaemonClient:
+    """Get the shared client of a daemon socket.
+
+    Parameters
+    ----------
+    path : str
+        Path of the daemon's Unix domain socket
+
+    Returns
+    -------
+    DaemonClient
+        Client created once per process and socket
+    """
+    with _clients_lock:
+        if path not in _clients:
+            _clients[path] = DaemonClient(path)
+        return _clients[path]
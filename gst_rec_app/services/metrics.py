@@ -0,0 +1,209 @@
+"""Metrics module.
+
+This module defines the Prometheus metrics of the application and renders them
+for the ``/metrics`` endpoint.
+
+Hot paths (requests, directory listings, settings writes) update counters and
+histograms in place, which costs a lock and an addition per update. When
+``PROMETHEUS_MULTIPROC_DIR`` is set before this module is imported, as the
+Gunicorn configuration does, the values live in memory-mapped files in that
+directory, so a scrape served by any worker reports the sum over all workers.
+
+Recording and storage gauges are not updated on any hot path: they are read
+from the recording status and the storage sampler's snapshot when scraped. If
+the recorder daemon does not answer, the recording gauges are left out and
+``gst_rec_recorder_up`` reports 0.
+"""
+
+import os
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily, Metric
+
+if TYPE_CHECKING:
+    from gst_rec_app.models.responses import RecordingStatus
+    from gst_rec_app.models.settings import Settings
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+RECORDING_STATES = ("idle", "starting", "recording", "stopping", "failed")
+
+REQUEST_DURATION = Histogram(
+    "gst_rec_http_request_duration_seconds",
+    "Time to build the response of a request, per route",
+    ["endpoint", "method"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+REQUESTS = Counter(
+    "gst_rec_http_requests",
+    "Requests served, per route and status code",
+    ["endpoint", "method", "status"],
+)
+DIRECTORY_SCAN_DURATION = Histogram(
+    "gst_rec_directory_scan_seconds",
+    "Time to scan a directory: a full listing or a single page",
+    ["kind"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+DIRECTORY_CACHE_LOOKUPS = Counter(
+    "gst_rec_directory_cache_lookups",
+    "Directory cache lookups, by result (hit or miss)",
+    ["result"],
+)
+SETTINGS_WRITE_DURATION = Histogram(
+    "gst_rec_settings_write_seconds",
+    "Time to write the settings file, including fsync",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+def observe_request(endpoint: str, method: str, status: int, seconds: float) -> None:
+    """Record a served request.
+
+    Parameters
+    ----------
+    endpoint : str
+        Flask endpoint of the route
+    method : str
+        HTTP method
+    status : int
+        Response status code
+    seconds : float
+        Time spent building the response
+    """
+    REQUEST_DURATION.labels(endpoint, method).observe(seconds)
+    REQUESTS.labels(endpoint, method, str(status)).inc()
+
+
+class StateCollector:
+    """Reports recording and storage gauges at scrape time.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings
+    """
+
+    def __init__(self, settings: "Settings") -> None:
+        self.settings = settings
+
+    def collect(self) -> Iterator[Metric]:
+        """Yield the current recording state and storage usage."""
+        # Imported here, since the services import this module's instruments
+        from gst_rec_app.services.ipc import DaemonError
+        from gst_rec_app.services.recording import get_recording_status
+        from gst_rec_app.services.storage import get_storage_sampler
+
+        try:
+            statuses = get_recording_status(self.settings).sensors
+        except DaemonError:
+            statuses = None
+        yield GaugeMetricFamily(
+            "gst_rec_recorder_up",
+            "1 if the recording state could be read, 0 if the daemon is down",
+            value=float(statuses is not None),
+        )
+        if statuses is not None:
+            yield from _recording_metrics(statuses)
+
+        try:
+            info = get_storage_sampler(self.settings).snapshot()
+        except OSError:
+            return
+        yield GaugeMetricFamily(
+            "gst_rec_storage_free_bytes",
+            "Free space of the recordings disk",
+            value=info.free,
+        )
+        yield GaugeMetricFamily(
+            "gst_rec_storage_total_bytes",
+            "Size of the recordings disk",
+            value=info.total,
+        )
+        if info.write_rate is not None:
+            yield GaugeMetricFamily(
+                "gst_rec_storage_write_rate_bytes_per_second",
+                "Growth of the recordings over the last minute",
+                value=info.write_rate,
+            )
+        sensors = GaugeMetricFamily(
+            "gst_rec_storage_sensor_bytes",
+            "Bytes of recordings on disk per sensor",
+            labels=["sensor"],
+        )
+        for name, size in info.sensors.items():
+            sensors.add_metric([name], size)
+        yield sensors
+
+
+def _recording_metrics(sensors: List["RecordingStatus"]) -> Iterator[Metric]:
+    """Yield the state, bytes written, dropped frames and throughput per sensor.
+
+    Parameters
+    ----------
+    sensors : List[RecordingStatus]
+        Recording status of each sensor
+    """
+    state = GaugeMetricFamily(
+        "gst_rec_recording_state",
+        "1 for the current recording state of each sensor, 0 for the others",
+        labels=["sensor", "state"],
+    )
+    written = GaugeMetricFamily(
+        "gst_rec_recording_bytes_written",
+        "Bytes written by the current or last recording of each sensor",
+        labels=["sensor"],
+    )
+    dropped = GaugeMetricFamily(
+        "gst_rec_recording_frames_dropped",
+        "Frames dropped by the current or last recording of each sensor",
+        labels=["sensor"],
+    )
+    throughput = GaugeMetricFamily(
+        "gst_rec_recording_throughput_bytes_per_second",
+        "Write rate of the current recording of each sensor",
+        labels=["sensor"],
+    )
+    for sensor in sensors:
+        name = sensor.sensor or ""
+        for value in RECORDING_STATES:
+            state.add_metric([name, value], float(sensor.state == value))
+        if sensor.stats is not None:
+            written.add_metric([name], sensor.stats.bytes_written)
+            dropped.add_metric([name], sensor.stats.frames_dropped)
+        if sensor.throughput is not None:
+            throughput.add_metric([name], sensor.throughput)
+    yield from (state, written, dropped, throughput)
+
+
+def generate_metrics(settings: "Settings") -> Tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    In multiprocess mode the counters and histograms of all workers are
+    aggregated from their files; otherwise this process' own values, along with
+    its process and garbage collector metrics, are reported.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings
+
+    Returns
+    -------
+    Tuple[bytes, str]
+        Response body and its content type
+    """
+    registry = CollectorRegistry()
+    registry.register(StateCollector(settings))
+    if MULTIPROC_ENV in os.environ:
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY) + generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,52 @@
+"""Recordings ownership module.
+
+Several processes may serve one recordings directory (gunicorn workers, the
+recorder daemon, the development server's reloader), but only one of them may
+run the background work that touches devices or claims jobs: pre-roll
+captures and the post-processing dispatcher. That process is the first one to
+take an exclusive lock on a file in the recordings directory. The lock is held
+until the process exits, when the kernel releases it.
+"""
+
+import fcntl
+import os
+import threading
+from typing import Dict, Tuple
+
+OWNER_LOCK_NAME = ".owner.lock"
+
+# Lock file descriptor and the process that took it, per directory; a forked
+# child shares the descriptor, hence the lock, so it must take its own
+_locks: Dict[str, Tuple[int, int]] = {}
+_locks_lock = threading.Lock()
+
+
+def acquire_ownership(root: str) -> bool:
+    """Try to become the owner of a recordings directory.
+
+    Never blocks. Calling it again in the owner process returns True.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+
+    Returns
+    -------
+    bool
+        Whether this process owns the directory
+    """
+    root = os.path.abspath(root)
+    with _locks_lock:
+        owner = _locks.get(root)
+        if owner is not None and owner[0] == os.getpid():
+            return True
+        os.makedirs(root, exist_ok=True)
+        fd = os.open(os.path.join(root, OWNER_LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        _locks[root] = (os.getpid(), fd)
+        return True
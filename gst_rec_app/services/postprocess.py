@@ -0,0 +1,526 @@
+"""Post-processing module.
+
+Finished recordings are post-processed by jobs from a persistent queue:
+
+- ``remux``: copy the video into an MP4 with the index up front (faststart),
+  so it plays while downloading
+- ``thumbnails``: extract a JPEG preview strip, one frame every
+  ``thumbnail_interval`` seconds, into ``<recording>_thumbs/``
+- ``checksum``: write the SHA-256 of the file (or of every segment) to
+  ``<recording>.sha256`` in ``sha256sum`` format
+
+The queue is a SQLite database (``.jobs.db``) in the recordings directory.
+Jobs run highest priority first in a bounded pool of worker processes with
+lowered CPU priority, so they use spare cores without disturbing live
+capture. Workers write their progress to the database, where every process
+can read it; jobs interrupted by a restart are queued again when the queue
+resumes.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from gst_rec_app.models.responses import ProcessingJob
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.events import bus
+from gst_rec_app.services.ownership import acquire_ownership
+from gst_rec_app.services.recorder import GST_LAUNCH, Recorder
+
+logger = logging.getLogger(__name__)
+
+JOBS_NAME = ".jobs.db"
+JOB_KINDS = ("remux", "thumbnails", "checksum")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    options TEXT NOT NULL DEFAULT '{}',
+    updated REAL NOT NULL,
+    UNIQUE (path, kind)
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (state, priority DESC, id);
+"""
+
+_PROGRESS_RE = re.compile(r"\(\s*([\d.]+) %\)")
+_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class PostprocessConfig:
+    """Describes which jobs run after a recording stops, and how."""
+
+    enabled: bool = True
+    jobs: List[str] = field(default_factory=lambda: list(JOB_KINDS))
+    workers: int = 1  # worker processes
+    nice: int = 10  # niceness increment of the worker processes
+    priorities: Dict[str, int] = field(
+        default_factory=lambda: {"checksum": 2, "remux": 1, "thumbnails": 0}
+    )
+    thumbnail_interval: int = 10  # seconds between preview frames
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "PostprocessConfig":
+        """Build a config from a settings dict, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in values.items() if k in known})
+
+
+class JobQueue:
+    """Persistent queue of post-processing jobs of one recordings directory.
+
+    Any process may queue jobs and read their progress; only the process that
+    owns the recordings runs them, after :meth:`ensure_running`.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory; job paths are stored relative to it
+    settings : Settings
+        Application settings providing ``postprocess``
+    """
+
+    def __init__(self, root: str, settings: Settings) -> None:
+        self.root = root
+        self.settings = settings
+        self.db_path = os.path.join(root, JOBS_NAME)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running: Dict[int, Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._thread: Optional[threading.Thread] = None
+        os.makedirs(root, exist_ok=True)
+        self._db = _connect(self.db_path)
+
+    def enqueue(self, path: str, kinds: List[str]) -> None:
+        """Queue jobs for a recording and make sure they run.
+
+        Parameters
+        ----------
+        path : str
+            Recording file, or directory of a segmented recording
+        kinds : List[str]
+            Jobs to run, from :data:`JOB_KINDS`; already queued ones are kept
+        """
+        config = PostprocessConfig.from_dict(self.settings.get("postprocess", {}))
+        relative = os.path.relpath(path, self.root)
+        options = {"thumbnail_interval": config.thumbnail_interval}
+        with self._lock, self._db:
+            for kind in kinds:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO jobs (path, kind, priority, state, "
+                    "options, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        relative,
+                        kind,
+                        config.priorities.get(kind, 0),
+                        QUEUED,
+                        json.dumps(options),
+                        time.time(),
+                    ),
+                )
+        self.ensure_running()
+        self._wakeup.set()
+
+    def jobs(self, paths: List[str]) -> Dict[str, List[ProcessingJob]]:
+        """Get the jobs of recordings.
+
+        Parameters
+        ----------
+        paths : List[str]
+            Recording paths
+
+        Returns
+        -------
+        Dict[str, List[ProcessingJob]]
+            Jobs per path, for paths that have any
+        """
+        relative = {os.path.relpath(path, self.root): path for path in paths}
+        if not relative:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, path, kind, state, progress, message FROM jobs "
+                f"WHERE path IN ({', '.join('?' * len(relative))}) ORDER BY id",
+                list(relative),
+            ).fetchall()
+        result: Dict[str, List[ProcessingJob]] = {}
+        for id_, path, kind, state, progress, message in rows:
+            result.setdefault(relative[path], []).append(
+                ProcessingJob(
+                    id=id_, kind=kind, state=state, progress=progress, message=message
+                )
+            )
+        return result
+
+    def ensure_running(self) -> None:
+        """Start running queued jobs in this process if it does not yet.
+
+        Only the process that owns the recordings directory runs jobs (see
+        :func:`~gst_rec_app.services.ownership.acquire_ownership`); in others
+        this does nothing, and the owner picks up their jobs within seconds.
+        Jobs left running by a previous owner were interrupted, so they are
+        queued again first.
+        """
+        if not acquire_ownership(self.root):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            with self._db:
+                self._db.execute(
+                    "UPDATE jobs SET state = ?, progress = 0 WHERE state = ?",
+                    (QUEUED, RUNNING),
+                )
+            self._thread = threading.Thread(
+                target=self._run, name="postprocess-dispatcher", daemon=True
+            )
+            self._thread.start()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        """Hand queued jobs to the pool, highest priority first, forever."""
+        while True:
+            self._wakeup.wait(5.0)
+            self._wakeup.clear()
+            try:
+                self._dispatch()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Post-processing dispatch failed: %s", e)
+
+    def _dispatch(self) -> None:
+        """Claim as many queued jobs as there are idle workers."""
+        config = PostprocessConfig.from_dict(self.settings.get("postprocess", {}))
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the parent runs many threads
+                self._workers = max(1, config.workers)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(config.nice,),
+                )
+            idle = self._workers - len(self._running)
+            if idle <= 0:
+                return
+            with self._db:
+                rows = self._db.execute(
+                    "SELECT id, path, kind, options FROM jobs WHERE state = ? "
+                    "ORDER BY priority DESC, id LIMIT ?",
+                    (QUEUED, idle),
+                ).fetchall()
+                for row in rows:
+                    self._db.execute(
+                        "UPDATE jobs SET state = ?, updated = ? WHERE id = ?",
+                        (RUNNING, time.time(), row[0]),
+                    )
+            for index, (id_, path, kind, options) in enumerate(rows):
+                try:
+                    future = self._pool.submit(
+                        run_job,
+                        self.db_path,
+                        id_,
+                        kind,
+                        os.path.join(self.root, path),
+                        json.loads(options),
+                    )
+                except BrokenProcessPool:
+                    # A worker died; requeue and start a new pool next time
+                    self._pool = None
+                    with self._db:
+                        self._db.executemany(
+                            "UPDATE jobs SET state = ? WHERE id = ?",
+                            [(QUEUED, row[0]) for row in rows[index:]],
+                        )
+                    self._wakeup.set()
+                    return
+                self._running[id_] = future
+                future.add_done_callback(
+                    lambda future, id_=id_, path=path, kind=kind: self._finished(
+                        id_, path, kind, future
+                    )
+                )
+
+    def _finished(self, job_id: int, path: str, kind: str, future: Future) -> None:
+        """Record the outcome of a job and look for the next one."""
+        error = future.exception()
+        state = FAILED if error is not None else DONE
+        if error is not None:
+            logger.warning("Post-processing %s of %s failed: %s", kind, path, error)
+        with self._lock:
+            self._running.pop(job_id, None)
+            if isinstance(error, BrokenProcessPool):
+                self._pool = None
+            with self._db:
+                self._db.execute(
+                    "UPDATE jobs SET state = ?, progress = ?, message = ?, "
+                    "updated = ? WHERE id = ?",
+                    (
+                        state,
+                        1.0 if error is None else 0.0,
+                        str(error) if error is not None else None,
+                        time.time(),
+                        job_id,
+                    ),
+                )
+        bus.publish("job", {"id": job_id, "path": path, "kind": kind, "state": state})
+        self._wakeup.set()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Open the jobs database, creating its schema."""
+    db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _init_worker(nice: int) -> None:
+    """Lower the CPU priority of a worker process and its subprocesses."""
+    try:
+        os.nice(nice)
+    except OSError as e:
+        logger.warning("Could not lower post-processing priority: %s", e)
+
+
+def run_job(
+    db_path: str, job_id: int, kind: str, path: str, options: Dict[str, Any]
+) -> None:
+    """Run one job in a worker process, writing its progress to the database.
+
+    Raises
+    ------
+    RuntimeError
+        If the job fails
+    ValueError
+        If the job kind is unknown
+    """
+    db = _connect(db_path)
+    last_update = 0.0
+
+    def report(progress: float) -> None:
+        nonlocal last_update
+        now = time.monotonic()
+        if now - last_update >= 0.5:
+            last_update = now
+            with db:
+                db.execute(
+                    "UPDATE jobs SET progress = ?, updated = ? WHERE id = ?",
+                    (min(max(progress, 0.0), 1.0), time.time(), job_id),
+                )
+
+    try:
+        if kind == "checksum":
+            write_checksums(path, report)
+        elif kind == "remux":
+            remux(path, report)
+        elif kind == "thumbnails":
+            extract_thumbnails(path, options.get("thumbnail_interval", 10), report)
+        else:
+            raise ValueError(f"Unknown job: {kind}")
+    finally:
+        db.close()
+
+
+def write_checksums(path: str, report: Callable[[float], None]) -> str:
+    """Write the SHA-256 of a file, or of every file in a directory.
+
+    Returns
+    -------
+    str
+        Path of the ``<path>.sha256`` file, in ``sha256sum`` format with
+        names relative to the file's directory
+    """
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if os.path.isfile(os.path.join(path, name))
+        )
+    else:
+        files = [path]
+    total = sum(os.path.getsize(name) for name in files) or 1
+    done, lines = 0, []
+    for name in files:
+        digest = hashlib.sha256()
+        with open(name, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                done += len(chunk)
+                report(done / total)
+        relative = os.path.relpath(name, os.path.dirname(path))
+        lines.append(f"{digest.hexdigest()}  {relative}\n")
+
+    output = f"{path}.sha256"
+    with open(f"{output}.tmp", "w") as f:
+        f.writelines(lines)
+    os.replace(f"{output}.tmp", output)
+    return output
+
+
+def remux(path: str, report: Callable[[float], None]) -> str:
+    """Copy the H.264 video of a Matroska file into an MP4 with faststart.
+
+    Returns
+    -------
+    str
+        Path of the ``.mp4`` file next to the recording
+    """
+    output = f"{os.path.splitext(path)[0]}.mp4"
+    _run_pipeline(
+        f"filesrc location={_quote(path)} ! matroskademux ! h264parse ! "
+        f"progressreport update-freq=1 ! mp4mux faststart=true ! "
+        f"filesink location={_quote(output + '.tmp')}",
+        report,
+    )
+    os.replace(f"{output}.tmp", output)
+    return output
+
+
+def extract_thumbnails(
+    path: str, interval: int, report: Callable[[float], None]
+) -> str:
+    """Extract one 320 pixel wide JPEG every ``interval`` seconds.
+
+    Returns
+    -------
+    str
+        Directory ``<recording>_thumbs`` holding ``thumb_00000.jpg``, ...
+    """
+    output = f"{os.path.splitext(path)[0]}_thumbs"
+    shutil.rmtree(output, ignore_errors=True)
+    os.makedirs(output)
+    _run_pipeline(
+        f"filesrc location={_quote(path)} ! decodebin ! "
+        f"progressreport update-freq=1 ! videorate ! "
+        f"video/x-raw,framerate=1/{max(1, int(interval))} ! videoconvert ! "
+        f"videoscale ! video/x-raw,width=320,pixel-aspect-ratio=1/1 ! jpegenc ! "
+        f"multifilesink location={_quote(os.path.join(output, 'thumb_%05d.jpg'))}",
+        report,
+    )
+    return output
+
+
+def _quote(value: str) -> str:
+    """Quote a property value for a ``gst-launch-1.0`` description."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _run_pipeline(description: str, report: Callable[[float], None]) -> None:
+    """Run a pipeline to EOS, reporting ``progressreport`` output.
+
+    Raises
+    ------
+    RuntimeError
+        If ``gst-launch-1.0`` is missing or the pipeline fails
+    """
+    executable = shutil.which(GST_LAUNCH)
+    if not executable:
+        raise RuntimeError(f"{GST_LAUNCH} not found")
+    process = subprocess.Popen(
+        [executable, "-q", description],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+    errors = []
+    assert process.stdout is not None
+    for line in process.stdout:
+        match = _PROGRESS_RE.search(line)
+        if match:
+            report(float(match.group(1)) / 100)
+        elif "ERROR" in line:
+            errors.append(line.strip())
+    if process.wait() != 0:
+        raise RuntimeError("; ".join(errors) or f"{GST_LAUNCH} failed")
+
+
+def postprocess_recording(settings: Settings, recorder: Recorder) -> None:
+    """Queue the configured jobs for a recording that stopped cleanly.
+
+    Video jobs only apply to single-file Matroska video recordings of the
+    ``gst`` backend; checksums apply to every recording.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path``, ``recorder_backend``
+        and ``postprocess``
+    recorder : Recorder
+        Recorder of the finished recording
+    """
+    config = PostprocessConfig.from_dict(settings.get("postprocess", {}))
+    if not config.enabled or not recorder.location:
+        return
+    pipeline = recorder.config
+    video = (
+        pipeline.video
+        and pipeline.extension == "mkv"
+        and not pipeline.segmented
+        and pipeline.source != "imu"
+        and settings.get("recorder_backend", "gst") == "gst"
+    )
+    kinds = [
+        kind
+        for kind in config.jobs
+        if kind in JOB_KINDS and (video or kind == "checksum")
+    ]
+    if not kinds:
+        return
+    path = recorder.location
+    if pipeline.segmented:
+        path = os.path.dirname(path)
+    root = settings.get("default_path") or str(Path.home())
+    get_job_queue(root, settings).enqueue(path, kinds)
+
+
+_queues: Dict[str, JobQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_job_queue(root: str, settings: Settings) -> JobQueue:
+    """Get the shared job queue of a recordings directory.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+    settings : Settings
+        Application settings
+
+    Returns
+    -------
+    JobQueue
+        Queue opened once per process and root
+    """
+    root = os.path.abspath(root)
+    with _queues_lock:
+        if root not in _queues:
+            _queues[root] = JobQueue(root, settings)
+        return _queues[root]
@@ -0,0 +1,286 @@
+"""Pre-roll module.
+
+With pre-roll enabled, every sensor's encoder runs all the time and the last
+``seconds`` of its encoded stream are kept in a bounded in-memory ring buffer.
+Starting a recording flushes the buffer into the new file and then appends the
+live stream to it, so the recording begins before the start request arrived.
+
+The stream is MPEG-TS, which can be cut at any packet boundary, so the buffer
+only holds the chunks as read from the encoder. Chunks are never copied or
+joined: they are queued as received and flushed with vectored writes.
+Playback of a recording starts at its first keyframe, at most two seconds in.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields, replace
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple
+
+from gst_rec_app.models.responses import RecorderStats
+from gst_rec_app.services.recorder import (
+    GST_LAUNCH,
+    PipelineConfig,
+    Recorder,
+    build_pipeline,
+)
+
+logger = logging.getLogger(__name__)
+
+PREROLL_EXTENSION = "ts"
+TS_PACKET_SIZE = 188
+_READ_SIZE = TS_PACKET_SIZE * 7 * 64
+_IOV_MAX = 1024
+
+
+@dataclass
+class PrerollPolicy:
+    """Describes how much encoded stream each sensor keeps."""
+
+    enabled: bool = False
+    seconds: float = 10.0  # stream kept before a recording starts
+    max_bytes: int = 32 * 1024 * 1024  # memory cap per sensor
+    restart_interval: float = 5.0  # seconds between checks for exited encoders
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "PrerollPolicy":
+        """Build a policy from a settings dict, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in values.items() if k in known})
+
+
+class RingBuffer:
+    """Bounded queue of timestamped chunks.
+
+    The oldest chunks are evicted when the buffer holds more than
+    ``max_bytes`` or spans more than ``seconds``.
+
+    Parameters
+    ----------
+    seconds : float
+        Maximum age of the oldest chunk
+    max_bytes : int
+        Maximum total size of the chunks
+    """
+
+    def __init__(self, seconds: float, max_bytes: int) -> None:
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._chunks: Deque[Tuple[int, bytes]] = deque()
+
+    def append(self, chunk: bytes, now_ns: Optional[int] = None) -> None:
+        """Add a chunk, evicting the oldest ones beyond the bounds."""
+        now_ns = time.monotonic_ns() if now_ns is None else now_ns
+        self._chunks.append((now_ns, chunk))
+        self.size += len(chunk)
+        oldest = now_ns - int(self.seconds * 1e9)
+        while self._chunks and (
+            self.size > self.max_bytes or self._chunks[0][0] < oldest
+        ):
+            self.size -= len(self._chunks.popleft()[1])
+
+    @property
+    def oldest_ns(self) -> Optional[int]:
+        """Monotonic time of the oldest chunk, or None if empty."""
+        return self._chunks[0][0] if self._chunks else None
+
+    def flush(self, fd: int) -> int:
+        """Write all chunks to a file descriptor and empty the buffer.
+
+        Returns
+        -------
+        int
+            Bytes written
+        """
+        chunks: List[bytes] = [chunk for _, chunk in self._chunks]
+        for start in range(0, len(chunks), _IOV_MAX):
+            batch = chunks[start : start + _IOV_MAX]
+            total, written = sum(len(chunk) for chunk in batch), 0
+            while written < total:
+                written += os.writev(fd, _remaining(batch, written))
+        flushed = self.size
+        self.clear()
+        return flushed
+
+    def clear(self) -> None:
+        """Drop all chunks."""
+        self._chunks.clear()
+        self.size = 0
+
+
+def _remaining(chunks: List[bytes], offset: int) -> List[Any]:
+    """Get the parts of ``chunks`` after the first ``offset`` bytes."""
+    for index, chunk in enumerate(chunks):
+        if offset < len(chunk):
+            return [memoryview(chunk)[offset:], *chunks[index + 1 :]]
+        offset -= len(chunk)
+    return []
+
+
+class PrerollCapture:
+    """Runs a sensor's encoder continuously into a ring buffer or a file.
+
+    Parameters
+    ----------
+    config : PipelineConfig
+        Pipeline description of the sensor
+    backend : str
+        ``gst`` to encode with ``gst-launch-1.0``, ``fake`` for synthetic data
+    policy : PrerollPolicy
+        Buffer bounds
+    """
+
+    def __init__(self, config: PipelineConfig, backend: str, policy: PrerollPolicy):
+        self.config = replace(
+            config, extension=PREROLL_EXTENSION, segment_seconds=0, segment_bytes=0
+        )
+        self.backend = backend
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._buffer = RingBuffer(policy.seconds, policy.max_bytes)
+        self._output: Optional[BinaryIO] = None
+        self._written = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the encoder and the thread reading its stream.
+
+        Raises
+        ------
+        RuntimeError
+            If ``gst-launch-1.0`` is not available
+        """
+        self._running.set()
+        if self.backend == "fake":
+            target, args = self._generate, ()
+        else:
+            executable = shutil.which(GST_LAUNCH)
+            if not executable:
+                raise RuntimeError(f"{GST_LAUNCH} not found")
+            self._process = subprocess.Popen(
+                [executable, "-q", *build_pipeline(self.config, "", stream=True)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+            target, args = self._read, (self._process.stdout,)
+        self._thread = threading.Thread(
+            target=target, args=args, name="preroll-capture", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the encoder and drop the buffer."""
+        self._running.clear()
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._buffer.clear()
+
+    def is_alive(self) -> bool:
+        """Check whether the encoder is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def attach(self, output: BinaryIO) -> int:
+        """Flush the buffer into a file and append the live stream to it.
+
+        Parameters
+        ----------
+        output : BinaryIO
+            Unbuffered file opened for writing
+
+        Returns
+        -------
+        int
+            Monotonic time in nanoseconds at which the file's stream begins
+        """
+        with self._lock:
+            oldest_ns = self._buffer.oldest_ns
+            self._written = self._buffer.flush(output.fileno())
+            self._output = output
+        return oldest_ns if oldest_ns is not None else time.monotonic_ns()
+
+    def detach(self) -> None:
+        """Close the file and go back to buffering."""
+        with self._lock:
+            output, self._output = self._output, None
+        if output is not None:
+            output.close()
+
+    @property
+    def bytes_written(self) -> int:
+        """Bytes written to the attached file so far."""
+        return self._written
+
+    def _write(self, chunk: bytes) -> None:
+        """Route a chunk to the attached file or the buffer."""
+        with self._lock:
+            if self._output is not None:
+                self._output.write(chunk)
+                self._written += len(chunk)
+            else:
+                self._buffer.append(chunk)
+
+    def _read(self, stream: Any) -> None:
+        """Consume the encoder's stream until it exits."""
+        fd = stream.fileno()
+        while self._running.is_set():
+            chunk = os.read(fd, _READ_SIZE)
+            if not chunk:
+                break
+            self._write(chunk)
+        stream.close()
+
+    def _generate(self) -> None:
+        """Produce synthetic stream at the configured bitrate until stopped."""
+        interval = 1.0 / self.config.framerate
+        size = max(1, self.config.bitrate * 125 // self.config.framerate)
+        size += -size % TS_PACKET_SIZE
+        deadline = time.monotonic()
+        while self._running.is_set():
+            self._write(bytes(size))
+            deadline += interval
+            time.sleep(max(0.0, deadline - time.monotonic()))
+
+
+class PrerollRecorder(Recorder):
+    """Records from a running :class:`PrerollCapture`, starting with its buffer.
+
+    Parameters
+    ----------
+    capture : PrerollCapture
+        Capture of the sensor being recorded
+    """
+
+    def __init__(self, capture: PrerollCapture) -> None:
+        super().__init__(capture.config)
+        self.capture = capture
+
+    def start(self, location: str) -> None:
+        """Flush the pre-roll into ``location`` and keep appending to it."""
+        if not self.capture.is_alive():
+            raise RuntimeError("Pre-roll capture is not running")
+        self.location = location
+        self.started_ns = self.capture.attach(open(location, "wb", buffering=0))
+
+    def stop(self) -> None:
+        """Close the file; the capture goes on buffering."""
+        self.capture.detach()
+
+    def is_alive(self) -> bool:
+        """Check whether the capture is still running."""
+        return self.capture.is_alive()
+
+    def stats(self) -> RecorderStats:
+        """Get the bytes written, including the pre-roll."""
+        return RecorderStats(bytes_written=self.capture.bytes_written)
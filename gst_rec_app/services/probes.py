@@ -0,0 +1,385 @@
+"""Sensor health module.
+
+This module probes the devices behind the configured sensors: V4L2 video
+devices (``/dev/video*``), ALSA capture devices (``/proc/asound``) and the
+simulated IMU. A background poller probes all of them concurrently, each with a
+timeout, and keeps a snapshot with last-seen timestamps, frame rates and error
+counts, so the sensors endpoint never does device I/O itself.
+
+Video devices that are not configured as a sensor are reported as available.
+Point ``sensor_probe.device_dir`` and ``sensor_probe.asound_dir`` at fake
+directories to run without hardware.
+"""
+
+import fcntl
+import glob
+import logging
+import math
+import os
+import random
+import re
+import stat
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional
+
+from gst_rec_app.models.responses import SensorStatus
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.recorder import PipelineConfig
+from gst_rec_app.services.sensors import get_sensor_configs
+
+logger = logging.getLogger(__name__)
+
+CONNECTED = "Connected"
+DISCONNECTED = "Disconnected"
+AVAILABLE = "Available"
+UNKNOWN = "Unknown"
+
+# struct v4l2_capability and struct v4l2_streamparm from linux/videodev2.h
+_VIDIOC_QUERYCAP = 0x80685600
+_VIDIOC_G_PARM = 0xC0CC5615
+_V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+_V4L2_CAP_DEVICE_CAPS = 0x80000000
+_V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+_CAPABILITY = struct.Struct("16s32s32sIII3I")
+_STREAMPARM_SIZE = 204
+
+_ALSA_CARD_RE = re.compile(r"^hw:(?:CARD=)?([^,]+)")
+_VIDEO_NODE_RE = re.compile(r"^video(\d+)$")
+
+
+@dataclass
+class ProbeConfig:
+    """Describes how and how often sensors are probed."""
+
+    device_dir: str = "/dev"
+    asound_dir: str = "/proc/asound"
+    interval: float = 2.0  # seconds between probe rounds
+    timeout: float = 1.0  # seconds before a probe counts as failed
+    imu: bool = True  # report the simulated IMU if no IMU sensor is configured
+    imu_rate: float = 100.0  # simulated IMU sample rate in Hz
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "ProbeConfig":
+        """Build a config from a settings dict, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in values.items() if k in known})
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one device."""
+
+    fps: Optional[float] = None
+    value: Optional[float] = None
+
+
+def discover_video_devices(device_dir: str) -> List[str]:
+    """List the video device nodes in a device directory, in index order."""
+    devices = []
+    for path in glob.glob(os.path.join(device_dir, "video*")):
+        match = _VIDEO_NODE_RE.match(os.path.basename(path))
+        if match is not None:
+            devices.append((int(match.group(1)), path))
+    return [path for _, path in sorted(devices)]
+
+
+def probe_video(path: str) -> ProbeResult:
+    """Check that a video device can capture and read its frame rate.
+
+    Regular files (fake devices) only need to be readable.
+
+    Raises
+    ------
+    OSError
+        If the device is missing, busy or cannot capture
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        if not stat.S_ISCHR(os.fstat(fd).st_mode):
+            return ProbeResult()
+        capability = bytearray(_CAPABILITY.size)
+        fcntl.ioctl(fd, _VIDIOC_QUERYCAP, capability)
+        caps, device_caps = _CAPABILITY.unpack(capability)[4:6]
+        if caps & _V4L2_CAP_DEVICE_CAPS:
+            caps = device_caps
+        if not caps & _V4L2_CAP_VIDEO_CAPTURE:
+            raise OSError(f"{path} is not a capture device")
+
+        parm = bytearray(_STREAMPARM_SIZE)
+        struct.pack_into("I", parm, 0, _V4L2_BUF_TYPE_VIDEO_CAPTURE)
+        try:
+            fcntl.ioctl(fd, _VIDIOC_G_PARM, parm)
+        except OSError:
+            return ProbeResult()
+        numerator, denominator = struct.unpack_from("II", parm, 12)
+        return ProbeResult(fps=denominator / numerator if numerator else None)
+    finally:
+        os.close(fd)
+
+
+def list_capture_cards(asound_dir: str) -> Dict[str, int]:
+    """Map the ids and indexes of sound cards with a capture device to indexes."""
+    cards = {}
+    for path in glob.glob(os.path.join(asound_dir, "card[0-9]*")):
+        if not glob.glob(os.path.join(path, "pcm*c")):
+            continue
+        index = int(os.path.basename(path)[4:])
+        cards[str(index)] = index
+        try:
+            with open(os.path.join(path, "id")) as f:
+                cards[f.read().strip()] = index
+        except OSError:
+            pass
+    return cards
+
+
+def probe_audio(device: str, asound_dir: str) -> ProbeResult:
+    """Check that an ALSA device, e.g. ``default`` or ``hw:1,0``, can capture.
+
+    Raises
+    ------
+    OSError
+        If no matching capture device exists
+    """
+    cards = list_capture_cards(asound_dir)
+    match = _ALSA_CARD_RE.match(device)
+    if match is None:
+        if not cards:
+            raise OSError("No audio capture device")
+    elif match.group(1) not in cards:
+        raise OSError(f"No audio capture device {device}")
+    return ProbeResult()
+
+
+class SimulatedImu:
+    """Stand-in IMU reporting its sample rate and acceleration magnitude.
+
+    Parameters
+    ----------
+    rate : float
+        Nominal sample rate in Hz
+    """
+
+    def __init__(self, rate: float = 100.0) -> None:
+        self.rate = rate
+        self._last = time.monotonic()
+
+    def probe(self) -> ProbeResult:
+        """Count the samples produced since the last probe."""
+        now = time.monotonic()
+        elapsed, self._last = now - self._last, now
+        samples = elapsed * self.rate * random.uniform(0.98, 1.0)
+        accel = [random.gauss(0, 0.05), random.gauss(0, 0.05), random.gauss(9.81, 0.05)]
+        return ProbeResult(
+            fps=samples / elapsed if elapsed > 0 else None,
+            value=math.sqrt(sum(a * a for a in accel)),
+        )
+
+
+@dataclass
+class _Target:
+    """A device to probe and the sensor it is reported as."""
+
+    id: str
+    name: str
+    kind: str
+    device: Optional[str]
+    probe: Callable[[], ProbeResult]
+    configured: bool = True
+
+
+class SensorPoller:
+    """Probes sensors periodically in a background thread.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``sensors``, ``pipeline``,
+        ``recorder_backend`` and ``sensor_probe``
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=8)
+        self._statuses: Dict[str, SensorStatus] = {}
+        self._imus: Dict[str, SimulatedImu] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> List[SensorStatus]:
+        """Get the latest status of every sensor without probing.
+
+        Sensors that were not probed yet are reported as unknown.
+        """
+        self._ensure_running()
+        with self._lock:
+            statuses = dict(self._statuses)
+        if statuses:
+            return list(statuses.values())
+        return [
+            SensorStatus(name=sensor.name, status=UNKNOWN, id=sensor.id)
+            for sensor in get_sensor_configs(self.settings)
+        ]
+
+    def poll(self) -> None:
+        """Probe every sensor concurrently and update the snapshot."""
+        config = ProbeConfig.from_dict(self.settings.get("sensor_probe", {}))
+        targets = self._targets(config)
+        futures = {target.id: self._executor.submit(target.probe) for target in targets}
+        deadline = time.monotonic() + config.timeout
+        now = time.time()
+
+        statuses = {}
+        for target in targets:
+            with self._lock:
+                previous = self._statuses.get(target.id)
+            status = SensorStatus(
+                name=target.name,
+                status=CONNECTED if target.configured else AVAILABLE,
+                id=target.id,
+                kind=target.kind,
+                device=target.device,
+                last_seen=previous.last_seen if previous else None,
+                errors=previous.errors if previous else 0,
+            )
+            try:
+                timeout = max(0.0, deadline - time.monotonic())
+                result = futures[target.id].result(timeout)
+            except FutureTimeoutError:
+                status.status = DISCONNECTED
+                status.errors += 1
+                status.error = f"Probe timed out after {config.timeout}s"
+            except OSError as e:
+                status.status = DISCONNECTED
+                status.errors += 1
+                status.error = e.strerror or str(e)
+            else:
+                status.last_seen = now
+                status.fps = result.fps
+                status.value = result.value
+            statuses[target.id] = status
+
+        with self._lock:
+            self._statuses = statuses
+
+    def _targets(self, config: ProbeConfig) -> List[_Target]:
+        """Build the probes of the configured sensors and discovered devices."""
+        simulated = self.settings.get("recorder_backend") == "fake"
+        targets, devices, imus = [], set(), {}
+        for sensor in get_sensor_configs(self.settings):
+            pipeline = PipelineConfig.from_dict(
+                {**self.settings.get("pipeline", {}), **sensor.pipeline}
+            )
+            if pipeline.source == "imu":
+                imus[sensor.id] = pipeline.sample_rate
+                imu = self._imu_probe(sensor.id, pipeline.sample_rate)
+                targets.append(_Target(sensor.id, sensor.name, "imu", None, imu.probe))
+            elif simulated or pipeline.source == "test":
+                kind = "video" if pipeline.video else "audio"
+                targets.append(_Target(sensor.id, sensor.name, kind, None, ProbeResult))
+            elif pipeline.video:
+                device = _map_device(pipeline.video_device, config.device_dir)
+                devices.add(os.path.realpath(device))
+                targets.append(
+                    _Target(
+                        sensor.id,
+                        sensor.name,
+                        "video",
+                        pipeline.video_device,
+                        lambda device=device: probe_video(device),
+                    )
+                )
+            else:
+                device = pipeline.audio_device
+                targets.append(
+                    _Target(
+                        sensor.id,
+                        sensor.name,
+                        "audio",
+                        device,
+                        lambda device=device: probe_audio(device, config.asound_dir),
+                    )
+                )
+
+        for path in discover_video_devices(config.device_dir):
+            if os.path.realpath(path) not in devices:
+                name = os.path.basename(path)
+                targets.append(
+                    _Target(
+                        name,
+                        name,
+                        "video",
+                        path,
+                        lambda path=path: probe_video(path),
+                        configured=False,
+                    )
+                )
+
+        if config.imu and not imus:
+            imus["imu"] = config.imu_rate
+            imu = self._imu_probe("imu", config.imu_rate)
+            targets.append(_Target("imu", "IMU (simulated)", "imu", None, imu.probe))
+        self._imus = {key: self._imus[key] for key in imus}
+        return targets
+
+    def _imu_probe(self, sensor_id: str, rate: float) -> SimulatedImu:
+        """Get the simulated IMU of a sensor, keeping it between rounds."""
+        imu = self._imus.get(sensor_id)
+        if imu is None or imu.rate != rate:
+            imu = self._imus[sensor_id] = SimulatedImu(rate)
+        return imu
+
+    def _ensure_running(self) -> None:
+        """Start the poller thread if it is not running yet."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="sensor-poller", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Poll forever, sleeping ``interval`` seconds in between."""
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("Sensor polling failed: %s", e)
+            config = ProbeConfig.from_dict(self.settings.get("sensor_probe", {}))
+            time.sleep(config.interval)
+
+
+def _map_device(path: str, device_dir: str) -> str:
+    """Resolve a configured ``/dev`` path inside the probed device directory."""
+    if os.path.dirname(path) == "/dev":
+        return os.path.join(device_dir, os.path.basename(path))
+    return path
+
+
+_poller: Optional[SensorPoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_sensor_poller(settings: Settings) -> SensorPoller:
+    """Get the shared poller of a settings object.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings
+
+    Returns
+    -------
+    SensorPoller
+        Poller created once per process
+    """
+    global _poller
+    with _poller_lock:
+        if _poller is None or _poller.settings is not settings:
+            _poller = SensorPoller(settings)
+        return _poller
@@ -0,0 +1,529 @@
+"""Recorder backends module.
+
+This module defines the :class:`Recorder` interface used by the recording
+supervisor and its implementations: a ``gst-launch-1.0`` subprocess backend for
+real capture and an in-process fake backend for headless machines. Sensors
+with the ``imu`` source are always recorded by :class:`ImuRecorder`, which logs
+samples in the binary format of :mod:`gst_rec_app.services.imu`. That module
+needs numpy, so it is only imported once an IMU recorder is created.
+
+In segmenting mode the output location is a printf-style pattern (see
+:data:`SEGMENT_PATTERN`) and the recorder rotates to a new file every
+``segment_seconds`` or ``segment_bytes``, like ``splitmuxsink``.
+"""
+
+import os
+import re
+import shlex
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, fields, replace
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, cast
+
+from gst_rec_app.models.responses import RecorderStats
+from gst_rec_app.models.settings import Settings
+
+if TYPE_CHECKING:
+    from gst_rec_app.services.imu import ImuSource, SampleWriter
+
+GST_LAUNCH = "gst-launch-1.0"
+SEGMENT_PATTERN = "seg_%05d"
+
+_DROPPED_RE = re.compile(r'from element "([^"]+)" \(qos\).*dropped=\(guint64\)(\d+)')
+_LATENCY_RE = re.compile(r"latency,.*time=\(guint64\)(\d+)")
+
+
+@dataclass
+class PipelineConfig:
+    """Describes the capture pipeline to build.
+
+    ``source`` selects ``test`` stand-ins (videotestsrc/audiotestsrc), real
+    ``device`` sources (v4l2src/alsasrc) or an ``imu`` sample logger.
+    """
+
+    source: str = "device"
+    video: bool = True
+    audio: bool = True
+    video_device: str = "/dev/video0"
+    audio_device: str = "default"
+    width: int = 1280
+    height: int = 720
+    framerate: int = 30
+    bitrate: int = 4000  # kbit/s
+    extension: str = "mkv"
+    segment_seconds: int = 0  # 0 disables time-based rotation
+    segment_bytes: int = 0  # 0 disables size-based rotation
+    sample_rate: int = 1000  # IMU samples per second
+
+    @property
+    def segmented(self) -> bool:
+        """Check whether the output is split into rotating segments."""
+        return self.segment_seconds > 0 or self.segment_bytes > 0
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "PipelineConfig":
+        """Build a config from a settings dict, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in values.items() if k in known})
+
+
+class Recorder(ABC):
+    """Interface for a recording pipeline backend."""
+
+    def __init__(self, config: PipelineConfig) -> None:
+        self.config = config
+        self.location: Optional[str] = None
+        # Monotonic time of the first data written, if earlier than start()
+        self.started_ns: Optional[int] = None
+        self._segment_sizes: Dict[str, int] = {}
+
+    @abstractmethod
+    def start(self, location: str) -> None:
+        """Start recording to ``location``, blocking until the pipeline runs.
+
+        Raises
+        ------
+        RuntimeError
+            If the pipeline could not be brought up
+        """
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop recording and finalize the output file."""
+
+    @abstractmethod
+    def is_alive(self) -> bool:
+        """Check whether the pipeline is still running."""
+
+    @abstractmethod
+    def stats(self) -> RecorderStats:
+        """Get throughput statistics for the running pipeline."""
+
+    def _bytes_written(self) -> int:
+        """Get the size of the output file, or of all segments written so far.
+
+        Sizes of finished segments are cached, so only the segment being
+        written is stat'ed again, and segments deleted by the retention policy
+        still count towards the total.
+        """
+        if not self.location:
+            return 0
+        if not self.config.segmented:
+            try:
+                return os.stat(self.location).st_size
+            except OSError:
+                return 0
+
+        directory = os.path.dirname(self.location)
+        try:
+            names = sorted(
+                entry.name
+                for entry in os.scandir(directory)
+                if entry.name.endswith(f".{self.config.extension}")
+            )
+        except OSError:
+            return sum(self._segment_sizes.values())
+        for name in names[:-1]:
+            if name not in self._segment_sizes:
+                self._segment_sizes[name] = _file_size(os.path.join(directory, name))
+        current = _file_size(os.path.join(directory, names[-1])) if names else 0
+        return sum(self._segment_sizes.values()) + current
+
+
+def _file_size(path: str) -> int:
+    """Get the size of a file, or 0 if it vanished."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def build_pipeline(
+    config: PipelineConfig, location: str, stream: bool = False
+) -> List[str]:
+    """Build ``gst-launch-1.0`` arguments for the given config.
+
+    Parameters
+    ----------
+    config : PipelineConfig
+        Pipeline description
+    location : str
+        Output file path, or segment pattern if ``config.segmented``
+    stream : bool
+        Write MPEG-TS to stdout instead of ``location``, for pre-roll
+
+    Returns
+    -------
+    List[str]
+        Pipeline description split into launch arguments
+    """
+    test = config.source == "test"
+    video_pad, audio_pad = "mux.", "mux."
+    if config.segmented and not stream:
+        video_pad, audio_pad = "mux.video", "mux.audio_0"
+    branches = []
+    if config.video:
+        src = (
+            "videotestsrc is-live=true"
+            if test
+            else f"v4l2src device={shlex.quote(config.video_device)}"
+        )
+        caps = (
+            f"video/x-raw,width={config.width},height={config.height},"
+            f"framerate={config.framerate}/1"
+        )
+        branches.append(
+            f"{src} ! videoconvert ! videoscale ! videorate ! {caps} ! "
+            f"x264enc tune=zerolatency speed-preset=veryfast "
+            f"bitrate={config.bitrate} key-int-max={config.framerate * 2} ! "
+            f"h264parse ! queue ! {video_pad}"
+        )
+    if config.audio:
+        src = (
+            "audiotestsrc is-live=true wave=ticks"
+            if test
+            else f"alsasrc device={shlex.quote(config.audio_device)}"
+        )
+        branches.append(
+            f"{src} ! audioconvert ! audioresample ! opusenc ! queue ! {audio_pad}"
+        )
+    if not branches:
+        raise ValueError("Pipeline needs at least one of video or audio")
+
+    if stream:
+        sink = "mpegtsmux name=mux alignment=7 ! fdsink fd=1"
+    elif config.segmented:
+        sink = (
+            f"splitmuxsink name=mux location={shlex.quote(location)} "
+            f"muxer-factory=matroskamux "
+            f"max-size-time={config.segment_seconds * 1_000_000_000} "
+            f"max-size-bytes={config.segment_bytes}"
+        )
+    else:
+        sink = f"matroskamux name=mux ! filesink location={shlex.quote(location)}"
+    return shlex.split(" ".join([sink] + branches))
+
+
+class GstLaunchRecorder(Recorder):
+    """Runs the pipeline as a ``gst-launch-1.0`` subprocess.
+
+    The process is started with ``-e`` so an interrupt sends EOS and the muxer
+    finalizes the file. Bus messages (``-m``) are parsed for QoS drop counts and
+    the latency tracer output for end-to-end pipeline latency.
+
+    Parameters
+    ----------
+    config : PipelineConfig
+        Pipeline description
+    start_timeout : float
+        Seconds to wait for the pipeline to reach PLAYING
+    stop_timeout : float
+        Seconds to wait for EOS before killing the process
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        start_timeout: float = 10.0,
+        stop_timeout: float = 10.0,
+    ) -> None:
+        super().__init__(config)
+        self.start_timeout = start_timeout
+        self.stop_timeout = stop_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._playing = threading.Event()
+        self._dropped: Dict[str, int] = {}
+        self._latency_ms: Optional[float] = None
+        self._errors: Deque[str] = deque(maxlen=20)
+
+    def start(self, location: str) -> None:
+        """Launch the pipeline subprocess and wait for it to play."""
+        executable = shutil.which(GST_LAUNCH)
+        if not executable:
+            raise RuntimeError(f"{GST_LAUNCH} not found")
+
+        env = dict(os.environ, GST_TRACERS="latency", GST_DEBUG="GST_TRACER:7")
+        self.location = location
+        self._process = subprocess.Popen(
+            [executable, "-e", "-m", *build_pipeline(self.config, location)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            universal_newlines=True,
+        )
+        for stream in (self._process.stdout, self._process.stderr):
+            threading.Thread(
+                target=self._read_output, args=(stream,), daemon=True
+            ).start()
+
+        deadline = time.monotonic() + self.start_timeout
+        while not self._playing.wait(0.05):
+            if self._process.poll() is not None or time.monotonic() > deadline:
+                self._kill()
+                raise RuntimeError(
+                    "Pipeline failed to start: "
+                    + ("; ".join(self._errors) or "timed out")
+                )
+
+    def stop(self) -> None:
+        """Send EOS via SIGINT and wait for the file to be finalized."""
+        if self._process is None or self._process.poll() is not None:
+            return
+        self._process.send_signal(signal.SIGINT)
+        try:
+            self._process.wait(self.stop_timeout)
+        except subprocess.TimeoutExpired:
+            self._kill()
+            raise RuntimeError("Pipeline did not finish on EOS, killed")
+
+    def is_alive(self) -> bool:
+        """Check whether the subprocess is still running."""
+        return self._process is not None and self._process.poll() is None
+
+    def stats(self) -> RecorderStats:
+        """Get file size, QoS drop count and last tracer latency."""
+        return RecorderStats(
+            bytes_written=self._bytes_written(),
+            frames_dropped=sum(self._dropped.values()),
+            latency_ms=self._latency_ms,
+        )
+
+    def _kill(self) -> None:
+        """Kill the subprocess without waiting for EOS."""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+    def _read_output(self, stream: Any) -> None:
+        """Consume a subprocess output stream and update statistics."""
+        for line in stream:
+            if "Setting pipeline to PLAYING" in line:
+                self._playing.set()
+            elif "latency," in line:
+                match = _LATENCY_RE.search(line)
+                if match:
+                    self._latency_ms = int(match.group(1)) / 1e6
+            elif "(qos)" in line:
+                match = _DROPPED_RE.search(line)
+                if match:
+                    self._dropped[match.group(1)] = int(match.group(2))
+            elif "ERROR" in line:
+                self._errors.append(line.strip())
+        stream.close()
+
+
+class FakeRecorder(Recorder):
+    """In-process recorder that writes synthetic frames.
+
+    Frames of ``bitrate / framerate`` bytes are written at the configured
+    framerate from a background thread, so the whole recording flow can be
+    exercised without GStreamer or capture hardware. Frames whose deadline has
+    already passed are counted as dropped rather than written late. In
+    segmenting mode the writer rotates files at frame boundaries.
+    """
+
+    def __init__(self, config: PipelineConfig) -> None:
+        super().__init__(config)
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._bytes = 0
+        self._dropped = 0
+        self._latency_ms: Optional[float] = None
+
+    def start(self, location: str) -> None:
+        """Open the output file and start the frame writer thread."""
+        self.location = location
+        output = open(self._segment_path(0), "wb")
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._write_frames, args=(output,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the frame writer and close the output file."""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+
+    def is_alive(self) -> bool:
+        """Check whether the frame writer is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> RecorderStats:
+        """Get written bytes, dropped frames and last write latency."""
+        return RecorderStats(
+            bytes_written=self._bytes,
+            frames_dropped=self._dropped,
+            latency_ms=self._latency_ms,
+        )
+
+    def _segment_path(self, index: int) -> str:
+        """Get the output path of a segment."""
+        return self.location % index if self.config.segmented else self.location
+
+    def _write_frames(self, output: Any) -> None:
+        """Write frames on schedule until stopped."""
+        config = self.config
+        interval = 1.0 / config.framerate
+        frame = bytes(max(1, config.bitrate * 125 // config.framerate))
+        deadline = segment_start = time.monotonic()
+        segment, segment_bytes = 0, 0
+        try:
+            while self._running.is_set():
+                now = time.monotonic()
+                if now - deadline > interval:
+                    missed = int((now - deadline) / interval)
+                    self._dropped += missed
+                    deadline += missed * interval
+                if config.segmented and (
+                    (
+                        config.segment_seconds
+                        and now - segment_start >= config.segment_seconds
+                    )
+                    or (config.segment_bytes and segment_bytes >= config.segment_bytes)
+                ):
+                    output.close()
+                    segment, segment_bytes, segment_start = segment + 1, 0, now
+                    output = open(self._segment_path(segment), "wb")
+                output.write(frame)
+                segment_bytes += len(frame)
+                self._bytes += len(frame)
+                self._latency_ms = (time.monotonic() - deadline) * 1e3
+                deadline += interval
+                time.sleep(max(0.0, deadline - time.monotonic()))
+        finally:
+            output.close()
+
+
+class ImuRecorder(Recorder):
+    """Logs IMU samples to a binary sample file.
+
+    Samples are pulled from the source in batches every ``batch_interval``
+    seconds and appended as raw records, so the cost per batch does not
+    depend on the sample rate. Only the simulated source exists so far.
+
+    Parameters
+    ----------
+    config : PipelineConfig
+        Pipeline description providing ``sample_rate``
+    batch_interval : float
+        Seconds between two batches
+    """
+
+    def __init__(self, config: PipelineConfig, batch_interval: float = 0.02) -> None:
+        super().__init__(config)
+        self.batch_interval = batch_interval
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._writer: Optional["SampleWriter"] = None
+        self._dropped = 0
+        self._latency_ms: Optional[float] = None
+
+    def start(self, location: str) -> None:
+        """Create the sample file and start the logger thread."""
+        from gst_rec_app.services.imu import SampleWriter, SimulatedImuSource
+
+        self.location = location
+        self._writer = SampleWriter(location, self.config.sample_rate)
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._log_samples,
+            args=(SimulatedImuSource(self.config.sample_rate),),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the logger and close the sample file."""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+
+    def is_alive(self) -> bool:
+        """Check whether the logger is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> RecorderStats:
+        """Get written bytes, dropped samples and the age of the last batch."""
+        return RecorderStats(
+            bytes_written=self._writer.bytes_written if self._writer else 0,
+            frames_dropped=self._dropped,
+            latency_ms=self._latency_ms,
+        )
+
+    def _log_samples(self, source: "ImuSource") -> None:
+        """Append batches of samples until stopped.
+
+        Gaps of more than one sample period between batches count as dropped
+        samples.
+        """
+        writer = cast("SampleWriter", self._writer)
+        period_ns = 1e9 / source.rate
+        last_ns: Optional[int] = None
+        try:
+            while self._running.is_set():
+                batch = source.read()
+                if len(batch):
+                    first_ns, newest_ns = int(batch["t_ns"][0]), int(batch["t_ns"][-1])
+                    if last_ns is not None:
+                        self._dropped += max(
+                            0, round((first_ns - last_ns) / period_ns) - 1
+                        )
+                    last_ns = newest_ns
+                    writer.append(batch)
+                    self._latency_ms = (time.time_ns() - newest_ns) / 1e6
+                time.sleep(self.batch_interval)
+        finally:
+            writer.close()
+
+
+BACKENDS = {"gst": GstLaunchRecorder, "fake": FakeRecorder}
+
+
+def create_recorder(
+    settings: Settings, pipeline: Optional[Dict[str, Any]] = None
+) -> Recorder:
+    """Create the recorder backend selected in settings.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings; ``recorder_backend`` selects the backend and
+        ``pipeline`` holds :class:`PipelineConfig` overrides. IMU sensors use
+        :class:`ImuRecorder` with any backend
+    pipeline : Dict[str, Any], optional
+        Per-sensor overrides applied on top of the ``pipeline`` setting
+
+    Returns
+    -------
+    Recorder
+        A new, not yet started recorder
+
+    Raises
+    ------
+    ValueError
+        If the configured backend is unknown
+    """
+    backend = settings.get("recorder_backend", "gst")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown recorder backend: {backend}")
+    config = PipelineConfig.from_dict(
+        {
+            **settings.get("pipeline", {}),
+            **(pipeline or {}),
+        }
+    )
+    if config.source == "imu":
+        from gst_rec_app.services.imu import IMU_EXTENSION
+
+        # Sample files are small and read by timestamp, so they are never split
+        return ImuRecorder(
+            replace(config, extension=IMU_EXTENSION, segment_seconds=0, segment_bytes=0)
+        )
+    return BACKENDS[backend](config)
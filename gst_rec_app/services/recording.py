@@ -2,29 +2,826 @@
 
 This module provides functions for controlling and monitoring the recording process.
 It includes functionality to start/stop recordings and check recording status.
+
+Every sensor has its own :class:`RecordingSupervisor` owning its pipeline in a
+background thread, so the request thread only enqueues a transition and returns
+a state token that clients can poll through the status endpoint. Sensors that
+record at the same time share a :class:`RecordingSession`, whose manifest holds
+the common base timestamp used to align the files afterwards.
 """
 
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
 import time
-from typing import Dict
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from gst_rec_app.models.responses import ApiResponse
+from gst_rec_app.models.responses import (
+    RecordingJob,
+    RecordingStatus,
+    SessionJob,
+    SessionStatus,
+)
 from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.control import control
+from gst_rec_app.services.events import bus
+from gst_rec_app.services.index import MANIFEST_NAME, get_index
+from gst_rec_app.services.ipc import DaemonClient, get_client
+from gst_rec_app.services.ownership import acquire_ownership
+from gst_rec_app.services.postprocess import get_job_queue, postprocess_recording
+from gst_rec_app.services.preroll import PrerollCapture, PrerollPolicy, PrerollRecorder
+from gst_rec_app.services.recorder import (
+    SEGMENT_PATTERN,
+    PipelineConfig,
+    Recorder,
+    create_recorder,
+)
+from gst_rec_app.services.retention import RetentionGuard
+from gst_rec_app.services.sensors import (
+    SensorConfig,
+    check_selection,
+    get_sensor_configs,
+    select_sensors,
+)
+
+IDLE = "idle"
+STARTING = "starting"
+RECORDING = "recording"
+STOPPING = "stopping"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingSupervisor:
+    """Owns the recording pipeline lifecycle in a background thread.
+
+    ``start`` and ``stop`` never block on the pipeline: they validate the
+    transition, update the state token and hand the work to the supervisor
+    thread. ``status`` only reads a few attributes under a lock that is never
+    held while the pipeline is being launched or torn down.
+
+    While recording, the supervisor thread also watches the recorder, samples
+    its throughput and moves to ``failed`` if the pipeline exits on its own.
+
+    Parameters
+    ----------
+    sensor : str, optional
+        Id of the sensor this supervisor records
+    on_transition : Callable[[str, str], None], optional
+        Called from the supervisor thread with the sensor id and the new state
+        whenever the pipeline settles in ``recording``, ``idle`` or ``failed``
+    watch_interval : float
+        Seconds between liveness checks of a running pipeline
+    """
+
+    def __init__(
+        self,
+        sensor: Optional[str] = None,
+        on_transition: Optional[Callable[[str, str], None]] = None,
+        watch_interval: float = 1.0,
+    ) -> None:
+        self.sensor = sensor
+        self.on_transition = on_transition
+        self.watch_interval = watch_interval
+        self._recorder: Optional[Recorder] = None
+        self._location: Optional[str] = None
+        self._lock = threading.Lock()
+        self._commands: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._state = IDLE
+        self._job_id: Optional[str] = None
+        self._error: Optional[str] = None
+        self._since = time.time()
+        self._throughput: Optional[float] = None
+        self._sample: Optional[Tuple[float, int]] = None
+
+    @property
+    def is_active(self) -> bool:
+        """Check whether a pipeline is starting, running or stopping."""
+        return self._state in (STARTING, RECORDING, STOPPING)
+
+    @property
+    def recorder(self) -> Optional[Recorder]:
+        """Recorder of the current or last recording."""
+        with self._lock:
+            return self._recorder
+
+    def start(self, recorder: Recorder, location: str) -> RecordingJob:
+        """Request the pipeline to start.
+
+        Parameters
+        ----------
+        recorder : Recorder
+            Recorder backend that will own the pipeline
+        location : str
+            Output file path
+
+        Returns
+        -------
+        RecordingJob
+            The accepted transition, or an error if a recording is active
+        """
+        with self._lock:
+            if self.is_active:
+                return self._job("error", f"Recording is {self._state}")
+            self._job_id = uuid.uuid4().hex
+            self._recorder = recorder
+            self._location = location
+            self._error = None
+            self._throughput = None
+            self._sample = None
+            self._set_state(STARTING)
+            job = self._job("success", "Recording starting")
+        self._submit("start", job.job_id)
+        return job
+
+    def stop(self) -> RecordingJob:
+        """Request the pipeline to stop.
+
+        A stop issued while the pipeline is still starting is queued behind the
+        start, so the recording is torn down as soon as it comes up.
+
+        Returns
+        -------
+        RecordingJob
+            The accepted transition, or an error if nothing is recording
+        """
+        with self._lock:
+            if self._state not in (STARTING, RECORDING):
+                return self._job("error", "No recording in progress")
+            self._set_state(STOPPING)
+            job = self._job("success", "Recording stopping")
+        self._submit("stop", job.job_id)
+        return job
+
+    def status(self) -> RecordingStatus:
+        """Get a snapshot of the current state.
+
+        Returns
+        -------
+        RecordingStatus
+            Current state token, the job it belongs to and pipeline statistics
+        """
+        with self._lock:
+            status = RecordingStatus(
+                is_recording=self._state == RECORDING,
+                state=self._state,
+                job_id=self._job_id,
+                error=self._error,
+                since=self._since,
+                path=self._location,
+                sensor=self.sensor,
+                throughput=self._throughput,
+            )
+            recorder = self._recorder
+        if recorder is not None:
+            status.stats = recorder.stats()
+        return status
+
+    def _job(self, status: str, message: str) -> RecordingJob:
+        """Describe the current job. Must be called with the lock held."""
+        return RecordingJob(
+            status=status,
+            message=message,
+            state=self._state,
+            job_id=self._job_id,
+            sensor=self.sensor,
+        )
+
+    def _set_state(self, state: str) -> None:
+        """Update the state token. Must be called with the lock held."""
+        self._state = state
+        self._since = time.time()
+
+    def _submit(self, command: str, job_id: str) -> None:
+        """Queue a command for the supervisor thread, starting it if needed."""
+        self._commands.put((command, job_id))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"recording-supervisor-{self.sensor}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Process queued transitions one at a time."""
+        while True:
+            try:
+                command, job_id = self._commands.get(timeout=self.watch_interval)
+            except queue.Empty:
+                self._watch()
+                continue
+
+            with self._lock:
+                recorder, location = self._recorder, self._location
+            try:
+                if command == "start":
+                    os.makedirs(os.path.dirname(location), exist_ok=True)
+                    recorder.start(location)
+                else:
+                    recorder.stop()
+            except Exception as e:
+                with self._lock:
+                    if self._job_id != job_id:
+                        continue
+                    self._error = f"Failed to {command} recording: {e}"
+                    self._set_state(FAILED)
+                self._notify(FAILED)
+                continue
+
+            with self._lock:
+                if self._job_id != job_id:
+                    continue
+                if command == "start" and self._state == STARTING:
+                    self._set_state(RECORDING)
+                elif command == "stop":
+                    self._set_state(IDLE)
+                else:
+                    continue
+                state = self._state
+            self._notify(state)
+
+    def _watch(self) -> None:
+        """Sample throughput and flag a pipeline that exited on its own."""
+        with self._lock:
+            recorder = self._recorder
+            if self._state != RECORDING or recorder is None:
+                return
+        if not recorder.is_alive():
+            with self._lock:
+                if self._recorder is not recorder or self._state != RECORDING:
+                    return
+                self._error = "Pipeline exited unexpectedly"
+                self._set_state(FAILED)
+            self._notify(FAILED)
+            return
+
+        now, written = time.monotonic(), recorder.stats().bytes_written
+        with self._lock:
+            if self._sample is not None and now > self._sample[0]:
+                self._throughput = (written - self._sample[1]) / (now - self._sample[0])
+            self._sample = (now, written)
+
+    def _notify(self, state: str) -> None:
+        """Report a settled state to the transition listener."""
+        if self.on_transition is not None:
+            self.on_transition(self.sensor, state)
+
+
+class RecordingSession:
+    """A set of sensor recordings that share a base timestamp.
+
+    The manifest (``session.json`` in the session directory) records the wall
+    clock base time and, per sensor, the output file and the offsets at which
+    its pipeline started and stopped relative to that base. All offsets come
+    from the same monotonic clock, so files from different pipeline processes
+    can be aligned afterwards.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding the session's recordings
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.name = os.path.basename(directory)
+        self.base_time_ns = time.time_ns()
+        self._base_monotonic_ns = time.monotonic_ns()
+        self._lock = threading.Lock()
+        self._manifest: Dict = {
+            "session": self.name,
+            "base_time_ns": self.base_time_ns,
+            "sensors": {},
+        }
+
+    def add(self, sensor: SensorConfig, location: str) -> None:
+        """Register a sensor recording in the session."""
+        with self._lock:
+            self._manifest["sensors"][sensor.id] = {
+                "name": sensor.name,
+                "path": os.path.relpath(location, self.directory),
+            }
+
+    def mark(self, sensor_id: str, event: str, at_ns: Optional[int] = None) -> None:
+        """Record the offset of a sensor event and persist the manifest.
+
+        Parameters
+        ----------
+        sensor_id : str
+            Sensor the event belongs to
+        event : str
+            Event name, stored as ``<event>_offset_ns``
+        at_ns : int, optional
+            Monotonic time of the event if not now, e.g. the start of a
+            recording's pre-roll; the offset is negative if before the base
+        """
+        at_ns = time.monotonic_ns() if at_ns is None else at_ns
+        offset = at_ns - self._base_monotonic_ns
+        with self._lock:
+            sensor = self._manifest["sensors"].setdefault(sensor_id, {})
+            sensor[f"{event}_offset_ns"] = offset
+            self._write()
+
+    def _write(self) -> None:
+        """Atomically replace the manifest file. Must be called with the lock held."""
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._manifest, f, indent=4)
+        os.replace(tmp_path, path)
+
+
+class RecordingManager:
+    """Runs one recording pipeline per sensor.
+
+    Sensors can be started and stopped individually or by group. Starting a
+    sensor while no pipeline is active opens a new :class:`RecordingSession`;
+    sensors started while others are still recording join that session. The
+    first start also brings up the :class:`RetentionGuard` that keeps segmented
+    recordings from filling the disk. With pre-roll enabled, sensors with a
+    running :class:`PrerollCapture` record from it instead of a new pipeline.
+
+    Parameters
+    ----------
+    watch_interval : float
+        Seconds between liveness checks of running pipelines
+    """
+
+    def __init__(self, watch_interval: float = 1.0) -> None:
+        self.watch_interval = watch_interval
+        self._lock = threading.Lock()
+        self._supervisors: Dict[str, RecordingSupervisor] = {}
+        self._session: Optional[RecordingSession] = None
+        self._retention: Optional[RetentionGuard] = None
+        self._settings: Optional[Settings] = None
+        self._captures: Dict[str, PrerollCapture] = {}
+        self._preroll_stop = threading.Event()
+        self._preroll_thread: Optional[threading.Thread] = None
+
+    def start_preroll(self, settings: Settings) -> None:
+        """Start the pre-roll captures and a watchdog restarting exited ones.
+
+        Called once at startup by the process that owns the recordings; does
+        nothing while the watchdog is running, or unless ``preroll`` is
+        enabled in settings. IMU and segmented sensors are not pre-rolled.
+
+        Parameters
+        ----------
+        settings : Settings
+            Application settings providing ``preroll``, sensors and backend
+        """
+        if not PrerollPolicy.from_dict(settings.get("preroll", {})).enabled:
+            return
+        with self._lock:
+            if self._preroll_thread is not None and self._preroll_thread.is_alive():
+                return
+            self._preroll_stop.clear()
+            self._preroll_thread = threading.Thread(
+                target=self._watch_preroll,
+                args=(settings,),
+                name="preroll-watchdog",
+                daemon=True,
+            )
+            self._preroll_thread.start()
+
+    def close_preroll(self) -> None:
+        """Stop the watchdog and every pre-roll capture."""
+        self._preroll_stop.set()
+        with self._lock:
+            thread, self._preroll_thread = self._preroll_thread, None
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            captures, self._captures = list(self._captures.values()), {}
+        for capture in captures:
+            capture.close()
+
+    def _watch_preroll(self, settings: Settings) -> None:
+        """Keep every eligible sensor's capture running until closed."""
+        failing: Set[str] = set()
+        while True:
+            policy = PrerollPolicy.from_dict(settings.get("preroll", {}))
+            if policy.enabled:
+                self._restart_captures(settings, policy, failing)
+            if self._preroll_stop.wait(policy.restart_interval):
+                return
+
+    def _restart_captures(
+        self, settings: Settings, policy: PrerollPolicy, failing: Set[str]
+    ) -> None:
+        """Start the capture of every eligible sensor that has none running.
+
+        An exited capture is closed, reaping its encoder, before it is
+        replaced. A sensor whose capture cannot start is logged once, until
+        its capture starts again.
+        """
+        backend = settings.get("recorder_backend", "gst")
+        for sensor in get_sensor_configs(settings):
+            config = PipelineConfig.from_dict(
+                {**settings.get("pipeline", {}), **sensor.pipeline}
+            )
+            if config.source == "imu" or config.segmented:
+                continue
+            with self._lock:
+                old = self._captures.pop(sensor.id, None)
+                if old is not None and old.is_alive():
+                    self._captures[sensor.id] = old
+                    continue
+            if old is not None:
+                old.close()
+            capture = PrerollCapture(config, backend, policy)
+            try:
+                capture.start()
+            except (OSError, RuntimeError) as e:
+                if sensor.id not in failing:
+                    logger.warning("Could not start pre-roll of %s: %s", sensor.id, e)
+                failing.add(sensor.id)
+                continue
+            failing.discard(sensor.id)
+            with self._lock:
+                if not self._preroll_stop.is_set():
+                    self._captures[sensor.id] = capture
+                    continue
+            # Closed while starting
+            capture.close()
+            return
+
+    def start(
+        self,
+        settings: Settings,
+        sensor_ids: Optional[List[str]] = None,
+        group: Optional[str] = None,
+    ) -> SessionJob:
+        """Request the selected sensors to start recording.
+
+        Parameters
+        ----------
+        settings : Settings
+            Application settings providing sensors, backend and output path
+        sensor_ids : List[str], optional
+            Sensors to start
+        group : str, optional
+            Sensor group to start; all sensors if neither ids nor group are given
+
+        Returns
+        -------
+        SessionJob
+            One job per selected sensor
+
+        Raises
+        ------
+        ValueError
+            If a sensor, group or recorder backend does not exist
+        """
+        sensors = select_sensors(get_sensor_configs(settings), sensor_ids, group)
+        with self._lock:
+            recorders = {
+                sensor.id: self._recorder(settings, sensor) for sensor in sensors
+            }
+            self._settings = settings
+            if self._retention is None:
+                self._retention = RetentionGuard(settings)
+            self._retention.ensure_running()
+            if self._session is None or not self._any_active():
+                self._session = RecordingSession(get_session_directory(settings))
+            session = self._session
+            jobs = []
+            for sensor in sensors:
+                recorder = recorders[sensor.id]
+                location = get_sensor_location(session.directory, sensor.id, recorder)
+                supervisor = self._supervisor(sensor.id)
+                job = supervisor.start(recorder, location)
+                if job.status == "success":
+                    session.add(sensor, location)
+                jobs.append(job)
+        bus.notify("status")
+        return _session_job(session.name, jobs, "starting")
+
+    def stop(
+        self,
+        settings: Settings,
+        sensor_ids: Optional[List[str]] = None,
+        group: Optional[str] = None,
+    ) -> SessionJob:
+        """Request the selected sensors to stop recording.
+
+        Parameters
+        ----------
+        settings : Settings
+            Application settings providing sensors
+        sensor_ids : List[str], optional
+            Sensors to stop
+        group : str, optional
+            Sensor group to stop; all active sensors if neither is given
+
+        Returns
+        -------
+        SessionJob
+            One job per selected sensor
+
+        Raises
+        ------
+        ValueError
+            If a sensor or group does not exist
+        """
+        with self._lock:
+            if sensor_ids or group:
+                configs = get_sensor_configs(settings)
+                selected = [s.id for s in select_sensors(configs, sensor_ids, group)]
+            else:
+                selected = [
+                    sensor_id
+                    for sensor_id, supervisor in self._supervisors.items()
+                    if supervisor.is_active
+                ]
+            jobs = [self._supervisor(sensor_id).stop() for sensor_id in selected]
+            session = self._session
+        bus.notify("status")
+        return _session_job(session.name if session else None, jobs, "stopping")
+
+    def status(self, sensor_ids: Optional[List[str]] = None) -> SessionStatus:
+        """Get the state of every sensor in the current session.
+
+        Parameters
+        ----------
+        sensor_ids : List[str], optional
+            Configured sensors to report as idle if they never recorded
+
+        Returns
+        -------
+        SessionStatus
+            Aggregate state and per-sensor state and throughput
+        """
+        with self._lock:
+            supervisors = dict(self._supervisors)
+            session = self._session
+
+        statuses = [supervisor.status() for supervisor in supervisors.values()]
+        statuses.extend(
+            RecordingStatus(is_recording=False, state=IDLE, sensor=sensor_id)
+            for sensor_id in sensor_ids or []
+            if sensor_id not in supervisors
+        )
+        states = {status.state for status in statuses}
+        state = next(
+            (s for s in (STARTING, STOPPING, RECORDING, FAILED) if s in states), IDLE
+        )
+        return SessionStatus(
+            is_recording=RECORDING in states,
+            state=state,
+            session=session.name if session else None,
+            base_time_ns=session.base_time_ns if session else None,
+            sensors=statuses,
+        )
+
+    def wait_idle(self, timeout: float = 30.0) -> bool:
+        """Wait until no pipeline is starting, running or stopping.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum seconds to wait
+
+        Returns
+        -------
+        bool
+            Whether all pipelines settled in time
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._any_active():
+                    return True
+            time.sleep(0.1)
+        return False
+
+    def _supervisor(self, sensor_id: str) -> RecordingSupervisor:
+        """Get or create the supervisor of a sensor. Must be called with the lock held."""
+        if sensor_id not in self._supervisors:
+            self._supervisors[sensor_id] = RecordingSupervisor(
+                sensor=sensor_id,
+                on_transition=self._on_transition,
+                watch_interval=self.watch_interval,
+            )
+        return self._supervisors[sensor_id]
+
+    def _recorder(self, settings: Settings, sensor: SensorConfig) -> Recorder:
+        """Create the recorder of a sensor. Must be called with the lock held.
+
+        Sensors with a running pre-roll capture that is not already recording
+        record from it.
+        """
+        capture = self._captures.get(sensor.id)
+        supervisor = self._supervisors.get(sensor.id)
+        if (
+            capture is not None
+            and capture.is_alive()
+            and not (supervisor is not None and supervisor.is_active)
+        ):
+            return PrerollRecorder(capture)
+        return create_recorder(settings, sensor.pipeline)
+
+    def _any_active(self) -> bool:
+        """Check whether any sensor is recording. Must be called with the lock held."""
+        return any(supervisor.is_active for supervisor in self._supervisors.values())
+
+    def _on_transition(self, sensor_id: str, state: str) -> None:
+        """Record sensor offsets, index finalized recordings and push the state.
+
+        Recordings that stopped cleanly are queued for post-processing.
+        """
+        bus.notify("status")
+        with self._lock:
+            session, settings = self._session, self._settings
+            supervisor = self._supervisors.get(sensor_id)
+        if session is None:
+            return
+        recorder = supervisor.recorder if supervisor is not None else None
+        event = {RECORDING: "started", IDLE: "stopped", FAILED: "failed"}[state]
+        at_ns = recorder.started_ns if recorder and state == RECORDING else None
+        session.mark(sensor_id, event, at_ns)
+        if state != RECORDING:
+            root = os.path.dirname(session.directory)
+            get_index(root).refresh_session(session.directory)
+            bus.publish("recording", {"session": session.name, "sensor": sensor_id})
+        if state == IDLE and settings is not None and recorder is not None:
+            try:
+                postprocess_recording(settings, recorder)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Could not queue post-processing: %s", e)
+
+
+def _session_job(
+    session: Optional[str], jobs: List[RecordingJob], action: str
+) -> SessionJob:
+    """Summarize per-sensor jobs into a session response."""
+    accepted = [job for job in jobs if job.status == "success"]
+    if accepted:
+        return SessionJob(
+            status="success",
+            message=f"Recording {action} for {len(accepted)} sensor(s)",
+            session=session,
+            jobs=jobs,
+        )
+    messages = sorted({job.message for job in jobs})
+    return SessionJob(
+        status="error",
+        message="; ".join(messages) or "No recording in progress",
+        session=session,
+        jobs=jobs,
+    )
+
+
+manager = RecordingManager()
+
+
+def get_session_directory(settings: Settings) -> str:
+    """Create a timestamped session directory under the recordings directory.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path``
+
+    Returns
+    -------
+    str
+        Directory path for a new recording session
+    """
+    directory = settings.get("default_path") or str(Path.home())
+    base = os.path.join(directory, datetime.now().strftime("rec_%Y%m%d_%H%M%S"))
+    path, suffix = base, 1
+    while True:
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:
+            path, suffix = f"{base}_{suffix}", suffix + 1
+
+
+def get_sensor_location(directory: str, sensor_id: str, recorder: Recorder) -> str:
+    """Get the output location of a sensor inside a session directory.
+
+    Parameters
+    ----------
+    directory : str
+        Session directory
+    sensor_id : str
+        Sensor being recorded
+    recorder : Recorder
+        Recorder that will write the output
+
+    Returns
+    -------
+    str
+        ``<sensor>.<ext>``, or ``<sensor>/seg_%05d.<ext>`` when segmenting
+    """
+    extension = recorder.config.extension
+    if recorder.config.segmented:
+        return os.path.join(directory, sensor_id, f"{SEGMENT_PATTERN}.{extension}")
+    return os.path.join(directory, f"{sensor_id}.{extension}")
+
+
+def start_recording(
+    settings: Settings,
+    sensor_ids: Optional[List[str]] = None,
+    group: Optional[str] = None,
+) -> SessionJob:
+    """Request sensors to start recording without waiting for the pipelines.
+
+    The request runs on the control plane thread, serialized with every other
+    start and stop, or in the recorder daemon if one is configured.
+
+    Raises
+    ------
+    ValueError
+        If the selection is malformed or names unknown sensors or groups
+    """
+    check_selection(sensor_ids, group)
+    client = _daemon_client(settings)
+    if client is not None:
+        return client.start(sensor_ids, group)
+    return control.call(manager.start, settings, sensor_ids, group)
+
+
+def stop_recording(
+    settings: Settings,
+    sensor_ids: Optional[List[str]] = None,
+    group: Optional[str] = None,
+) -> SessionJob:
+    """Request sensors to stop recording without waiting for the pipelines.
+
+    The request runs on the control plane thread, serialized with every other
+    start and stop, or in the recorder daemon if one is configured.
+
+    Raises
+    ------
+    ValueError
+        If the selection is malformed or names unknown sensors or groups
+    """
+    check_selection(sensor_ids, group)
+    client = _daemon_client(settings)
+    if client is not None:
+        return client.stop(sensor_ids, group)
+    return control.call(manager.stop, settings, sensor_ids, group)
+
+
+def start_owner_services(settings: Settings) -> bool:
+    """Start the background work of the process that owns the recordings.
+
+    Resumes interrupted post-processing jobs and starts the pre-roll captures.
+    Called once at startup by the recorder daemon, or by each web worker when
+    no daemon is configured (after the fork, since threads and process pools
+    do not survive it), never from request handlers. Only the first process to
+    acquire ownership of the recordings directory starts them, so workers
+    never open the same devices twice. Stop the captures with
+    ``manager.close_preroll()`` on exit.
 
+    Returns
+    -------
+    bool
+        Whether this process owns the recordings and started the work
+    """
+    root = settings.get("default_path") or str(Path.home())
+    if not acquire_ownership(root):
+        logger.warning(
+            "Another process owns the recordings in %s; "
+            "not running post-processing and pre-roll here",
+            root,
+        )
+        return False
+    get_job_queue(root, settings).ensure_running()
+    manager.start_preroll(settings)
+    return True
 
-def start_recording(settings: Settings) -> ApiResponse:
-    """Start recording process with simulated loading."""
-    time.sleep(1)  # Simulate startup delay
-    settings.set("is_recording", True)
-    return ApiResponse(status="success", message="Recording started")
 
+def get_recording_status(settings: Settings) -> SessionStatus:
+    """Get current recording status of all sensors."""
+    client = _daemon_client(settings)
+    if client is not None:
+        return client.status()
+    return manager.status([sensor.id for sensor in get_sensor_configs(settings)])
 
-def stop_recording(settings: Settings) -> ApiResponse:
-    """Stop recording process with simulated loading."""
-    time.sleep(1)  # Simulate shutdown delay
-    settings.set("is_recording", False)
-    return ApiResponse(status="success", message="Recording stopped")
 
+def _daemon_client(settings: Settings) -> Optional[DaemonClient]:
+    """Get the recorder daemon client if ``daemon_socket`` is set.
 
-def get_recording_status(settings: Settings) -> Dict[str, bool]:
-    """Get current recording status."""
-    return {"is_recording": settings.get("is_recording", False)}
+    The daemon's events (e.g. finalized recordings) are relayed to the local
+    event bus from then on.
+    """
+    path = settings.get("daemon_socket")
+    if not path:
+        return None
+    client = get_client(path)
+    client.relay_events(bus)
+    return client
@@ -1,22 +1,385 @@
 """Recordings service module.
 
 This module provides functions for retrieving and managing recording data.
-It includes functionality to list recordings and their metadata.
+It includes functionality to list recordings and their metadata, to search
+the files of the whole archive, and to read time ranges of recorded sensor
+samples.
 """
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, List, Mapping, Optional, Tuple
 
-from gst_rec_app.models.responses import Recording, RecordingsResponse
+from gst_rec_app.models.responses import (
+    RecordingsResponse,
+    SamplesResponse,
+    SearchResponse,
+)
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.index import SEARCH_SORT_COLUMNS, SORT_COLUMNS, get_index
+from gst_rec_app.services.postprocess import get_job_queue
+from gst_rec_app.utils import decode_cursor, encode_cursor
 
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+DEFAULT_POINTS = 1000
+MAX_POINTS = 10000
+DEFAULT_SEARCH_LIMIT = 100
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MAX_EPOCH_SECONDS = Decimal(2**63).scaleb(-9)  # int64 nanoseconds
 
-def get_recordings() -> RecordingsResponse:
-    """Get list of recordings."""
-    # TODO: Implement actual recording storage and retrieval
-    sample_recording = Recording(
-        id=1,
-        date=datetime(2025, 2, 16),
-        duration="5:30",
-        size="2.3 GB",
-        path="/recordings/rec_001",
+
+@dataclass
+class RecordingsQuery:
+    """Describes one page of the recordings list."""
+
+    limit: int = DEFAULT_LIMIT
+    sort: str = "date"
+    descending: bool = True
+    after: Optional[Tuple[float, int]] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    sensors: Optional[List[str]] = None
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> "RecordingsQuery":
+        """Parse query string arguments.
+
+        Supported arguments are ``limit``, ``cursor``, ``sort`` (``date``,
+        ``size`` or ``duration``), ``order`` (``asc`` or ``desc``), ``since`` and
+        ``until`` (ISO 8601 or epoch seconds) and ``sensor`` (comma separated).
+
+        Raises
+        ------
+        ValueError
+            If an argument is malformed
+        """
+        sort = args.get("sort", "date")
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_COLUMNS)}")
+        order = args.get("order", "desc")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        sensors = args.get("sensor")
+        return cls(
+            limit=min(max(int(args.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT),
+            sort=sort,
+            descending=order == "desc",
+            after=parse_cursor(args["cursor"]) if args.get("cursor") else None,
+            since=parse_time(args["since"]) if args.get("since") else None,
+            until=parse_time(args["until"]) if args.get("until") else None,
+            sensors=sensors.split(",") if sensors else None,
+        )
+
+
+@dataclass
+class SearchQuery:
+    """Describes one page of archive search results."""
+
+    name: Optional[str] = None
+    under: Optional[str] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    sensors: Optional[List[str]] = None
+    kind: Optional[str] = None
+    limit: int = DEFAULT_SEARCH_LIMIT
+    sort: str = "mtime"
+    descending: bool = True
+    after: Optional[Tuple[Any, int]] = None
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> "SearchQuery":
+        """Parse query string arguments.
+
+        Supported arguments are ``name`` (glob), ``path`` (directory to search
+        in), ``since`` and ``until`` (modification time, ISO 8601 or epoch
+        seconds), ``min_size`` and ``max_size`` (bytes), ``sensor`` (comma
+        separated), ``type`` (``file`` or ``dir``), ``limit``, ``cursor``,
+        ``sort`` (``mtime``, ``size`` or ``name``) and ``order`` (``asc`` or
+        ``desc``).
+
+        Raises
+        ------
+        ValueError
+            If an argument is malformed
+        """
+        sort = args.get("sort", "mtime")
+        if sort not in SEARCH_SORT_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(SEARCH_SORT_COLUMNS)}")
+        order = args.get("order", "desc")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        kind = args.get("type") or None
+        if kind not in (None, "file", "dir"):
+            raise ValueError("type must be file or dir")
+        sensors = args.get("sensor")
+        return cls(
+            name=args.get("name") or None,
+            under=args.get("path") or None,
+            since=parse_time(args["since"]) if args.get("since") else None,
+            until=parse_time(args["until"]) if args.get("until") else None,
+            min_size=int(args["min_size"]) if args.get("min_size") else None,
+            max_size=int(args["max_size"]) if args.get("max_size") else None,
+            sensors=sensors.split(",") if sensors else None,
+            kind=kind,
+            limit=min(max(int(args.get("limit", DEFAULT_SEARCH_LIMIT)), 1), MAX_LIMIT),
+            sort=sort,
+            descending=order == "desc",
+            after=parse_search_cursor(args["cursor"], sort)
+            if args.get("cursor")
+            else None,
+        )
+
+
+@dataclass
+class SamplesQuery:
+    """Describes a time range of samples and how far to downsample it."""
+
+    start_ns: Optional[int] = None
+    end_ns: Optional[int] = None
+    points: int = DEFAULT_POINTS
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> "SamplesQuery":
+        """Parse query string arguments.
+
+        Supported arguments are ``start`` and ``end`` (ISO 8601 or epoch
+        seconds) and ``decimate``, the maximum number of points returned.
+
+        Raises
+        ------
+        ValueError
+            If an argument is malformed
+        """
+        return cls(
+            start_ns=parse_time_ns(args["start"]) if args.get("start") else None,
+            end_ns=parse_time_ns(args["end"]) if args.get("end") else None,
+            points=min(max(int(args.get("decimate", DEFAULT_POINTS)), 1), MAX_POINTS),
+        )
+
+
+def parse_time(value: str) -> float:
+    """Parse an ISO 8601 date/time or epoch seconds into epoch seconds.
+
+    Naive ISO times are taken as UTC.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    return _parse_iso_time(value).timestamp()
+
+
+def parse_time_ns(value: str) -> int:
+    """Parse an ISO 8601 date/time or epoch seconds into epoch nanoseconds.
+
+    Epoch seconds are parsed as decimals, so no precision is lost to floats.
+    Naive ISO times are taken as UTC.
+
+    Raises
+    ------
+    ValueError
+        If the value is malformed, not finite or out of the int64 range
+    """
+    try:
+        seconds = Decimal(value)
+    except InvalidOperation:
+        delta = _parse_iso_time(value) - EPOCH
+        seconds = Decimal(delta.days * 86400 + delta.seconds) + Decimal(
+            delta.microseconds
+        ).scaleb(-6)
+    if not (seconds.is_finite() and -MAX_EPOCH_SECONDS < seconds < MAX_EPOCH_SECONDS):
+        raise ValueError(f"Time out of range: {value}")
+    return int(seconds.scaleb(9))
+
+
+def _parse_iso_time(value: str) -> datetime:
+    """Parse an ISO 8601 date/time, taking naive times as UTC."""
+    if value.endswith(("Z", "z")):
+        # fromisoformat only accepts the Z suffix from Python 3.11
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a recordings cursor into its ``(sort value, id)`` position.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed
+    """
+    try:
+        value, id_ = decode_cursor(cursor)
+        return float(value), int(id_)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def parse_search_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Decode a search cursor into its ``(sort value, id)`` position.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed or was not made for this sort column
+    """
+    try:
+        value, id_ = decode_cursor(cursor)
+        return (str(value) if sort == "name" else float(value)), int(id_)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_recordings(
+    settings: Settings, query: Optional[RecordingsQuery] = None
+) -> RecordingsResponse:
+    """Get one page of recordings from the recordings index.
+
+    Each recording carries its post-processing jobs and their progress.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path``
+    query : RecordingsQuery, optional
+        Page, sort order and filters; the first page by date if not given
+
+    Returns
+    -------
+    RecordingsResponse
+        The page, the total number of matches and the cursor of the next page
+    """
+    query = query or RecordingsQuery()
+    root = settings.get("default_path") or str(Path.home())
+    recordings, total, after = get_index(root).query(
+        sort=query.sort,
+        descending=query.descending,
+        limit=query.limit,
+        after=query.after,
+        since=query.since,
+        until=query.until,
+        sensors=query.sensors,
+    )
+    jobs = get_job_queue(root, settings).jobs(
+        [recording.path for recording in recordings]
+    )
+    for recording in recordings:
+        recording.jobs = jobs.get(recording.path, [])
+    return RecordingsResponse(
+        recordings=recordings,
+        total=total,
+        next_cursor=encode_cursor(after) if after else None,
+    )
+
+
+def search_archive(settings: Settings, query: SearchQuery) -> SearchResponse:
+    """Search the files and directories of the whole recordings directory.
+
+    Results come from the files table of the recordings index, so no
+    directory is walked to answer a query; see
+    :meth:`~gst_rec_app.services.index.RecordingsIndex.search`. The table is
+    built and kept current in the background; ``indexing`` is set until the
+    first pass over the archive completes.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path``
+    query : SearchQuery
+        Filters, sort order and page
+
+    Returns
+    -------
+    SearchResponse
+        The page, the cursor of the next page and whether the archive is
+        still being indexed
+
+    Raises
+    ------
+    ValueError
+        If ``query.under`` is outside the recordings directory
+    """
+    root = settings.get("default_path") or str(Path.home())
+    index = get_index(root)
+    results, after = index.search(
+        name=query.name,
+        under=query.under,
+        since=query.since,
+        until=query.until,
+        min_size=query.min_size,
+        max_size=query.max_size,
+        sensors=query.sensors,
+        kind=query.kind,
+        sort=query.sort,
+        descending=query.descending,
+        limit=query.limit,
+        after=query.after,
+    )
+    return SearchResponse(
+        results=results,
+        next_cursor=encode_cursor(after) if after else None,
+        indexing=not index.files_indexed,
+    )
+
+
+def get_samples(
+    settings: Settings, recording_id: int, query: Optional[SamplesQuery] = None
+) -> Optional[SamplesResponse]:
+    """Read a time range of a sample recording, downsampled for plotting.
+
+    The sample file is memory-mapped and the range found by binary search, so
+    only the pages of the range are read. Ranges with more samples than
+    ``query.points`` are reduced to per-bucket minima and maxima.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path``
+    recording_id : int
+        Id of the recording in the recordings index
+    query : SamplesQuery, optional
+        Time range and number of points; the whole recording if not given
+
+    Returns
+    -------
+    SamplesResponse, optional
+        The samples, or None if the recording does not exist
+
+    Raises
+    ------
+    ValueError
+        If the recording is not a sample file
+    """
+    # Imported here, so that numpy is only loaded once samples are requested
+    from gst_rec_app.services.imu import (
+        VALUE_FIELDS,
+        min_max_downsample,
+        open_samples,
+        read_range,
+    )
+
+    query = query or SamplesQuery()
+    root = settings.get("default_path") or str(Path.home())
+    recording = get_index(root).get(recording_id)
+    if recording is None:
+        return None
+    samples = read_range(open_samples(recording.path), query.start_ns, query.end_ns)
+    if len(samples) > query.points:
+        columns = min_max_downsample(samples, query.points)
+    else:
+        columns = {name: samples[name] for name in ("t_ns", *VALUE_FIELDS)}
+    return SamplesResponse(
+        recording=recording.id,
+        sensor=recording.sensor,
+        count=len(samples),
+        decimated=len(samples) > query.points,
+        columns={name: column.tolist() for name, column in columns.items()},
     )
-    return RecordingsResponse(recordings=[sample_recording])
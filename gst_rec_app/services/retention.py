@@ -0,0 +1,195 @@
+"""Retention service module.
+
+This module bounds disk usage of segmented recordings with a ring-buffer
+policy: whenever free space on the recordings disk falls below a threshold,
+the oldest segments are deleted until the threshold is met again.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.index import MANIFEST_NAME
+from gst_rec_app.services.recorder import SEGMENT_PATTERN
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = SEGMENT_PATTERN.split("%")[0]
+
+
+@dataclass
+class RetentionPolicy:
+    """Describes the free space to keep on the recordings disk.
+
+    The policy is enabled when either threshold is set; the larger of the two
+    wins.
+    """
+
+    min_free_bytes: int = 0
+    min_free_percent: float = 0.0
+    interval: float = 10.0  # seconds between checks
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "RetentionPolicy":
+        """Build a policy from a settings dict, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in values.items() if k in known})
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether any threshold is set."""
+        return self.min_free_bytes > 0 or self.min_free_percent > 0
+
+    def bytes_to_free(self, total: int, free: int) -> int:
+        """Get how many bytes must be deleted to satisfy the policy."""
+        target = max(self.min_free_bytes, total * self.min_free_percent / 100)
+        return max(0, int(target - free))
+
+
+def find_segments(root: str) -> List[Tuple[float, str, int]]:
+    """Find deletable segments under the recordings directory.
+
+    Segments live in ``<root>/<session>/<sensor>/seg_*``. Only the segment
+    directories listed in a session's manifest are considered, so files that
+    merely look like segments, e.g. when the recordings directory is the home
+    directory, are never deleted. The newest segment of every sensor directory
+    is skipped, since it may still be being written.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+
+    Returns
+    -------
+    List[Tuple[float, str, int]]
+        ``(mtime, path, size)`` of each segment, oldest first
+    """
+    segments = []
+    for session in _subdirectories(root):
+        for sensor in _segment_directories(session):
+            found = []
+            try:
+                with os.scandir(sensor) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(SEGMENT_PREFIX) and entry.is_file():
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, entry.path, stat.st_size))
+            except OSError:
+                continue
+            found.sort()
+            segments.extend(found[:-1])
+    segments.sort()
+    return segments
+
+
+def enforce_retention(root: str, policy: RetentionPolicy) -> List[str]:
+    """Delete the oldest segments until the policy's free space is available.
+
+    Parameters
+    ----------
+    root : str
+        Recordings directory
+    policy : RetentionPolicy
+        Free space thresholds
+
+    Returns
+    -------
+    List[str]
+        Paths of deleted segments
+    """
+    total, _, free = shutil.disk_usage(root)
+    needed = policy.bytes_to_free(total, free)
+    if not policy.enabled or needed <= 0:
+        return []
+
+    deleted = []
+    for _, path, size in find_segments(root):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        deleted.append(path)
+        needed -= size
+        if needed <= 0:
+            break
+    if deleted:
+        logger.info("Retention deleted %d segment(s) under %s", len(deleted), root)
+    return deleted
+
+
+def _segment_directories(session: str) -> List[str]:
+    """List the segment directories named in a session's manifest.
+
+    Returns an empty list if the directory has no readable manifest, i.e. is
+    not a recording session.
+    """
+    try:
+        with open(os.path.join(session, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        entries = list(manifest.get("sensors", {}).values())
+    except (OSError, ValueError, AttributeError):
+        return []
+    directories = set()
+    for entry in entries:
+        relative = entry.get("path", "") if isinstance(entry, dict) else ""
+        if "%" in relative and os.path.dirname(relative):
+            directory = os.path.normpath(
+                os.path.join(session, os.path.dirname(relative))
+            )
+            # Stay inside the session, whatever the manifest says
+            if os.path.dirname(directory) == os.path.normpath(session):
+                directories.add(directory)
+    return sorted(directories)
+
+
+def _subdirectories(path: str) -> List[str]:
+    """List the subdirectories of a directory, ignoring errors."""
+    try:
+        with os.scandir(path) as entries:
+            return [entry.path for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
+
+
+class RetentionGuard:
+    """Applies the ``retention`` settings periodically in a background thread.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path`` and ``retention``
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_running(self) -> None:
+        """Start the guard thread if it is not running yet."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="retention-guard", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Check the policy forever, sleeping ``interval`` seconds in between."""
+        while True:
+            policy = RetentionPolicy.from_dict(self.settings.get("retention", {}))
+            if policy.enabled:
+                root = self.settings.get("default_path") or str(Path.home())
+                try:
+                    enforce_retention(root, policy)
+                except OSError as e:
+                    logger.warning("Retention check failed: %s", e)
+            time.sleep(policy.interval)
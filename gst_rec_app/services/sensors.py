@@ -0,0 +1,135 @@
+"""Sensors service module.
+
+This module describes the sensors the application can record from. Each sensor
+gets its own recording pipeline; its ``pipeline`` options are layered over the
+global ``pipeline`` settings when the recorder is created.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from gst_rec_app.models.settings import Settings
+
+DEFAULT_SENSORS: List[Dict[str, Any]] = [
+    {
+        "id": "camera1",
+        "name": "Camera 1",
+        "group": "cameras",
+        "pipeline": {"video_device": "/dev/video0", "audio": False},
+    },
+    {
+        "id": "camera2",
+        "name": "Camera 2",
+        "group": "cameras",
+        "pipeline": {"video_device": "/dev/video1", "audio": False},
+    },
+    {
+        "id": "microphone",
+        "name": "Microphone",
+        "group": "audio",
+        "pipeline": {"video": False},
+    },
+    {
+        "id": "imu",
+        "name": "IMU",
+        "group": "imu",
+        "pipeline": {"source": "imu", "sample_rate": 1000},
+    },
+]
+
+
+@dataclass
+class SensorConfig:
+    """Represents a configured sensor and its pipeline overrides."""
+
+    id: str
+    name: str
+    group: str = ""
+    pipeline: Dict[str, Any] = field(default_factory=dict)
+
+
+def get_sensor_configs(settings: Settings) -> List[SensorConfig]:
+    """Get the configured sensors.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings; ``sensors`` overrides :data:`DEFAULT_SENSORS`
+
+    Returns
+    -------
+    List[SensorConfig]
+        Configured sensors in display order
+    """
+    return [
+        SensorConfig(**sensor) for sensor in settings.get("sensors", DEFAULT_SENSORS)
+    ]
+
+
+def check_selection(sensor_ids: Optional[List[str]], group: Optional[str]) -> None:
+    """Check the types of a sensor selection received from a client.
+
+    Parameters
+    ----------
+    sensor_ids : List[str], optional
+        Sensor ids to select
+    group : str, optional
+        Sensor group to select
+
+    Raises
+    ------
+    ValueError
+        If the ids are not a list of strings or the group is not a string
+    """
+    if sensor_ids is not None and (
+        not isinstance(sensor_ids, list)
+        or not all(isinstance(sensor_id, str) for sensor_id in sensor_ids)
+    ):
+        raise ValueError("sensors must be a list of sensor ids")
+    if group is not None and not isinstance(group, str):
+        raise ValueError("group must be a string")
+
+
+def select_sensors(
+    configs: List[SensorConfig],
+    sensor_ids: Optional[List[str]] = None,
+    group: Optional[str] = None,
+) -> List[SensorConfig]:
+    """Select sensors by id and/or group.
+
+    Parameters
+    ----------
+    configs : List[SensorConfig]
+        Configured sensors
+    sensor_ids : List[str], optional
+        Sensor ids to select
+    group : str, optional
+        Sensor group to select
+
+    Returns
+    -------
+    List[SensorConfig]
+        Matching sensors, or all sensors if neither ids nor group are given
+
+    Raises
+    ------
+    ValueError
+        If a sensor id or group does not exist, or the selection is malformed
+    """
+    check_selection(sensor_ids, group)
+    if not sensor_ids and not group:
+        return list(configs)
+
+    known = {config.id for config in configs}
+    unknown = [sensor_id for sensor_id in sensor_ids or [] if sensor_id not in known]
+    if unknown:
+        raise ValueError(f"Unknown sensor: {', '.join(unknown)}")
+
+    selected = [
+        config
+        for config in configs
+        if config.id in (sensor_ids or []) or (group and config.group == group)
+    ]
+    if not selected:
+        raise ValueError(f"Unknown sensor group: {group}")
+    return selected
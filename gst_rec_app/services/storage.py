@@ -0,0 +1,183 @@
+"""Storage statistics module.
+
+This module samples disk usage of the recordings directory in a background
+thread, so the storage endpoint serves cached values instead of touching the
+disk on every request. Each sample also derives the write rate from recent
+samples and the time until the disk is full at that rate.
+
+Bytes per sensor and per session come from the recordings index, which is
+updated incrementally as sessions change, corrected with the live byte counts
+of recordings still in progress.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+from gst_rec_app.models.responses import SessionStatus, StorageInfo
+from gst_rec_app.models.settings import Settings
+from gst_rec_app.services.index import get_index
+from gst_rec_app.services.ipc import DaemonError
+from gst_rec_app.services.recording import get_recording_status
+
+logger = logging.getLogger(__name__)
+
+MAX_DIRECTORIES = 10
+
+
+class StorageSampler:
+    """Samples storage statistics of the recordings directory periodically.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings providing ``default_path``
+    interval : float
+        Seconds between two samples
+    window : float
+        Seconds of samples the write rate is computed over
+    """
+
+    def __init__(
+        self, settings: Settings, interval: float = 5.0, window: float = 60.0
+    ) -> None:
+        self.settings = settings
+        self.interval = interval
+        self.window = window
+        self._lock = threading.Lock()
+        self._root: Optional[str] = None
+        self._history: Deque[Tuple[float, int]] = deque()
+        self._info: Optional[StorageInfo] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> StorageInfo:
+        """Get the latest sample, sampling now if there is none yet."""
+        self._ensure_running()
+        with self._lock:
+            info = self._info
+        return info if info is not None else self.sample()
+
+    def sample(self) -> StorageInfo:
+        """Sample storage statistics now and cache them.
+
+        Raises
+        ------
+        OSError
+            If the recordings directory cannot be created or inspected
+        """
+        root = self.settings.get("default_path") or str(Path.home())
+        with self._lock:
+            if root != self._root:
+                os.makedirs(root, exist_ok=True)
+                self._root = root
+                self._history.clear()
+
+        total, used, free = shutil.disk_usage(root)
+        now = time.monotonic()
+        with self._lock:
+            self._history.append((now, used))
+            while self._history[0][0] < now - self.window:
+                self._history.popleft()
+            (first_time, first_used), history = self._history[0], len(self._history)
+
+        write_rate = None
+        if history > 1 and now > first_time:
+            write_rate = (used - first_used) / (now - first_time)
+        sensors, directories = self._usage(root)
+        info = StorageInfo(
+            total=total,
+            used=used,
+            free=free,
+            percent=round((used / total) * 100, 2),
+            write_rate=write_rate,
+            time_until_full=free / write_rate
+            if write_rate and write_rate > 0
+            else None,
+            sensors=sensors,
+            directories=directories,
+            sampled_at=time.time(),
+        )
+        with self._lock:
+            self._info = info
+        return info
+
+    def _usage(self, root: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Get bytes per sensor and of the largest sessions.
+
+        Indexed sizes of recordings in progress lag behind, so they are
+        replaced by the recorders' own byte counts.
+        """
+        index = get_index(root)
+        index.reconcile()
+        sensors = index.usage("sensor")
+        directories = index.usage("session", limit=MAX_DIRECTORIES)
+
+        status = self._status()
+        if status is not None and status.session is not None:
+            indexed = index.session_usage(status.session)
+            for sensor in status.sensors:
+                if not sensor.is_recording or sensor.stats is None:
+                    continue
+                extra = sensor.stats.bytes_written - indexed.get(sensor.sensor, 0)
+                if extra > 0:
+                    sensors[sensor.sensor] = sensors.get(sensor.sensor, 0) + extra
+                    directories[status.session] = (
+                        directories.get(status.session, sum(indexed.values())) + extra
+                    )
+
+        largest = sorted(directories.items(), key=lambda item: item[1], reverse=True)
+        return sensors, dict(largest[:MAX_DIRECTORIES])
+
+    def _status(self) -> Optional[SessionStatus]:
+        """Get the recording status, or None if the daemon is unreachable."""
+        try:
+            return get_recording_status(self.settings)
+        except DaemonError:
+            return None
+
+    def _ensure_running(self) -> None:
+        """Start the sampler thread if it is not running yet."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="storage-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Sample every ``interval`` seconds forever."""
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+            except OSError as e:
+                logger.warning("Storage sampling failed: %s", e)
+
+
+_sampler: Optional[StorageSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_storage_sampler(settings: Settings) -> StorageSampler:
+    """Get the shared sampler of a settings object.
+
+    Parameters
+    ----------
+    settings : Settings
+        Application settings
+
+    Returns
+    -------
+    StorageSampler
+        Sampler created once per process
+    """
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None or _sampler.settings is not settings:
+            _sampler = StorageSampler(settings)
+        return _sampler
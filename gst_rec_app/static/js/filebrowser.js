@@ -1,8 +1,12 @@
+const PAGE_SIZE = 200;
+
 class FileBrowser {
   constructor() {
     this.currentPath = document
       .querySelector("#current-path")
       .textContent.trim();
+    this.nextCursor = null;
+    this.loadingPage = false;
     this.setupEventListeners();
   }
 
@@ -11,6 +15,16 @@ class FileBrowser {
     changeLocationBtn.addEventListener("click", () => this.showBrowser());
   }
 
+  bindEntryClicks(modal) {
+    // Delegate clicks so entries appended by later pages are handled too.
+    modal.querySelector(".file-list").addEventListener("click", async (e) => {
+      const entry = e.target.closest(".entry");
+      if (entry && entry.dataset.isDir === "true") {
+        await this.loadDirectory(entry.dataset.path);
+      }
+    });
+  }
+
   async showBrowser() {
     // Create modal dialog
     const modal = createModal();
@@ -25,40 +39,45 @@ class FileBrowser {
     closeBtn.addEventListener("click", () => modal.remove());
     cancelBtn.addEventListener("click", () => modal.remove());
     selectBtn.addEventListener("click", () => this.selectCurrentPath(modal));
+    this.bindEntryClicks(modal);
 
     // Load current directory
     await this.loadDirectory(this.currentPath);
   }
 
+  async fetchPage(path, cursor = null) {
+    const params = new URLSearchParams({ path, limit: PAGE_SIZE });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    const response = await fetch(`/api/browse?${params}`, {
+      headers: {
+        "Cache-Control": "no-cache",
+        Pragma: "no-cache",
+      },
+      credentials: "same-origin",
+    });
+
+    if (!response.ok) {
+      const errorText = await response.text();
+      console.error("Server response:", {
+        status: response.status,
+        statusText: response.statusText,
+        body: errorText,
+      });
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+  }
+
   async loadDirectory(path = "") {
     try {
       console.log("Attempting to load directory:", path);
-      const response = await fetch(
-        `/api/browse?path=${encodeURIComponent(path)}`,
-        {
-          headers: {
-            "Cache-Control": "no-cache",
-            Pragma: "no-cache",
-          },
-          credentials: "same-origin",
-        },
-      );
-
-      if (!response.ok) {
-        const errorText = await response.text();
-        console.error("Server response:", {
-          status: response.status,
-          statusText: response.statusText,
-          body: errorText,
-        });
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const entries = await response.json();
-      console.log("Received entries:", entries);
+      const page = await this.fetchPage(path);
 
       this.currentPath = path;
-      this.updateBrowserView(entries);
+      this.nextCursor = page.next_cursor;
+      this.updateBrowserView(page.entries);
     } catch (error) {
       console.error("Error loading directory:", error);
       // Show error to user
@@ -71,37 +90,58 @@ class FileBrowser {
     }
   }
 
+  async loadNextPage() {
+    // Called on scroll; fetch the next page of the current directory once.
+    if (!this.nextCursor || this.loadingPage) {
+      return;
+    }
+    this.loadingPage = true;
+    const path = this.currentPath;
+    try {
+      const page = await this.fetchPage(path, this.nextCursor);
+      if (path === this.currentPath) {
+        this.nextCursor = page.next_cursor;
+        this.appendEntries(page.entries);
+      }
+    } catch (error) {
+      console.error("Error loading next page:", error);
+    } finally {
+      this.loadingPage = false;
+    }
+  }
+
   updateBrowserView(entries) {
     const container = document.querySelector(".file-list");
     const pathDisplay = document.querySelector(".current-path");
 
     pathDisplay.textContent = this.currentPath || "Home";
 
-    container.innerHTML = entries
+    container.innerHTML = "";
+    container.scrollTop = 0;
+    container.onscroll = () => {
+      const remaining =
+        container.scrollHeight - container.scrollTop - container.clientHeight;
+      if (remaining < 200) {
+        this.loadNextPage();
+      }
+    };
+    this.appendEntries(entries);
+  }
+
+  appendEntries(entries) {
+    const container = document.querySelector(".file-list");
+    const html = entries
       .map(
         (entry) => `
       <div class="entry p-2 hover:bg-gray-100 cursor-pointer flex items-center"
-           data-path="${entry.path}">
+           data-path="${entry.path}" data-is-dir="${entry.is_dir}">
         <span class="mr-2">${entry.is_dir ? "📁" : "📄"}</span>
         <span>${entry.name}</span>
       </div>
     `,
       )
       .join("");
-
-    // Add click handlers
-    container.querySelectorAll(".entry").forEach((entry) => {
-      entry.addEventListener("click", async (e) => {
-        const path = e.currentTarget.dataset.path;
-        const isDir = e.currentTarget
-          .querySelector("span")
-          .textContent.includes("📁");
-
-        if (isDir) {
-          await this.loadDirectory(path);
-        }
-      });
-    });
+    container.insertAdjacentHTML("beforeend", html);
   }
 
   async selectCurrentPath(modal) {
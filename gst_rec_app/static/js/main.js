@@ -2,7 +2,11 @@ document.addEventListener("DOMContentLoaded", function () {
   const recordBtn = document.getElementById("record-btn");
   const timer = document.getElementById("timer");
   let isRecording = false;
+  let isBusy = false;
   let timerInterval;
+  let events = null;
+  let statusWaiters = [];
+  let pollInterval = null;
   let startTime;
   const logContainer = document.getElementById("log-container");
 
@@ -10,6 +14,7 @@ document.addEventListener("DOMContentLoaded", function () {
   updateSensors();
   updateStorage();
   updateRecordingHistory();
+  connectEvents();
 
   // Event listeners
   recordBtn.addEventListener("click", async () => {
@@ -21,6 +26,7 @@ document.addEventListener("DOMContentLoaded", function () {
     loadingText.classList.remove("hidden");
     loadingText.textContent = isRecording ? "Stopping..." : "Starting...";
 
+    isBusy = true;
     try {
       if (isRecording) {
         await stopRecording();
@@ -38,9 +44,90 @@ document.addEventListener("DOMContentLoaded", function () {
       );
       // Reset button state
       updateRecordingState(isRecording);
+    } finally {
+      isBusy = false;
     }
   });
 
+  function connectEvents() {
+    // Server-sent events replace polling; fall back to polling while the
+    // stream is unavailable (EventSource reconnects on its own).
+    if (!window.EventSource) {
+      startPolling();
+      return;
+    }
+    events = new EventSource("/api/events");
+    events.addEventListener("open", stopPolling);
+    events.addEventListener("error", () => {
+      startPolling();
+      // A server at its stream limit answers 503, after which EventSource
+      // gives up; try again later
+      if (events.readyState === EventSource.CLOSED) {
+        setTimeout(connectEvents, 30000);
+      }
+    });
+    events.addEventListener("status", (event) =>
+      handleStatus(JSON.parse(event.data)),
+    );
+    events.addEventListener("sensors", (event) =>
+      renderSensors(JSON.parse(event.data)),
+    );
+    events.addEventListener("storage", (event) =>
+      renderStorage(JSON.parse(event.data)),
+    );
+    events.addEventListener("recording", () => updateRecordingHistory());
+    events.addEventListener("job", () => updateRecordingHistory());
+  }
+
+  function startPolling() {
+    if (!pollInterval) {
+      pollInterval = setInterval(updateStorage, 30000);
+    }
+  }
+
+  function stopPolling() {
+    if (pollInterval) {
+      clearInterval(pollInterval);
+      pollInterval = null;
+    }
+  }
+
+  function isStreaming() {
+    return events !== null && events.readyState === EventSource.OPEN;
+  }
+
+  function handleStatus(status) {
+    const waiters = statusWaiters;
+    statusWaiters = [];
+    waiters.forEach((resolve) => resolve(status));
+
+    // Follow changes made elsewhere, e.g. from another browser
+    if (!isBusy && status.is_recording !== isRecording) {
+      isRecording = status.is_recording;
+      updateRecordingState(isRecording);
+      if (isRecording) {
+        startTimer();
+      } else {
+        stopTimer();
+      }
+    }
+  }
+
+  async function nextStatus() {
+    // Wait for the next pushed status, or fetch it when the stream is down
+    if (isStreaming()) {
+      const status = await new Promise((resolve) => {
+        statusWaiters.push(resolve);
+        setTimeout(() => resolve(null), 2000);
+      });
+      if (status) {
+        return status;
+      }
+    }
+    const response = await fetch("/api/recording/status");
+    return response.json();
+  }
+
   function addLog(message, type = "info") {
     const logEntry = document.createElement("div");
     const timestamp = new Date().toLocaleTimeString();
@@ -75,50 +162,70 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
-  async function startRecording() {
-    try {
-      const response = await fetch("/api/recording/start", {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-      });
-
-      const data = await response.json();
-      if (data.status === "success") {
-        addLog("Recording started", "success");
-        updateRecordingState(true);
-        startTimer();
-      } else {
-        throw new Error(data.message || "Failed to start recording");
+  async function waitForJobs(jobs, targets) {
+    // Transitions run in the background; poll until every sensor's job settles.
+    const pending = new Map(jobs.map((job) => [job.sensor, job.job_id]));
+    const settled = [];
+    while (pending.size > 0) {
+      const status = await nextStatus();
+      for (const sensor of status.sensors) {
+        if (pending.get(sensor.sensor) !== sensor.job_id) {
+          continue;
+        }
+        if (sensor.state === "failed") {
+          addLog(`${sensor.sensor}: ${sensor.error}`, "error");
+        } else if (targets.includes(sensor.state)) {
+          settled.push(sensor);
+        } else {
+          continue;
+        }
+        pending.delete(sensor.sensor);
       }
-    } catch (error) {
-      console.error("Recording error:", error);
-      addLog(`Failed to start recording: ${error.message}`, "error");
-      updateRecordingState(false);
+      if (pending.size > 0 && !isStreaming()) {
+        await new Promise((resolve) => setTimeout(resolve, 250));
+      }
+    }
+    if (settled.length === 0) {
+      throw new Error("No sensor reached the requested state");
     }
+    return settled;
   }
 
-  async function stopRecording() {
-    try {
-      const response = await fetch("/api/recording/stop", {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-      });
+  async function requestRecording(action) {
+    const response = await fetch(`/api/recording/${action}`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+    });
 
-      const data = await response.json();
-      if (data.status === "success") {
-        addLog("Recording stopped", "success");
-        updateRecordingState(false);
-        stopTimer();
-      } else {
-        throw new Error(data.message || "Failed to stop recording");
-      }
-    } catch (error) {
-      console.error("Recording error:", error);
-      addLog(`Failed to stop recording: ${error.message}`, "error");
+    const data = await response.json();
+    if (data.status !== "success") {
+      throw new Error(data.message || `Failed to ${action} recording`);
+    }
+    return data.jobs.filter((job) => job.status === "success");
+  }
+
+  async function startRecording() {
+    const jobs = await requestRecording("start");
+    const started = await waitForJobs(jobs, ["recording"]);
+    addLog(
+      `Recording started: ${started.map((s) => s.sensor).join(", ")}`,
+      "success",
+    );
+    updateRecordingState(true);
+    startTimer();
+  }
+
+  async function stopRecording() {
+    const jobs = await requestRecording("stop");
+    await waitForJobs(jobs, ["idle"]);
+    addLog("Recording stopped", "success");
+    updateRecordingState(false);
+    stopTimer();
+    if (!isStreaming()) {
+      // Otherwise the "recording" event refreshes the history
+      updateRecordingHistory();
     }
   }
 
@@ -164,59 +271,151 @@ document.addEventListener("DOMContentLoaded", function () {
   function updateSensors() {
     fetch("/api/sensors")
       .then((response) => response.json())
-      .then((data) => {
-        const sensorsList = document.getElementById("sensors-list");
-        sensorsList.innerHTML = data.sensors
-          .map(
-            (sensor) => `
-                    <div class="flex items-center justify-between p-2 bg-gray-50 rounded">
-                        <span>${sensor.name}</span>
-                        <span class="text-green-500">${sensor.status}</span>
-                    </div>
-                `,
-          )
-          .join("");
-      });
+      .then(renderSensors);
+  }
+
+  function renderSensors(data) {
+    const sensorsList = document.getElementById("sensors-list");
+    sensorsList.innerHTML = data.sensors
+      .map(
+        (sensor) => `
+                <div class="flex items-center justify-between p-2 bg-gray-50 rounded"
+                     title="${sensor.error || sensor.device || ""}">
+                    <span>${sensor.name}</span>
+                    <span class="text-gray-500 text-sm">${formatSensorDetails(sensor)}</span>
+                    <span class="${sensorStatusClass(sensor.status)}">${sensor.status}</span>
+                </div>
+            `,
+      )
+      .join("");
+  }
+
+  function sensorStatusClass(status) {
+    switch (status) {
+      case "Connected":
+        return "text-green-500";
+      case "Disconnected":
+        return "text-red-500";
+      default:
+        return "text-gray-500";
+    }
+  }
+
+  function formatSensorDetails(sensor) {
+    const details = [];
+    if (sensor.fps) {
+      details.push(`${sensor.fps.toFixed(0)} fps`);
+    }
+    if (sensor.errors) {
+      details.push(`${sensor.errors} errors`);
+    }
+    return details.join(", ");
   }
 
   function updateStorage() {
     fetch("/api/storage")
       .then((response) => response.json())
-      .then((data) => {
-        const storageInfo = document.getElementById("storage-info");
-        const usedGB = (data.used / 1024 ** 3).toFixed(1);
-        const totalGB = (data.total / 1024 ** 3).toFixed(1);
+      .then(renderStorage);
+  }
 
-        storageInfo.innerHTML = `
-                    <div class="w-full bg-gray-200 rounded-full h-2 mb-2">
-                        <div class="bg-blue-600 h-2 rounded-full" style="width: ${data.percent}%"></div>
-                    </div>
-                    <div class="text-sm text-gray-600">
-                        Used: ${usedGB}GB / ${totalGB}GB
-                    </div>
-                `;
-      });
+  function renderStorage(data) {
+    const storageInfo = document.getElementById("storage-info");
+    const usedGB = (data.used / 1024 ** 3).toFixed(1);
+    const totalGB = (data.total / 1024 ** 3).toFixed(1);
+
+    storageInfo.innerHTML = `
+                <div class="w-full bg-gray-200 rounded-full h-2 mb-2">
+                    <div class="bg-blue-600 h-2 rounded-full" style="width: ${data.percent}%"></div>
+                </div>
+                <div class="text-sm text-gray-600">
+                    Used: ${usedGB}GB / ${totalGB}GB
+                </div>
+                ${
+                  data.write_rate > 0
+                    ? `<div class="text-sm text-gray-600">
+                    Writing ${formatBytes(data.write_rate)}/s, full in ${formatEta(data.time_until_full)}
+                </div>`
+                    : ""
+                }
+            `;
+  }
+
+  function formatEta(seconds) {
+    const hours = Math.floor(seconds / 3600);
+    if (hours >= 48) {
+      return `${Math.floor(hours / 24)} days`;
+    }
+    return `${hours}h ${Math.floor((seconds % 3600) / 60)}m`;
   }
 
-  function updateRecordingHistory() {
-    fetch("/api/recordings")
+  let recordingsCursor = null;
+
+  function updateRecordingHistory(append = false) {
+    const params = new URLSearchParams({ limit: 20 });
+    if (append && recordingsCursor) {
+      params.set("cursor", recordingsCursor);
+    }
+    fetch(`/api/recordings?${params}`)
       .then((response) => response.json())
       .then((data) => {
         const history = document.getElementById("recording-history");
-        history.innerHTML = data.recordings
+        const rows = data.recordings
           .map(
             (recording) => `
                     <div class="flex items-center justify-between p-3 bg-gray-50 rounded">
-                        <span class="font-medium">${recording.date}</span>
-                        <span class="text-gray-600">Duration: ${recording.duration}</span>
-                        <span class="text-gray-600">${recording.size}</span>
+                        <span class="font-medium">${new Date(recording.date).toLocaleString()}</span>
+                        <span class="text-gray-600">${recording.sensor}</span>
+                        <span class="text-gray-600">Duration: ${formatDuration(recording.duration)}</span>
+                        <span class="text-gray-600">${formatBytes(recording.size)}</span>
+                        <span class="text-gray-500 text-sm">${formatJobs(recording.jobs)}</span>
                     </div>
                 `,
           )
           .join("");
+        if (append) {
+          history.insertAdjacentHTML("beforeend", rows);
+        } else {
+          history.innerHTML = rows;
+        }
+        recordingsCursor = data.next_cursor;
+        document
+          .getElementById("load-more-recordings")
+          .classList.toggle("hidden", !recordingsCursor);
       });
   }
 
+  document
+    .getElementById("load-more-recordings")
+    .addEventListener("click", () => updateRecordingHistory(true));
+
+  function formatJobs(jobs) {
+    return (jobs || [])
+      .filter((job) => job.state !== "done")
+      .map((job) =>
+        job.state === "running"
+          ? `${job.kind} ${Math.round(job.progress * 100)}%`
+          : `${job.kind} ${job.state}`,
+      )
+      .join(", ");
+  }
+
+  function formatDuration(seconds) {
+    const total = Math.round(seconds);
+    const minutes = Math.floor(total / 60);
+    return `${minutes}:${(total % 60).toString().padStart(2, "0")}`;
+  }
+
+  function formatBytes(bytes) {
+    const units = ["B", "KB", "MB", "GB", "TB"];
+    let value = bytes;
+    let unit = 0;
+    while (value >= 1024 && unit < units.length - 1) {
+      value /= 1024;
+      unit += 1;
+    }
+    return `${value.toFixed(unit === 0 ? 0 : 1)} ${units[unit]}`;
+  }
+
   function updatePath(newPath) {
     fetch("/api/settings/path", {
       method: "POST",
@@ -255,7 +454,4 @@ document.addEventListener("DOMContentLoaded", function () {
     .then((data) => {
       document.getElementById("current-path").textContent = data.path;
     });
-
-  // Update storage info every 30 seconds
-  setInterval(updateStorage, 30000);
 });
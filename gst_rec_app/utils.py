@@ -1,10 +1,48 @@
 """Utility functions for the application."""
 
-import shutil
+import base64
+import json
+from dataclasses import asdict
 from pathlib import Path
+from typing import Any, List, Sequence
 
-from gst_rec_app.models import settings
+from gst_rec_app.models import get_settings
 from gst_rec_app.models.responses import StorageInfo
+from gst_rec_app.services.probes import get_sensor_poller
+from gst_rec_app.services.storage import get_storage_sampler
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Encode a keyset pagination position as an opaque cursor.
+
+    Parameters
+    ----------
+    key : Sequence[Any]
+        JSON-serializable sort key of the last item of a page
+
+    Returns
+    -------
+    str
+        URL-safe cursor
+    """
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor created by :func:`encode_cursor`.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
 
 
 def ensure_recordings_directory(path: str) -> None:
@@ -26,28 +64,24 @@ def get_storage_info() -> StorageInfo:
     Returns
     -------
     StorageInfo
-        Storage usage details for the recordings directory
+        Latest sample of the storage sampler: disk usage, write rate, time
+        until full and bytes per sensor and per session
     """
-    path = settings.get_value("default_path") or str(Path.home())
-    ensure_recordings_directory(path)
-
-    total, used, free = shutil.disk_usage(path)
-    return StorageInfo(
-        total=total, used=used, free=free, percent=round((used / total) * 100, 2)
-    )
+    return get_storage_sampler(get_settings()).snapshot()
 
 
 def get_sensors_status():
     """Get the status of system sensors.
 
+    Returns the latest snapshot of the sensor poller; no device is probed on
+    the caller's thread.
+
     Returns
     -------
         dict: List of sensors and their current status.
     """
     return {
         "sensors": [
-            {"name": "Camera 1", "status": "Connected"},
-            {"name": "Camera 2", "status": "Connected"},
-            {"name": "Microphone", "status": "Connected"},
+            asdict(status) for status in get_sensor_poller(get_settings()).snapshot()
         ]
     }
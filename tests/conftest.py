@@ -0,0 +1,35 @@
+"""Fixtures shared by the tests."""
+
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from gst_rec_app.models import Settings
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    """Create settings of a scratch recordings directory and the fake recorder."""
+    settings_file = tmp_path / "settings.json"
+    settings_file.write_text(
+        json.dumps(
+            {
+                "recorder_backend": "fake",
+                "default_path": str(tmp_path / "rec"),
+                "sensor_probe": {"device_dir": str(tmp_path / "dev")},
+            }
+        )
+    )
+    return Settings(str(settings_file))
+
+
+@pytest.fixture
+def client(settings: Settings, monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+    """Create a test client of the application, serving ``settings``."""
+    from gst_rec_app import create_app, routes
+
+    monkeypatch.setattr(routes, "settings", settings)
+    with create_app().test_client() as client:
+        yield client
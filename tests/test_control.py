@@ -0,0 +1,78 @@
+"""Tests of the control plane."""
+
+import threading
+import time
+from typing import List, Tuple
+
+import pytest
+
+from gst_rec_app.services.control import ControlPlane
+
+
+def test_commands_run_in_order_on_one_thread() -> None:
+    """Run every command on the owner thread, one at a time, in order."""
+    control = ControlPlane("test-control")
+    ran: List[int] = []
+    threads = set()
+    active = threading.Semaphore(1)
+
+    def command(i: int) -> int:
+        assert active.acquire(blocking=False), "commands overlapped"
+        try:
+            threads.add(threading.current_thread().name)
+            time.sleep(0.001)
+            ran.append(i)
+            return i * 2
+        finally:
+            active.release()
+
+    futures = [control.submit(command, i) for i in range(20)]
+    assert [future.result(5) for future in futures] == [i * 2 for i in range(20)]
+    assert ran == list(range(20))
+    assert threads == {"test-control"}
+
+
+def test_concurrent_callers_are_serialized() -> None:
+    """Let request threads call commands concurrently without interleaving them."""
+    control = ControlPlane()
+    events: List[Tuple[str, int]] = []
+
+    def command(i: int) -> None:
+        events.append(("begin", i))
+        time.sleep(0.005)
+        events.append(("end", i))
+
+    callers = [
+        threading.Thread(target=control.call, args=(command, i), kwargs={"timeout": 5})
+        for i in range(8)
+    ]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    begins = events[::2]
+    assert sorted(i for _, i in begins) == list(range(8))
+    assert begins == [("begin", i) for _, i in begins]
+    assert events[1::2] == [("end", i) for _, i in begins]
+
+
+def test_errors_reach_the_caller() -> None:
+    """Raise the command's exception in the caller, and keep serving commands."""
+    control = ControlPlane()
+
+    def fail() -> None:
+        raise ValueError("bad sensor")
+
+    with pytest.raises(ValueError, match="bad sensor"):
+        control.call(fail, timeout=5)
+    assert control.call(len, "abc", timeout=5) == 3
+
+
+def test_nested_calls_run_inline() -> None:
+    """Let a command call another one without deadlocking the owner thread."""
+    control = ControlPlane()
+
+    def outer() -> str:
+        return control.call(str.upper, "inner", timeout=1)
+
+    assert control.call(outer, timeout=5) == "INNER"
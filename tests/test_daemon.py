@@ -0,0 +1,102 @@
+"""Tests of the recorder daemon and its client."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from gst_rec_app.models import Settings
+from gst_rec_app.services.daemon import RecorderDaemon
+from gst_rec_app.services.events import EventBus, bus
+from gst_rec_app.services.ipc import DaemonClient, DaemonError
+from gst_rec_app.services.recording import manager
+
+
+@pytest.fixture
+def daemon_client(settings: Settings, tmp_path: Path) -> Iterator[DaemonClient]:
+    """Serve a recorder daemon of the fake recorder and connect to it."""
+    settings.set("pipeline", {"framerate": 10, "bitrate": 80})
+    path = str(tmp_path / "daemon.sock")
+    daemon = RecorderDaemon(path, settings)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield DaemonClient(path, timeout=5)
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+        manager.stop(settings)
+        assert manager.wait_idle(5)
+
+
+def wait_for_state(daemon_client: DaemonClient, state: str) -> None:
+    """Wait for the daemon's recordings to settle in a state."""
+    deadline = time.monotonic() + 5
+    while daemon_client.status().state != state:
+        assert time.monotonic() < deadline, f"Recording is not {state}"
+        time.sleep(0.02)
+
+
+def test_start_and_stop_round_trip(daemon_client: DaemonClient) -> None:
+    """Start and stop a sensor in the daemon and read its state back."""
+    status = daemon_client.status()
+    assert {sensor.state for sensor in status.sensors} == {"idle"}
+    assert "camera1" in [sensor.sensor for sensor in status.sensors]
+
+    job = daemon_client.start(["camera1"])
+    assert job.status == "success"
+    assert [(j.sensor, j.state) for j in job.jobs] == [("camera1", "starting")]
+    wait_for_state(daemon_client, "recording")
+    status = daemon_client.status()
+    assert status.session == job.session
+    (camera1,) = [s for s in status.sensors if s.sensor == "camera1"]
+    assert camera1.is_recording
+    assert camera1.stats is not None
+
+    assert daemon_client.start(["camera1"]).status == "error"
+    assert daemon_client.stop().status == "success"
+    wait_for_state(daemon_client, "idle")
+
+
+def test_errors_are_mapped(daemon_client: DaemonClient) -> None:
+    """Raise ValueError for rejected arguments and DaemonError for failures."""
+    with pytest.raises(ValueError, match="Unknown sensor: nope"):
+        daemon_client.start(["nope"])
+    with pytest.raises(ValueError, match="Unknown command"):
+        daemon_client.call("reboot")
+    with pytest.raises(ValueError):
+        daemon_client.call("status", verbose=True)
+
+
+def test_unreachable_daemon(tmp_path: Path) -> None:
+    """Raise DaemonError when nothing listens on the socket."""
+    with pytest.raises(DaemonError):
+        DaemonClient(str(tmp_path / "missing.sock"), timeout=1).status()
+
+
+def test_stale_socket_is_replaced(settings: Settings, tmp_path: Path) -> None:
+    """Replace the socket of a dead daemon, but not that of a running one."""
+    path = str(tmp_path / "daemon.sock")
+    RecorderDaemon(path, settings).socket.close()
+    daemon = RecorderDaemon(path, settings)
+    try:
+        with pytest.raises(RuntimeError, match="Another recorder daemon"):
+            RecorderDaemon(path, settings)
+    finally:
+        daemon.server_close()
+
+
+def test_events_are_relayed(daemon_client: DaemonClient) -> None:
+    """Forward the daemon's events to the web worker's bus."""
+    local = EventBus()
+    frames = local.subscribe().frames(keepalive=0.05)
+    next(frames)
+    daemon_client.relay_events(local)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        bus.publish("recording", {"session": "rec_a"})
+        if next(frames).startswith("event: recording"):
+            return
+    raise AssertionError("No event was relayed")
@@ -0,0 +1,116 @@
+"""Tests of the directory listing cache."""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from gst_rec_app.services.dircache import DirectoryCache
+
+OLD = time.time() - 3600
+
+
+def counting_loader(calls: List[str]) -> Callable[[str], List]:
+    """Create a loader listing a directory and recording each call."""
+
+    def load(path: str) -> List:
+        calls.append(path)
+        return sorted(os.scandir(path), key=lambda entry: entry.name)
+
+    return load
+
+
+def names(entries: List) -> List[str]:
+    """Get the names of listed entries."""
+    return [entry.name for entry in entries]
+
+
+def make_directory(root: Path, name: str, files: List[str]) -> Path:
+    """Create a directory with empty files, last modified an hour ago."""
+    directory = root / name
+    directory.mkdir()
+    for file in files:
+        (directory / file).touch()
+    os.utime(directory, (OLD, OLD))
+    return directory
+
+
+def test_inotify_invalidation(tmp_path: Path) -> None:
+    """Serve hits until a watched directory changes, then list it again."""
+    directory = make_directory(tmp_path, "rec", ["a.mkv"])
+    cache, calls = DirectoryCache(), []
+    loader = counting_loader(calls)
+    assert names(cache.get(str(directory), loader)) == ["a.mkv"]
+    if cache.lookup(str(directory)).wd is None:
+        pytest.skip("inotify is not available")
+    cache.get(str(directory), loader)
+    assert len(calls) == 1
+
+    (directory / "b.mkv").touch()
+    deadline = time.monotonic() + 5
+    while cache.lookup(str(directory)) is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert names(cache.get(str(directory), loader)) == ["a.mkv", "b.mkv"]
+    assert len(calls) == 2
+
+
+def test_mtime_invalidation(tmp_path: Path) -> None:
+    """Check the directory mtime on every lookup without inotify."""
+    directory = make_directory(tmp_path, "rec", ["a.mkv"])
+    cache, calls = DirectoryCache(use_inotify=False), []
+    loader = counting_loader(calls)
+    cache.get(str(directory), loader)
+    cache.get(str(directory), loader)
+    assert len(calls) == 1
+
+    (directory / "b.mkv").touch()
+    assert names(cache.get(str(directory), loader)) == ["a.mkv", "b.mkv"]
+    assert len(calls) == 2
+
+
+def test_recently_modified_directory_is_not_cached(tmp_path: Path) -> None:
+    """Do not trust the mtime of a directory modified within its granularity."""
+    directory = tmp_path / "rec"
+    directory.mkdir()
+    cache, calls = DirectoryCache(use_inotify=False), []
+    loader = counting_loader(calls)
+    cache.get(str(directory), loader)
+    cache.get(str(directory), loader)
+    assert len(calls) == 2
+
+
+def test_change_while_listing_is_not_cached(tmp_path: Path) -> None:
+    """Drop a listing that was invalidated while it was being loaded."""
+    directory = make_directory(tmp_path, "rec", ["a.mkv"])
+    cache = DirectoryCache()
+
+    def load_and_invalidate(path: str) -> List:
+        entries = list(os.scandir(path))
+        cache.invalidate(path)
+        return entries
+
+    cache.get(str(directory), load_and_invalidate)
+    assert cache.lookup(str(directory)) is None
+
+
+def test_least_recently_used_listings_are_evicted(tmp_path: Path) -> None:
+    """Keep the cache under its size cap by evicting the oldest listings."""
+    first = make_directory(tmp_path, "first", ["a.mkv"])
+    second = make_directory(tmp_path, "second", ["b.mkv"])
+    loader = counting_loader([])
+    cache = DirectoryCache()
+    cache.get(str(first), loader)
+    cache.get(str(second), loader)
+    size = cache.lookup(str(first)).size + cache.lookup(str(second)).size
+
+    cache = DirectoryCache(max_bytes=size - 1)
+    cache.get(str(first), loader)
+    cache.get(str(second), loader)
+    assert cache.lookup(str(first)) is None
+    assert cache.lookup(str(second)) is not None
+
+    cache = DirectoryCache(max_bytes=1)
+    cache.get(str(first), loader)
+    assert cache.lookup(str(first)) is None
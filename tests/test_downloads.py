@@ -0,0 +1,197 @@
+"""Tests of recording downloads."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from werkzeug.test import EnvironBuilder
+from werkzeug.wsgi import FileWrapper
+
+from gst_rec_app.models import Settings
+from gst_rec_app.services.downloads import (
+    DownloadConfig,
+    FileRange,
+    get_download_config,
+    send_recording,
+)
+from gst_rec_app.services.index import MANIFEST_NAME, get_index
+
+DATA = bytes(range(256)) * 16
+
+
+@pytest.fixture
+def recording(tmp_path: Path) -> Path:
+    """Write a recording file."""
+    path = tmp_path / "cam0.mkv"
+    path.write_bytes(DATA)
+    return path
+
+
+def environ(**headers: str) -> Dict[str, Any]:
+    """Build the WSGI environment of a download request."""
+    env = EnvironBuilder(headers=headers).get_environ()
+    env["wsgi.file_wrapper"] = FileWrapper
+    return env
+
+
+def body(response: Any) -> bytes:
+    """Read and close a response body."""
+    try:
+        return b"".join(response.response)
+    finally:
+        response.response.close()
+
+
+def test_full_download(recording: Path) -> None:
+    """Send the whole file with validators."""
+    response = send_recording(str(recording), "", environ(), DownloadConfig())
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert body(response) == DATA
+
+
+def test_range_is_sent_with_the_file_wrapper(recording: Path) -> None:
+    """Send a range from a file wrapper positioned at its start."""
+    response = send_recording(
+        str(recording), "", environ(Range="bytes=100-1099"), DownloadConfig()
+    )
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 100-1099/{len(DATA)}"
+    assert response.headers["Content-Length"] == "1000"
+    assert isinstance(response.response, FileWrapper)
+    assert body(response) == DATA[100:1100]
+
+
+def test_suffix_range(recording: Path) -> None:
+    """Send the last bytes of the file."""
+    response = send_recording(
+        str(recording), "", environ(Range="bytes=-10"), DownloadConfig()
+    )
+    assert response.status_code == 206
+    assert body(response) == DATA[-10:]
+
+
+def test_unsatisfiable_range(recording: Path) -> None:
+    """Answer 416 for a range past the end."""
+    with pytest.raises(RequestedRangeNotSatisfiable):
+        send_recording(
+            str(recording), "", environ(Range=f"bytes={len(DATA)}-"), DownloadConfig()
+        )
+
+
+def test_if_range_with_a_stale_etag(recording: Path) -> None:
+    """Send the whole file when the file changed since the client's copy."""
+    response = send_recording(
+        str(recording),
+        "",
+        environ(Range="bytes=0-9", **{"If-Range": '"stale"'}),
+        DownloadConfig(),
+    )
+    assert response.status_code == 200
+    assert body(response) == DATA
+
+
+def test_resume_with_a_current_etag(recording: Path) -> None:
+    """Send the rest of the file when the client's copy is current."""
+    etag = send_recording(str(recording), "", environ(), DownloadConfig())
+    etag.response.close()
+    response = send_recording(
+        str(recording),
+        "",
+        environ(Range="bytes=4000-", **{"If-Range": etag.headers["ETag"]}),
+        DownloadConfig(),
+    )
+    assert response.status_code == 206
+    assert body(response) == DATA[4000:]
+
+
+def test_not_modified(recording: Path) -> None:
+    """Answer 304 to a matching If-None-Match."""
+    first = send_recording(str(recording), "", environ(), DownloadConfig())
+    first.response.close()
+    response = send_recording(
+        str(recording),
+        "",
+        environ(**{"If-None-Match": first.headers["ETag"]}),
+        DownloadConfig(),
+    )
+    assert response.status_code == 304
+
+
+def test_accel_redirect(recording: Path) -> None:
+    """Hand the file to nginx with its path under the internal location."""
+    response = send_recording(
+        str(recording),
+        str(recording.parent),
+        environ(),
+        DownloadConfig(offload="x-accel-redirect"),
+    )
+    assert response.headers["X-Accel-Redirect"] == "/recordings-internal/cam0.mkv"
+
+
+def test_unknown_offload_mode(tmp_path: Path) -> None:
+    """Reject unknown offload modes with ValueError."""
+    settings_file = tmp_path / "settings.json"
+    settings_file.write_text('{"downloads": {"offload": "x-nope"}}')
+    with pytest.raises(ValueError):
+        get_download_config(Settings(str(settings_file)))
+
+
+def test_file_range_reads_only_the_range(recording: Path) -> None:
+    """Read the range in chunks and stop at its end."""
+    file_range = FileRange(recording.open("rb"), 10, 25)
+    chunks = [file_range.read(10) for _ in range(4)]
+    file_range.close()
+    assert chunks == [DATA[10:20], DATA[20:30], DATA[30:35], b""]
+
+
+@pytest.fixture
+def recording_id(settings: Settings) -> int:
+    """Index a session with a single-file and a segmented recording."""
+    directory = Path(settings.get("default_path")) / "rec_a"
+    (directory / "cam1").mkdir(parents=True)
+    (directory / "cam0.mkv").write_bytes(DATA)
+    (directory / "cam1" / "seg_00000.mkv").write_bytes(DATA[:100])
+    manifest = {
+        "base_time_ns": 0,
+        "sensors": {
+            "cam0": {"path": "cam0.mkv"},
+            "cam1": {"path": "cam1/seg_%05d.mkv"},
+        },
+    }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest))
+    recordings = get_index(settings.get("default_path")).list()
+    return next(r.id for r in recordings if r.sensor == "cam0")
+
+
+def test_download_route_sends_ranges(client: Any, recording_id: int) -> None:
+    """Serve a range of an indexed recording."""
+    url = f"/api/recordings/{recording_id}/download"
+    response = client.get(url, headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.data == DATA[100:200]
+    assert client.get(url).data == DATA
+
+
+def test_download_route_sends_segments(client: Any, recording_id: int) -> None:
+    """Serve one segment of a segmented recording, by plain file name only."""
+    recordings = client.get("/api/recordings").get_json()["recordings"]
+    (segmented,) = [r["id"] for r in recordings if r["sensor"] == "cam1"]
+    url = f"/api/recordings/{segmented}/download"
+    assert client.get(f"{url}?segment=seg_00000.mkv").data == DATA[:100]
+    assert client.get(url).status_code == 400
+    assert client.get(f"{url}?segment=../cam0.mkv").status_code == 400
+    assert client.get(f"{url}?segment=seg_00001.mkv").status_code == 404
+    assert client.get("/api/recordings/0/download").status_code == 404
+
+
+def test_download_route_with_a_bad_offload_setting(
+    client: Any, settings: Settings, recording_id: int
+) -> None:
+    """Answer 500, not a crash, when the offload setting is invalid."""
+    settings.set("downloads", {"offload": "x-nope"})
+    response = client.get(f"/api/recordings/{recording_id}/download")
+    assert response.status_code == 500
+    assert response.get_json()["status"] == "error"
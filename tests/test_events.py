@@ -0,0 +1,44 @@
+"""Tests of the server-sent events bus."""
+
+import pytest
+
+from benchmarks.load_status import free_port, run, start_server
+from gst_rec_app.services.events import EventBus, SubscriberLimitError
+
+
+def test_stream_yields_broadcasts() -> None:
+    """Yield the events broadcast to a subscriber, and unsubscribe on close."""
+    bus = EventBus(max_subscribers=1)
+    frames = bus.stream()
+    assert next(frames).startswith("retry:")
+    bus.publish("job", {"id": 1})
+    assert next(frames) == 'event: job\ndata: {"id": 1}\n\n'
+    frames.close()
+    bus.stream()
+
+
+def test_subscriber_limit() -> None:
+    """Refuse subscribers past the limit when subscribing, and free the slots."""
+    bus = EventBus(max_subscribers=2)
+    first, second = bus.stream(), bus.stream()
+    with pytest.raises(SubscriberLimitError):
+        bus.stream()
+    next(first)
+    first.close()
+    bus.stream()
+    second.close()
+
+
+def test_status_latency_with_more_streams_than_threads() -> None:
+    """Keep answering status requests while more streams than threads are open."""
+    threads, streams = 8, 16
+    port = free_port()
+    process = start_server("gthread", threads, port)
+    try:
+        result = run(f"http://127.0.0.1:{port}", 5, streams, 2.0, 0.2)
+    finally:
+        process.terminate()
+        process.wait()
+    assert result["errors"] == 0
+    assert result["streams_rejected"] >= streams - threads
+    assert result["p99_ms"] < 1000
@@ -0,0 +1,46 @@
+"""Tests of the file system service."""
+
+from typing import Any
+
+import pytest
+
+from gst_rec_app.services.filesystem import (
+    iter_directory,
+    list_directory_page,
+    parse_page_cursor,
+)
+from gst_rec_app.utils import encode_cursor
+
+
+def test_parse_page_cursor_round_trip() -> None:
+    """Decode the cursors that listings hand out."""
+    assert parse_page_cursor(encode_cursor((True, "b.mkv"))) == (True, "b.mkv")
+
+
+@pytest.mark.parametrize(
+    "key", [[1, 2, 3], [True], ["a", "b"], [True, 2], [0, "name"], "name"]
+)
+def test_parse_page_cursor_rejects_other_shapes(key: object) -> None:
+    """Reject cursors that are not an ``[is file, name]`` pair."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        parse_page_cursor(encode_cursor(key))
+
+
+def test_list_directory_page_rejects_malformed_cursor() -> None:
+    """Raise ValueError, not TypeError, so the route answers 400."""
+    with pytest.raises(ValueError):
+        list_directory_page(cursor=encode_cursor([1, 2, 3]))
+
+
+def test_iter_directory_raises_before_streaming() -> None:
+    """Raise on unsafe paths when called, not when the first entry is read."""
+    with pytest.raises(PermissionError):
+        iter_directory("/")
+
+
+@pytest.mark.parametrize("limit", ["ten", "", "1.5"])
+def test_browse_rejects_malformed_limit(client: Any, limit: str) -> None:
+    """Answer 400, like the other paginated endpoints."""
+    response = client.get("/api/browse", query_string={"limit": limit})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid request"
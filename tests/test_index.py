@@ -0,0 +1,253 @@
+"""Tests of the recordings index."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from gst_rec_app.models import Settings
+from gst_rec_app.services.index import MANIFEST_NAME, RecordingsIndex
+
+BASE_TIME_NS = 1704067200 * 10**9  # 2024-01-01T00:00:00Z
+
+
+def write_session(root: Path, name: str, sizes: Dict[str, int], hour: int = 0) -> Path:
+    """Write a finished session with one file of the given size per sensor."""
+    directory = root / name
+    directory.mkdir(exist_ok=True)
+    sensors = {}
+    for sensor, size in sizes.items():
+        (directory / f"{sensor}.mkv").write_bytes(b"\0" * size)
+        sensors[sensor] = {
+            "path": f"{sensor}.mkv",
+            "started_offset_ns": 0,
+            "stopped_offset_ns": 60 * 10**9,
+        }
+    manifest = {"base_time_ns": BASE_TIME_NS + hour * 3600 * 10**9, "sensors": sensors}
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest))
+    return directory
+
+
+def test_sessions_are_indexed_per_sensor(tmp_path: Path) -> None:
+    """Index one recording per sensor of each session."""
+    write_session(tmp_path, "rec_a", {"cam0": 10, "mic": 20})
+    index = RecordingsIndex(str(tmp_path))
+    recordings = {r.sensor: r for r in index.list()}
+    assert set(recordings) == {"cam0", "mic"}
+    assert recordings["mic"].size == 20
+    assert recordings["mic"].duration == 60
+    assert recordings["mic"].path == os.path.join(tmp_path, "rec_a", "mic.mkv")
+    assert index.get(recordings["cam0"].id) == recordings["cam0"]
+
+
+def test_refresh_session_keeps_ids(tmp_path: Path) -> None:
+    """Update the rows of a re-probed session in place."""
+    directory = write_session(tmp_path, "rec_a", {"cam0": 10})
+    index = RecordingsIndex(str(tmp_path))
+    (before,) = index.list()
+    write_session(tmp_path, "rec_a", {"cam0": 30})
+    index.refresh_session(str(directory))
+    (after,) = index.list()
+    assert after.id == before.id
+    assert after.size == 30
+
+
+def test_removed_sessions_are_dropped(tmp_path: Path) -> None:
+    """Drop the recordings of deleted sessions on the next scan."""
+    directory = write_session(tmp_path, "rec_a", {"cam0": 10})
+    write_session(tmp_path, "rec_b", {"cam0": 10}, hour=1)
+    index = RecordingsIndex(str(tmp_path))
+    assert len(index.list()) == 2
+    (directory / "cam0.mkv").unlink()
+    (directory / MANIFEST_NAME).unlink()
+    directory.rmdir()
+    index.reconcile(force=True)
+    assert [r.session for r in index.list()] == ["rec_b"]
+
+
+def test_workers_index_the_same_sessions(tmp_path: Path) -> None:
+    """Let processes with their own connections index one session concurrently."""
+    directory = write_session(tmp_path, "rec_a", {"cam0": 10, "mic": 20})
+    indexes = [RecordingsIndex(str(tmp_path)) for _ in range(4)]
+    errors = []
+
+    def refresh(index: RecordingsIndex) -> None:
+        try:
+            for _ in range(20):
+                index.refresh_session(str(directory))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=refresh, args=(i,)) for i in indexes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(r.sensor for r in indexes[0].list()) == ["cam0", "mic"]
+
+
+def test_search_does_not_wait_for_the_scan(tmp_path: Path) -> None:
+    """Answer from what is indexed while the scanner walks the archive."""
+    write_session(tmp_path, "rec_a", {"cam0": 10})
+    index = RecordingsIndex(str(tmp_path))
+    release = threading.Event()
+    reconcile_files = index.reconcile_files
+
+    def slow_reconcile_files(force: bool = False) -> None:
+        release.wait(5)
+        reconcile_files(force)
+
+    index.reconcile_files = slow_reconcile_files
+    assert index.search(name="*.mkv") == ([], None)
+    assert not index.files_indexed
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while not index.files_indexed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    results, _ = index.search(name="*.mkv")
+    assert [result.name for result in results] == ["cam0.mkv"]
+
+
+def test_query_pages_with_keyset_cursors(tmp_path: Path) -> None:
+    """Walk every recording once, in order, whatever the page size."""
+    for hour, size in enumerate([30, 10, 20, 10]):
+        write_session(tmp_path, f"rec_{hour}", {"cam0": size, "mic": size}, hour)
+    index = RecordingsIndex(str(tmp_path))
+    expected = [(r.size, r.id) for r in index.query(sort="size", descending=False)[0]]
+    assert [size for size, _ in expected] == sorted([30, 10, 20, 10] * 2)
+
+    pages, after = [], None
+    while True:
+        page, total, after = index.query(
+            sort="size", descending=False, limit=3, after=after
+        )
+        assert total == 8
+        pages.append(page)
+        if after is None:
+            break
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert [(r.size, r.id) for page in pages for r in page] == expected
+
+
+def test_query_filters(tmp_path: Path) -> None:
+    """Count and page only the recordings matching the filters."""
+    for hour in range(4):
+        write_session(tmp_path, f"rec_{hour}", {"cam0": 10, "mic": 10}, hour)
+    index = RecordingsIndex(str(tmp_path))
+    since = BASE_TIME_NS / 1e9 + 3600
+    until = BASE_TIME_NS / 1e9 + 3 * 3600
+    page, total, after = index.query(limit=1, since=since, until=until, sensors=["mic"])
+    assert total == 2
+    assert [(r.session, r.sensor) for r in page] == [("rec_2", "mic")]
+    page, _, after = index.query(
+        limit=1, after=after, since=since, until=until, sensors=["mic"]
+    )
+    assert [(r.session, r.sensor) for r in page] == [("rec_1", "mic")]
+    page, _, after = index.query(
+        limit=1, after=after, since=since, until=until, sensors=["mic"]
+    )
+    assert (page, after) == ([], None)
+
+
+def test_recordings_route_follows_cursors(client: Any, settings: Settings) -> None:
+    """Serve the next page from the cursor of the previous one."""
+    root = Path(settings.get("default_path"))
+    root.mkdir()
+    for hour in range(3):
+        write_session(root, f"rec_{hour}", {"cam0": 10}, hour)
+
+    first = client.get("/api/recordings?limit=2").get_json()
+    assert first["total"] == 3
+    assert [r["session"] for r in first["recordings"]] == ["rec_2", "rec_1"]
+    second = client.get(f"/api/recordings?limit=2&cursor={first['next_cursor']}")
+    assert [r["session"] for r in second.get_json()["recordings"]] == ["rec_0"]
+    assert second.get_json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("args", ["cursor=garbage", "sort=name", "order=up", "limit=x"])
+def test_recordings_route_rejects_malformed_queries(client: Any, args: str) -> None:
+    """Answer 400 to malformed pagination arguments."""
+    assert client.get(f"/api/recordings?{args}").status_code == 400
+
+
+def write_archive(root: Path) -> RecordingsIndex:
+    """Write two sessions and a notes file, modified an hour apart, and index them."""
+    write_session(root, "rec_0", {"cam0": 10, "mic": 20})
+    write_session(root, "rec_1", {"cam0": 30}, hour=1)
+    (root / "notes").mkdir()
+    (root / "notes" / "readme.txt").write_bytes(b"\0" * 5)
+    for hour, path in enumerate(["rec_0/cam0.mkv", "rec_0/mic.mkv", "rec_1/cam0.mkv"]):
+        mtime = BASE_TIME_NS / 1e9 + hour * 3600
+        os.utime(root / path, (mtime, mtime))
+    index = RecordingsIndex(str(root))
+    # In the scanner's order, so files are linked to their recordings
+    index.reconcile(force=True)
+    index.reconcile_files(force=True)
+    return index
+
+
+def found(index: RecordingsIndex, **filters: Any) -> List[str]:
+    """Search the index and get the sorted paths found, relative to its root."""
+    results, _ = index.search(**filters)
+    return sorted(os.path.relpath(result.path, index.root) for result in results)
+
+
+def test_search_filters(tmp_path: Path) -> None:
+    """Find entries by name, directory, time, size, sensor and kind."""
+    index = write_archive(tmp_path)
+    assert found(index, name="*.mkv") == [
+        "rec_0/cam0.mkv",
+        "rec_0/mic.mkv",
+        "rec_1/cam0.mkv",
+    ]
+    assert found(index, name="cam?.*", under="rec_1") == ["rec_1/cam0.mkv"]
+    assert found(index, name="*.mkv", since=BASE_TIME_NS / 1e9 + 3600) == [
+        "rec_0/mic.mkv",
+        "rec_1/cam0.mkv",
+    ]
+    assert found(index, name="*.mkv", until=BASE_TIME_NS / 1e9 + 3600) == [
+        "rec_0/cam0.mkv"
+    ]
+    assert found(index, min_size=6, max_size=20) == ["rec_0/cam0.mkv", "rec_0/mic.mkv"]
+    assert found(index, kind="dir") == ["notes", "rec_0", "rec_1"]
+    (mic,) = index.search(sensors=["mic"])[0]
+    assert mic.recording == next(r.id for r in index.list() if r.sensor == "mic")
+    with pytest.raises(ValueError):
+        index.search(under="..")
+
+
+def test_search_pages_with_cursors(tmp_path: Path) -> None:
+    """Walk every match once, in order, following the cursors."""
+    index = write_archive(tmp_path)
+    expected, _ = index.search(sort="name", descending=False)
+    paths, after = [], None
+    while True:
+        results, after = index.search(
+            sort="name", descending=False, limit=2, after=after
+        )
+        paths.extend(result.path for result in results)
+        if after is None:
+            break
+    assert paths == [result.path for result in expected]
+    names = [result.name for result in expected]
+    assert names == sorted(names)
+
+
+def test_search_route(client: Any, settings: Settings) -> None:
+    """Serve search pages and answer 400 to malformed queries."""
+    root = Path(settings.get("default_path"))
+    root.mkdir()
+    write_archive(root)
+    first = client.get("/api/search?name=*.mkv&sort=size&order=asc&limit=2")
+    assert [r["size"] for r in first.get_json()["results"]] == [10, 20]
+    cursor = first.get_json()["next_cursor"]
+    second = client.get(f"/api/search?name=*.mkv&sort=size&order=asc&cursor={cursor}")
+    assert [r["size"] for r in second.get_json()["results"]] == [30]
+    for args in ["cursor=garbage", "path=..", "type=link", "min_size=big"]:
+        assert client.get(f"/api/search?{args}").status_code == 400
@@ -0,0 +1,25 @@
+"""Tests of the Prometheus metrics."""
+
+import json
+from pathlib import Path
+
+from gst_rec_app.models import Settings
+from gst_rec_app.services.metrics import generate_metrics
+
+
+def test_metrics_without_daemon(tmp_path: Path) -> None:
+    """Report the recorder as down, and still export the storage gauges."""
+    settings_file = tmp_path / "settings.json"
+    settings_file.write_text(
+        json.dumps(
+            {
+                "daemon_socket": str(tmp_path / "missing.sock"),
+                "default_path": str(tmp_path),
+            }
+        )
+    )
+    body, _ = generate_metrics(Settings(str(settings_file)))
+    text = body.decode()
+    assert "gst_rec_recorder_up 0.0" in text
+    assert "gst_rec_recording_state" not in text
+    assert "gst_rec_storage_total_bytes" in text
@@ -0,0 +1,37 @@
+"""Tests of the recordings ownership lock."""
+
+import multiprocessing
+from pathlib import Path
+
+from gst_rec_app.services.ownership import acquire_ownership
+
+
+def _acquire(root: str, result: "multiprocessing.Queue[bool]") -> None:
+    """Report whether a child process can acquire ownership."""
+    result.put(acquire_ownership(root))
+
+
+def try_in_child(root: Path, method: str) -> bool:
+    """Try to acquire ownership in a child process."""
+    context = multiprocessing.get_context(method)
+    result = context.Queue()
+    process = context.Process(target=_acquire, args=(str(root), result))
+    process.start()
+    owned = result.get(timeout=30)
+    process.join()
+    return owned
+
+
+def test_single_owner(tmp_path: Path) -> None:
+    """Let only the first process own a directory, and keep owning it."""
+    assert acquire_ownership(str(tmp_path))
+    assert acquire_ownership(str(tmp_path))
+    assert not try_in_child(tmp_path, "spawn")
+    # A forked child shares the lock's descriptor, but does not own it
+    assert not try_in_child(tmp_path, "fork")
+
+
+def test_ownership_is_released_on_exit(tmp_path: Path) -> None:
+    """Let another process become the owner once the owner exited."""
+    assert try_in_child(tmp_path, "spawn")
+    assert acquire_ownership(str(tmp_path))
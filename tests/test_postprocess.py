@@ -0,0 +1,98 @@
+"""Tests of the post-processing job queue."""
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import List
+
+from gst_rec_app.models import Settings
+from gst_rec_app.models.responses import ProcessingJob
+from gst_rec_app.services.postprocess import (
+    JOBS_NAME,
+    JobQueue,
+    postprocess_recording,
+    write_checksums,
+)
+from gst_rec_app.services.recorder import FakeRecorder, PipelineConfig
+
+
+def wait_for_jobs(queue: JobQueue, path: Path, count: int) -> List[ProcessingJob]:
+    """Wait until a recording's jobs finished, and get them."""
+    deadline = time.monotonic() + 60
+    while True:
+        jobs = queue.jobs([str(path)]).get(str(path), [])
+        if len(jobs) == count and all(j.state in ("done", "failed") for j in jobs):
+            return jobs
+        assert time.monotonic() < deadline, f"Jobs did not finish: {jobs}"
+        time.sleep(0.05)
+
+
+def test_write_checksums(tmp_path: Path) -> None:
+    """Write sha256sum lines for a file, or for each file of a directory."""
+    (tmp_path / "cam0").mkdir()
+    for name, data in [("seg_00000.mkv", b"a"), ("seg_00001.mkv", b"b")]:
+        (tmp_path / "cam0" / name).write_bytes(data)
+    progress: List[float] = []
+    output = write_checksums(str(tmp_path / "cam0"), progress.append)
+    assert Path(output).read_text() == "".join(
+        f"{hashlib.sha256(data).hexdigest()}  cam0/{name}\n"
+        for name, data in [("seg_00000.mkv", b"a"), ("seg_00001.mkv", b"b")]
+    )
+    assert progress[-1] == 1.0
+
+
+def test_jobs_run_in_worker_processes(settings: Settings, tmp_path: Path) -> None:
+    """Run queued jobs to completion, recording failures with their message."""
+    root = tmp_path / "rec"
+    recording = root / "rec_a" / "cam0.mkv"
+    recording.parent.mkdir(parents=True)
+    recording.write_bytes(b"\0" * 1000)
+    queue = JobQueue(str(root), settings)
+    queue.enqueue(str(recording), ["checksum", "remux"])
+    queue.enqueue(str(recording), ["checksum"])
+
+    jobs = {job.kind: job for job in wait_for_jobs(queue, recording, 2)}
+    assert (jobs["checksum"].state, jobs["checksum"].progress) == ("done", 1.0)
+    assert jobs["remux"].state == "failed"
+    assert jobs["remux"].message
+    digest = hashlib.sha256(b"\0" * 1000).hexdigest()
+    assert (root / "rec_a" / "cam0.mkv.sha256").read_text() == f"{digest}  cam0.mkv\n"
+
+
+def test_interrupted_jobs_are_resumed(settings: Settings, tmp_path: Path) -> None:
+    """Queue jobs left running by a previous owner again."""
+    root = tmp_path / "rec"
+    recording = root / "cam0.mkv"
+    root.mkdir()
+    recording.write_bytes(b"data")
+    queue = JobQueue(str(root), settings)
+    with closing(sqlite3.connect(str(root / JOBS_NAME))) as db, db:
+        db.execute(
+            "INSERT INTO jobs (path, kind, priority, state, updated) "
+            "VALUES ('cam0.mkv', 'checksum', 0, 'running', 0)"
+        )
+
+    queue.ensure_running()
+    (job,) = wait_for_jobs(queue, recording, 1)
+    assert job.state == "done"
+
+
+def test_only_checksums_for_fake_recordings(settings: Settings) -> None:
+    """Queue video jobs only for recordings of the gst backend."""
+    root = Path(settings.get("default_path"))
+    recorder = FakeRecorder(PipelineConfig(source="test"))
+    recorder.location = str(root / "rec_a" / "cam0.mkv")
+    os.makedirs(os.path.dirname(recorder.location))
+    Path(recorder.location).write_bytes(b"data")
+    settings.set("postprocess", {"enabled": False})
+    postprocess_recording(settings, recorder)
+    assert not (root / JOBS_NAME).exists()
+
+    settings.set("postprocess", {"enabled": True})
+    postprocess_recording(settings, recorder)
+    queue = JobQueue(str(root), settings)
+    (jobs,) = queue.jobs([recorder.location]).values()
+    assert [job.kind for job in jobs] == ["checksum"]
@@ -0,0 +1,90 @@
+"""Tests of the pre-roll ring buffer and capture."""
+
+import os
+import time
+from pathlib import Path
+
+from gst_rec_app.services.preroll import (
+    TS_PACKET_SIZE,
+    PrerollCapture,
+    PrerollPolicy,
+    PrerollRecorder,
+    RingBuffer,
+    _remaining,
+)
+from gst_rec_app.services.recorder import PipelineConfig
+
+SECOND_NS = 10**9
+
+
+def test_ring_buffer_evicts_old_chunks() -> None:
+    """Keep only the chunks of the last seconds."""
+    buffer = RingBuffer(seconds=2, max_bytes=1000)
+    for second in range(5):
+        buffer.append(bytes([second]) * 10, now_ns=second * SECOND_NS)
+    assert buffer.oldest_ns == 2 * SECOND_NS
+    assert buffer.size == 30
+
+
+def test_ring_buffer_evicts_past_its_size() -> None:
+    """Keep only as many chunks as fit in the memory cap."""
+    buffer = RingBuffer(seconds=60, max_bytes=25)
+    for i in range(5):
+        buffer.append(bytes(10), now_ns=i)
+    assert buffer.oldest_ns == 3
+    assert buffer.size == 20
+
+
+def test_ring_buffer_flush(tmp_path: Path) -> None:
+    """Write every chunk in order, in more batches than one writev takes."""
+    buffer = RingBuffer(seconds=60, max_bytes=1 << 20)
+    chunks = [i.to_bytes(2, "big") for i in range(3000)]
+    for chunk in chunks:
+        buffer.append(chunk, now_ns=0)
+    path = tmp_path / "out.ts"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        assert buffer.flush(fd) == 6000
+    finally:
+        os.close(fd)
+    assert path.read_bytes() == b"".join(chunks)
+    assert (buffer.size, buffer.oldest_ns) == (0, None)
+
+
+def test_remaining_after_a_partial_write() -> None:
+    """Resume a vectored write in the middle of a chunk."""
+    chunks = [b"abc", b"defg", b"h"]
+    assert [bytes(part) for part in _remaining(chunks, 5)] == [b"fg", b"h"]
+    assert [bytes(part) for part in _remaining(chunks, 3)] == [b"defg", b"h"]
+    assert _remaining(chunks, 8) == []
+
+
+def test_recording_starts_with_the_pre_roll(tmp_path: Path) -> None:
+    """Flush the buffered stream into the recording, then append the live one."""
+    config = PipelineConfig(source="test", framerate=50, bitrate=80)
+    capture = PrerollCapture(config, "fake", PrerollPolicy(enabled=True, seconds=10))
+    capture.start()
+    try:
+        time.sleep(0.3)
+        recorder = PrerollRecorder(capture)
+        requested_ns = time.monotonic_ns()
+        location = tmp_path / "cam0.ts"
+        recorder.start(str(location))
+        assert requested_ns - recorder.started_ns >= 0.2 * SECOND_NS
+        buffered = recorder.stats().bytes_written
+        assert buffered > 0
+
+        time.sleep(0.1)
+        recorder.stop()
+        written = recorder.stats().bytes_written
+        assert written > buffered
+        assert location.stat().st_size == written
+        assert written % TS_PACKET_SIZE == 0
+
+        # Back to buffering, for the next recording
+        time.sleep(0.1)
+        assert location.stat().st_size == written
+        assert recorder.is_alive()
+    finally:
+        capture.close()
+    assert not capture.is_alive()
@@ -0,0 +1,103 @@
+"""Tests of the recorder backends."""
+
+import io
+import time
+from pathlib import Path
+
+import pytest
+
+from gst_rec_app.models import Settings
+from gst_rec_app.services.recorder import (
+    SEGMENT_PATTERN,
+    FakeRecorder,
+    GstLaunchRecorder,
+    PipelineConfig,
+    build_pipeline,
+    create_recorder,
+)
+
+
+def test_build_pipeline_with_test_sources() -> None:
+    """Mux test sources into the output file, which may contain spaces."""
+    args = build_pipeline(PipelineConfig(source="test"), "/rec/my session/cam0.mkv")
+    assert args[:4] == ["matroskamux", "name=mux", "!", "filesink"]
+    assert "location=/rec/my session/cam0.mkv" in args
+    assert "videotestsrc" in args and "audiotestsrc" in args
+    assert "v4l2src" not in args
+
+
+def test_build_pipeline_with_segments() -> None:
+    """Split the output with splitmuxsink, feeding its video and audio pads."""
+    config = PipelineConfig(segment_seconds=10, segment_bytes=1000)
+    args = build_pipeline(config, f"/rec/cam0/{SEGMENT_PATTERN}.mkv")
+    assert args[:2] == ["splitmuxsink", "name=mux"]
+    assert "max-size-time=10000000000" in args
+    assert "max-size-bytes=1000" in args
+    assert "mux.video" in args and "mux.audio_0" in args
+
+
+def test_build_pipeline_needs_a_branch() -> None:
+    """Refuse a pipeline without video and audio."""
+    with pytest.raises(ValueError):
+        build_pipeline(PipelineConfig(video=False, audio=False), "/rec/cam0.mkv")
+
+
+def test_create_recorder(settings: Settings) -> None:
+    """Create the configured backend, with per-sensor pipeline overrides."""
+    settings.set("pipeline", {"framerate": 10, "width": 640})
+    recorder = create_recorder(settings, {"framerate": 5})
+    assert isinstance(recorder, FakeRecorder)
+    assert (recorder.config.framerate, recorder.config.width) == (5, 640)
+
+    settings.set("recorder_backend", "gst")
+    assert isinstance(create_recorder(settings), GstLaunchRecorder)
+    settings.set("recorder_backend", "nonexistent")
+    with pytest.raises(ValueError):
+        create_recorder(settings)
+
+
+def test_gst_launch_recorder_without_gstreamer(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Fail to start when gst-launch-1.0 is not installed."""
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(RuntimeError, match="not found"):
+        GstLaunchRecorder(PipelineConfig()).start(str(tmp_path / "cam0.mkv"))
+
+
+def test_gst_launch_recorder_parses_bus_messages() -> None:
+    """Track the PLAYING state, QoS drops per element and tracer latency."""
+    recorder = GstLaunchRecorder(PipelineConfig())
+    output = io.StringIO(
+        "Setting pipeline to PLAYING ...\n"
+        'Got message #1 from element "videorate0" (qos): GstMessageQOS, '
+        "live=(boolean)true, dropped=(guint64)3;\n"
+        'Got message #2 from element "videorate0" (qos): GstMessageQOS, '
+        "live=(boolean)true, dropped=(guint64)5;\n"
+        'Got message #3 from element "opusenc0" (qos): GstMessageQOS, '
+        "live=(boolean)true, dropped=(guint64)2;\n"
+        "0:00:01 TRACE GST_TRACER :0:: latency, src=(string)v4l2src0, "
+        "sink=(string)filesink0, time=(guint64)12500000, ts=(guint64)1;\n"
+    )
+    recorder._read_output(output)
+    assert recorder._playing.is_set()
+    stats = recorder.stats()
+    assert stats.frames_dropped == 7
+    assert stats.latency_ms == 12.5
+
+
+def test_fake_recorder_rotates_segments(tmp_path: Path) -> None:
+    """Write frames on schedule, rotating files once a segment is full."""
+    config = PipelineConfig(source="test", framerate=100, bitrate=80, segment_bytes=300)
+    recorder = FakeRecorder(config)
+    recorder.start(str(tmp_path / f"{SEGMENT_PATTERN}.mkv"))
+    time.sleep(0.2)
+    assert recorder.is_alive()
+    recorder.stop()
+    assert not recorder.is_alive()
+    segments = sorted(tmp_path.iterdir())
+    assert len(segments) > 1
+    assert all(path.stat().st_size == 300 for path in segments[:-1])
+    assert (
+        sum(path.stat().st_size for path in segments) == recorder.stats().bytes_written
+    )
@@ -0,0 +1,133 @@
+"""Tests of the recording control routes and services."""
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from gst_rec_app.models.responses import RecordingStatus
+from gst_rec_app.services.recorder import FakeRecorder, PipelineConfig
+from gst_rec_app.services.recording import RecordingSupervisor
+
+CONFIG = PipelineConfig(source="test", framerate=50, bitrate=80)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"sensors": 5},
+        {"sensors": "camera"},
+        {"sensors": ["camera", 1]},
+        {"group": ["front"]},
+        ["camera"],
+    ],
+)
+@pytest.mark.parametrize("action", ["start", "stop"])
+def test_malformed_selection_is_rejected(client: Any, action: str, body: Any) -> None:
+    """Answer 400 to a selection that is not a list of ids and a group name."""
+    response = client.post(f"/api/recording/{action}", json=body)
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+class BlockingRecorder(FakeRecorder):
+    """Fake recorder whose pipeline comes up only once released."""
+
+    def __init__(self) -> None:
+        super().__init__(CONFIG)
+        self.release = threading.Event()
+
+    def start(self, location: str) -> None:
+        """Wait to be released, then start writing frames."""
+        self.release.wait(5)
+        super().start(location)
+
+
+class BrokenRecorder(FakeRecorder):
+    """Fake recorder whose pipeline never comes up."""
+
+    def start(self, location: str) -> None:
+        """Fail like a pipeline that cannot open its device."""
+        raise RuntimeError("no such device")
+
+
+def wait_for_state(supervisor: RecordingSupervisor, state: str) -> RecordingStatus:
+    """Wait for the supervisor to settle in a state and return its status."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        status = supervisor.status()
+        if status.state == state:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"Supervisor is {supervisor.status().state}, not {state}")
+
+
+def test_supervisor_start_and_stop(tmp_path: Path) -> None:
+    """Go through starting, recording, stopping and idle, reporting each state."""
+    transitions: "queue.Queue[str]" = queue.Queue()
+    supervisor = RecordingSupervisor(
+        "cam0", lambda sensor, state: transitions.put(state), watch_interval=0.05
+    )
+    location = str(tmp_path / "rec" / "cam0.mkv")
+    job = supervisor.start(FakeRecorder(CONFIG), location)
+    assert (job.status, job.state, job.sensor) == ("success", "starting", "cam0")
+
+    status = wait_for_state(supervisor, "recording")
+    assert status.is_recording
+    assert status.job_id == job.job_id
+    assert status.path == location
+    assert supervisor.start(FakeRecorder(CONFIG), location).status == "error"
+
+    assert supervisor.stop().state == "stopping"
+    status = wait_for_state(supervisor, "idle")
+    assert status.stats is not None and status.stats.bytes_written > 0
+    assert os.path.getsize(location) == status.stats.bytes_written
+    assert [transitions.get(timeout=5) for _ in range(2)] == ["recording", "idle"]
+    assert supervisor.stop().status == "error"
+
+
+def test_supervisor_stop_while_starting(tmp_path: Path) -> None:
+    """Answer without waiting for the pipeline, and stop it once it is up."""
+    supervisor = RecordingSupervisor("cam0")
+    recorder = BlockingRecorder()
+    supervisor.start(recorder, str(tmp_path / "cam0.mkv"))
+    assert supervisor.status().state == "starting"
+    assert supervisor.stop().status == "success"
+    assert supervisor.status().state == "stopping"
+    recorder.release.set()
+    wait_for_state(supervisor, "idle")
+    assert not recorder.is_alive()
+
+
+def test_supervisor_start_failure(tmp_path: Path) -> None:
+    """Move to failed with the pipeline error, and accept a new start."""
+    supervisor = RecordingSupervisor("cam0")
+    supervisor.start(BrokenRecorder(CONFIG), str(tmp_path / "cam0.mkv"))
+    status = wait_for_state(supervisor, "failed")
+    assert status.error == "Failed to start recording: no such device"
+    assert supervisor.start(
+        FakeRecorder(CONFIG), str(tmp_path / "cam0.mkv")
+    ).status == ("success")
+    wait_for_state(supervisor, "recording")
+    supervisor.stop()
+    wait_for_state(supervisor, "idle")
+
+
+def test_supervisor_detects_exited_pipeline(tmp_path: Path) -> None:
+    """Move to failed when the pipeline exits on its own, after sampling throughput."""
+    supervisor = RecordingSupervisor("cam0", watch_interval=0.05)
+    recorder = FakeRecorder(CONFIG)
+    supervisor.start(recorder, str(tmp_path / "cam0.mkv"))
+    wait_for_state(supervisor, "recording")
+    deadline = time.monotonic() + 5
+    while supervisor.status().throughput is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert supervisor.status().throughput is not None
+
+    recorder.stop()
+    status = wait_for_state(supervisor, "failed")
+    assert status.error == "Pipeline exited unexpectedly"
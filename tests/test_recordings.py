@@ -0,0 +1,73 @@
+"""Tests of the recordings service's query parsing."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from gst_rec_app.services.recordings import (
+    RecordingsQuery,
+    SamplesQuery,
+    parse_time,
+    parse_time_ns,
+)
+
+NEW_YEAR = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-01-01T00:00:00Z",
+        "2024-01-01T00:00:00z",
+        "2024-01-01T00:00:00+00:00",
+        "2024-01-01T01:00:00+01:00",
+        "2024-01-01T00:00:00",
+        str(NEW_YEAR),
+    ],
+)
+def test_parse_time(value: str) -> None:
+    """Parse ISO 8601 times, with a Z suffix or an offset, and epoch seconds."""
+    assert parse_time(value) == NEW_YEAR
+
+
+def test_parse_time_rejects_garbage() -> None:
+    """Raise ValueError on values that are neither ISO 8601 nor numbers."""
+    with pytest.raises(ValueError):
+        parse_time("yesterday")
+
+
+def test_recordings_query_accepts_z_suffix() -> None:
+    """Accept the Z suffix in the since and until query arguments."""
+    query = RecordingsQuery.from_args(
+        {"since": "2024-01-01T00:00:00Z", "until": "2024-01-02T00:00:00Z"}
+    )
+    assert query.since == NEW_YEAR
+    assert query.until == NEW_YEAR + 86400
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1700000000.123456789", 1700000000123456789),
+        ("2024-01-01T00:00:00.000001Z", int(NEW_YEAR) * 10**9 + 1000),
+        ("-1.5", -1500000000),
+    ],
+)
+def test_parse_time_ns(value: str, expected: int) -> None:
+    """Parse epoch seconds and ISO 8601 times to the nanosecond."""
+    assert parse_time_ns(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value", ["inf", "-inf", "nan", "1e300", "1e999999999", "9999-12-31T00:00:00"]
+)
+def test_parse_time_ns_rejects_out_of_range(value: str) -> None:
+    """Reject values that are not finite or do not fit in int64 nanoseconds."""
+    with pytest.raises(ValueError):
+        parse_time_ns(value)
+
+
+def test_samples_query_rejects_infinite_start() -> None:
+    """Raise ValueError, not OverflowError, so the route answers 400."""
+    with pytest.raises(ValueError):
+        SamplesQuery.from_args({"start": "inf"})
@@ -0,0 +1,99 @@
+"""Tests of the write-behind settings store."""
+
+import json
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from gst_rec_app.models import Settings
+
+
+def read(path: Path) -> dict:
+    """Read the settings file."""
+    return json.loads(path.read_text())
+
+
+def _set_keys(path: str, worker: int, count: int) -> None:
+    """Set keys of one worker, each written behind with the others' changes."""
+    settings = Settings(path, flush_delay=0.001, check_interval=0)
+    for i in range(count):
+        settings.set(f"worker{worker}_{i}", i)
+        time.sleep(0.002)
+    settings.flush()
+
+
+def test_changes_are_written_behind(tmp_path: Path) -> None:
+    """Batch changes made within the delay into one write."""
+    path = tmp_path / "settings.json"
+    settings = Settings(str(path), flush_delay=0.2)
+    settings.set("a", 1)
+    settings.set("b", 2)
+    assert settings.get("a") == 1
+    assert not path.exists()
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert read(path) == {"a": 1, "b": 2}
+
+
+def test_flush_writes_now(tmp_path: Path) -> None:
+    """Write pending changes on flush, leaving no temporary file behind."""
+    path = tmp_path / "settings.json"
+    settings = Settings(str(path), flush_delay=60)
+    settings.set("a", 1)
+    settings.flush()
+    assert read(path) == {"a": 1}
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "settings.json",
+        "settings.json.lock",
+    ]
+
+
+def test_failed_write_keeps_the_file(tmp_path: Path) -> None:
+    """Leave the previous file intact when a write fails, and retry later."""
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"a": 1}))
+    settings = Settings(str(path), flush_delay=60)
+    settings.set("b", object())
+    with pytest.raises(TypeError):
+        settings.flush()
+    assert read(path) == {"a": 1}
+    assert not list(tmp_path.glob(".settings-*"))
+    settings.set("b", 2)
+    settings.flush()
+    assert read(path) == {"a": 1, "b": 2}
+
+
+def test_changes_of_other_processes_are_seen(tmp_path: Path) -> None:
+    """Reload the file when another instance replaced it."""
+    path = tmp_path / "settings.json"
+    first = Settings(str(path), flush_delay=60, check_interval=0)
+    second = Settings(str(path), flush_delay=60, check_interval=0)
+    first.set("a", 1)
+    first.flush()
+    assert second.get("a") == 1
+    second.set("b", 2)
+    second.flush()
+    assert first.get("b") == 2
+    assert read(path) == {"a": 1, "b": 2}
+
+
+def test_concurrent_writers_keep_every_change(tmp_path: Path) -> None:
+    """Merge the changes of processes writing the same file at the same time."""
+    path = tmp_path / "settings.json"
+    workers, count = 4, 25
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_set_keys, args=(str(path), worker, count))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    assert read(path) == {
+        f"worker{worker}_{i}": i for worker in range(workers) for i in range(count)
+    }